@@ -0,0 +1,5 @@
+"""
+This package contains performance benchmarks for the SARDS language implementation.
+
+Each module can be run on its own, e.g. `python -m benchmarks.lexer_engines`.
+"""
@@ -0,0 +1,106 @@
+"""
+Module: engines
+
+Benchmarks and cross-checks the execution engines of sards.engines: the tree-walking
+Interpreter, the closure compiler, the bytecode VM and the Interpreter running methods
+transpiled to Python.
+
+Every workload of benchmarks.execute is optimized once and run by every engine, from
+a fresh global scope each time, and every engine must produce the Interpreter's
+value. The engines are checked against each other in detail by tests/test_engines.py.
+
+Usage:
+    python -m benchmarks.engines [--workload NAME ...] [--scale S] [--repeat R]
+                                 [--json PATH]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+
+from sards.core import optimize
+from sards.engines import ENGINES, fresh_context, parse, run_tree
+from benchmarks.execute import WORKLOADS
+
+
+def measure(run, repeat):
+    """Returns the best wall-clock time in seconds of `run` over `repeat` runs, and its value."""
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            context = fresh_context()
+            start = time.perf_counter()
+            result = run(context)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        if result.error:
+            raise RuntimeError(result.error.to_string())
+        value = result.value
+    return best, value
+
+
+def run_workload(name, scale, repeat):
+    """
+    Runs one optimized workload with every engine.
+
+    Returns:
+    - dict: The size of the program, the time of each engine (compilation included)
+        and the speedup of each engine over the Interpreter.
+    """
+    generator, size = WORKLOADS[name]
+    size = max(int(size * scale), 1)
+    node = optimize(parse(generator(size)))
+
+    tree_seconds, tree_value = measure(lambda context: run_tree(node, context), repeat)
+    seconds, speedup = {'tree': tree_seconds}, {}
+    for engine, run in ENGINES.items():
+        seconds[engine], value = measure(lambda context, run=run: run(node, context), repeat)
+        if repr(value) != repr(tree_value):
+            raise RuntimeError(f'{name}: {engine} result {value!r} != {tree_value!r}')
+        speedup[engine] = tree_seconds / seconds[engine]
+
+    return {'size': size, 'value': repr(tree_value), 'seconds': seconds, 'speedup': speedup}
+
+
+def main():
+    """Runs the selected workloads and prints a summary."""
+    arg_parser = argparse.ArgumentParser(description=__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                            help='workload to run (repeatable, default: all)')
+    arg_parser.add_argument('--scale', type=float, default=1.0,
+                            help='multiplier applied to every workload size')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', metavar='PATH', help='write the results to PATH as JSON')
+    args = arg_parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'workloads': {},
+    }
+    for name in args.workload or WORKLOADS:
+        result = report['workloads'][name] = run_workload(name, args.scale, args.repeat)
+        seconds = result['seconds']
+        print(f'{name:>20}: tree {seconds["tree"] * 1000:9.2f} ms' + ''.join(
+            f'   {engine} {seconds[engine] * 1000:9.2f} ms x{result["speedup"][engine]:.2f}'
+            for engine in ENGINES))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+        print(f'results written to {args.json}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Module: execute
+
+Benchmarks the Interpreter on loop-heavy SARDS programs.
+
+Each workload is parsed once and then executed with and without the optimization
+passes of sards.core.optimizer, so the two timings show what the passes save at run
+time. Every run starts from a fresh global scope holding only the built-ins.
+
+Usage:
+    python -m benchmarks.execute [--workload NAME ...] [--scale S] [--repeat R]
+                                 [--json PATH]
+"""
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import sys
+import time
+
+from sards.core import Interpreter, optimize
+from sards.engines import fresh_context, parse
+
+
+def generate_constant_arithmetic(size):
+    """Builds a Cycle loop whose body mixes the loop variable with constant subexpressions."""
+    return (f'total = 0; Cycle i = 1 : {size} {{; total = total + i * (2 * 3) + (4 - 1) * 2 - 0; '
+            'scaled = total * 1 / (10 ** 3);}; total')
+
+
+def generate_nested_loops(size):
+    """Builds two nested Cycle loops accumulating a product."""
+    return (f'count = 0; Cycle i = 1 : {size} {{; Cycle j = 1 : 10 {{; '
+            'count = count + i * j % (3 + 4);};}; count')
+
+
+def generate_while_loop(size):
+    """Builds a whenever loop with a compound condition."""
+    return (f'n = 0; s = 0; whenever not not (n < {size}) and 1 {{; n = n + 1; '
+            's = s + n % 7 * (60 * 60);}; s')
+
+
+def generate_constant_branches(size):
+    """Builds a Cycle loop over when chains and a menu whose outcome is fixed."""
+    return (f'total = 0; Cycle i = 1 : {size} {{; '
+            'when 2 < 1 { show(i) } orwhen 0 { total = 0 } otherwise { total = total + i }; '
+            'menu 2 {; choice 1 { total = total - 1 }; choice 2 {; total = total + 1; escape;}; '
+            'choice 3 { total = total * 2 };};}; total')
+
+
+def generate_loop_invariant(size):
+    """Builds a Cycle loop whose body recomputes expressions over variables it never assigns."""
+    return (f'a = 3; b = 7; total = 0; Cycle i = 1 : {size} {{; '
+            'total = total + i * (a * b + a % b) - (b - a) ** 2 + Integer(String(b * 2));}; total')
+
+
+def generate_recursion(size):
+    """Builds a recursive Fibonacci of `size`."""
+    return ('method fib(n) {; when n < 2 { yield n }; yield fib(n - 1) + fib(n - 2);}; '
+            f'fib({size})')
+
+
+def generate_method_kernel(size):
+    """Builds a numeric method with a loop, called `size` times."""
+    return ('method kernel(n) {; s = 0; Cycle i = 1 : n {; '
+            'when i % 3 == 0 { s = s + i * i } otherwise { s = s - i };}; yield s;}; '
+            f'total = 0; Cycle k = 1 : {size} {{ total = total + kernel(k % 50 + 50) }}; total')
+
+
+# Each workload maps to its generator and the size used at --scale 1.
+WORKLOADS = {
+    'constant_arithmetic': (generate_constant_arithmetic, 20000),
+    'nested_loops': (generate_nested_loops, 2000),
+    'while_loop': (generate_while_loop, 20000),
+    'constant_branches': (generate_constant_branches, 20000),
+    'loop_invariant': (generate_loop_invariant, 20000),
+    'recursion': (generate_recursion, 18),
+    'method_kernel': (generate_method_kernel, 400),
+}
+
+
+def execute(node):
+    """Runs a syntax tree in a fresh global scope, raising on a runtime error."""
+    result = Interpreter().visit(node, fresh_context())
+    if result.error:
+        raise RuntimeError(result.error.to_string())
+    return result.value
+
+
+def measure(node, repeat):
+    """
+    Times the execution of a syntax tree.
+
+    Returns:
+    - float: The best wall-clock time in seconds over `repeat` runs.
+    - any: The value of the program.
+    """
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            value = execute(node)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, value
+
+
+def run_workload(name, scale, repeat):
+    """
+    Runs one workload without and with the optimization passes.
+
+    Returns:
+    - dict: The size of the program and the time of each variant.
+    """
+    generator, size = WORKLOADS[name]
+    size = max(int(size * scale), 1)
+    node = parse(generator(size))
+
+    plain_seconds, plain_value = measure(node, repeat)
+    optimized_seconds, optimized_value = measure(optimize(copy.deepcopy(node)), repeat)
+    if repr(plain_value) != repr(optimized_value):
+        raise RuntimeError(f'{name}: optimized result {optimized_value!r} != {plain_value!r}')
+
+    return {'size': size, 'value': repr(plain_value),
+            'seconds': {'plain': plain_seconds, 'optimized': optimized_seconds},
+            'speedup': plain_seconds / optimized_seconds}
+
+
+def main():
+    """Runs the selected workloads, prints a summary and optionally writes JSON results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                            help='workload to run (repeatable, default: all)')
+    arg_parser.add_argument('--scale', type=float, default=1.0,
+                            help='multiplier applied to every workload size')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', metavar='PATH', help='write the results to PATH as JSON')
+    args = arg_parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'workloads': {},
+    }
+    for name in args.workload or WORKLOADS:
+        result = report['workloads'][name] = run_workload(name, args.scale, args.repeat)
+        seconds = result['seconds']
+        print(f'{name:>20}: plain {seconds["plain"] * 1000:9.2f} ms   '
+              f'optimized {seconds["optimized"] * 1000:9.2f} ms   x{result["speedup"]:.2f}')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+        print(f'results written to {args.json}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
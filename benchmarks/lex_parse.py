@@ -0,0 +1,282 @@
+"""
+Module: lex_parse
+
+Benchmarks the front end (Lexer and Parser) phase by phase on synthetic SARDS programs.
+
+Each workload stresses one shape of program: deeply nested when/orwhen chains, long
+arithmetic expressions, thousands of method definitions, large list literals and long
+string literals. For every workload the lex-only, parse-only and lex+parse phases are
+timed separately and reported with tokens/sec, nodes/sec and peak memory.
+
+Usage:
+    python -m benchmarks.lex_parse [--workload NAME ...] [--scale S] [--repeat R]
+                                   [--engine ENGINE] [--json PATH]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from sards.core.lexer import Lexer, LEXER_ENGINES
+from sards.core.parser import Parser
+
+# Nesting depth of the when/orwhen chains. Every level costs a dozen or so Python
+# frames in the recursive descent parser, so this stays well inside the default
+# recursion limit.
+NESTING_DEPTH = 20
+
+
+def generate_nested_when(size):
+    """
+    Builds `size` statements, each a when/orwhen/otherwise chain nested NESTING_DEPTH deep.
+
+    Parameters:
+    - size (int): The number of statements to generate.
+
+    Returns:
+    - str: The program text.
+    """
+    statements = []
+    for i in range(size):
+        body = f'value_{i} = {i}'
+        for depth in range(NESTING_DEPTH):
+            body = (f'when x == {depth} {{; {body};}} orwhen x < {depth} {{ x = x + 1 }} '
+                    f'otherwise {{ x = {depth} }}')
+        statements.append(body)
+    return ';'.join(statements)
+
+
+def generate_long_arithmetic(size):
+    """
+    Builds a single assignment whose right-hand side is an expression of `size` terms.
+
+    Parameters:
+    - size (int): The number of terms in the expression.
+
+    Returns:
+    - str: The program text.
+    """
+    operators = ('+', '*', '-', '/', '%', '//')
+    terms = ['1']
+    for i in range(1, size):
+        operand = f'(a_{i} - {i})' if i % 5 == 0 else f'{i}.5' if i % 3 == 0 else str(i)
+        terms.append(f'{operators[i % len(operators)]} {operand}')
+    return 'total = ' + ' '.join(terms)
+
+
+def generate_many_methods(size):
+    """
+    Builds `size` method definitions with multi-line bodies.
+
+    Parameters:
+    - size (int): The number of methods to generate.
+
+    Returns:
+    - str: The program text.
+    """
+    return ';'.join(f'method fn_{i}(a, b) {{; c = a * {i} + b; yield c ** 2;}}'
+                    for i in range(size))
+
+
+def generate_large_list(size):
+    """
+    Builds a single list literal of `size` mixed elements.
+
+    Parameters:
+    - size (int): The number of elements in the list.
+
+    Returns:
+    - str: The program text.
+    """
+    elements = (str(i) if i % 4 else f'"item {i}"' for i in range(size))
+    return 'items = [' + ', '.join(elements) + ']'
+
+
+def generate_long_strings(size):
+    """
+    Builds 100 assignments of string literals totalling about `size` characters.
+
+    Parameters:
+    - size (int): The total number of characters in the string literals.
+
+    Returns:
+    - str: The program text.
+    """
+    length = max(size // 100, 1)
+    return ';'.join(f'text_{i} = "{("lorem ipsum " * length)[:length]}"' for i in range(100))
+
+
+# Each workload maps to its generator and the size used at --scale 1.
+WORKLOADS = {
+    'nested_when': (generate_nested_when, 200),
+    'long_arithmetic': (generate_long_arithmetic, 20000),
+    'many_methods': (generate_many_methods, 5000),
+    'large_list': (generate_large_list, 50000),
+    'long_strings': (generate_long_strings, 2000000),
+}
+
+
+def count_nodes(node):
+    """
+    Counts the AST nodes reachable from a node.
+
+    Parameters:
+    - node: The root of the tree, as returned by Parser.parse.
+
+    Returns:
+    - int: The number of node objects in the tree.
+    """
+    count = 0
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif type(item).__name__.endswith('Node'):
+            count += 1
+            stack.extend(vars(item).values())
+    return count
+
+
+def lex(text, engine):
+    """Lexes the text, raising on a lexing error."""
+    tokens, error = Lexer('<benchmark>', text, engine=engine).enumerate_tokens()
+    if error:
+        raise RuntimeError(error.to_string())
+    return tokens
+
+
+def parse(tokens):
+    """Parses a token list, raising on a syntax error."""
+    result = Parser(tokens).parse()
+    if result.error:
+        raise RuntimeError(result.error.to_string())
+    return result.node
+
+
+def lex_and_parse(text, engine):
+    """Parses the text with tokens streamed from the lexer, raising on any error."""
+    lexer = Lexer('<benchmark>', text, engine=engine)
+    result = Parser.from_lexer(lexer).parse()
+    if lexer.error or result.error:
+        raise RuntimeError((lexer.error or result.error).to_string())
+    return result.node
+
+
+def measure(function, *args, repeat):
+    """
+    Times a call and measures its peak memory.
+
+    The call is timed `repeat` times with the garbage collector disabled, then run once
+    more under tracemalloc, which slows it down too much to time it at the same run.
+
+    Returns:
+    - float: The best wall-clock time in seconds.
+    - int: The peak number of bytes allocated during the call.
+    - any: The value returned by the call.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()  # Same as timeit: keep collector pauses out of the measurement.
+        try:
+            start = time.perf_counter()
+            value = function(*args)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        value = None
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, value
+
+
+def run_workload(name, scale, repeat, engine):
+    """
+    Runs the three phases of one workload.
+
+    Returns:
+    - dict: The size of the program and the results of each phase. A phase that fails
+        (e.g. by exceeding the recursion limit) records its error instead.
+    """
+    generator, size = WORKLOADS[name]
+    size = max(int(size * scale), 1)
+    text = generator(size)
+    result = {'size': size, 'characters': len(text), 'phases': {}}
+
+    tokens = lex(text, engine)
+    result['tokens'] = len(tokens)
+    phases = (('lex', lex, (text, engine)),
+              ('parse', parse, (tokens,)),
+              ('lex+parse', lex_and_parse, (text, engine)))
+
+    for phase, function, args in phases:
+        try:
+            seconds, peak, value = measure(function, *args, repeat=repeat)
+        except (RuntimeError, RecursionError) as exception:
+            result['phases'][phase] = {'error': f'{type(exception).__name__}: {exception}'}
+            continue
+        if phase != 'lex' and 'nodes' not in result:
+            result['nodes'] = count_nodes(value)
+        stats = {'seconds': seconds, 'peak_bytes': peak,
+                 'tokens_per_sec': len(tokens) / seconds}
+        if phase != 'lex':
+            stats['nodes_per_sec'] = result['nodes'] / seconds
+        result['phases'][phase] = stats
+    return result
+
+
+def main():
+    """Runs the selected workloads, prints a summary and optionally writes JSON results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--workload', action='append', choices=sorted(WORKLOADS),
+                            help='workload to run (repeatable, default: all)')
+    arg_parser.add_argument('--scale', type=float, default=1.0,
+                            help='multiplier applied to every workload size')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--engine', choices=LEXER_ENGINES, default='table')
+    arg_parser.add_argument('--json', metavar='PATH', help='write the results to PATH as JSON')
+    args = arg_parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'engine': args.engine,
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'workloads': {},
+    }
+    for name in args.workload or WORKLOADS:
+        result = report['workloads'][name] = run_workload(name, args.scale, args.repeat,
+                                                          args.engine)
+        print(f'{name}: {result["characters"]} characters, {result["tokens"]} tokens, '
+              f'{result.get("nodes", "?")} nodes')
+        for phase, stats in result['phases'].items():
+            if 'error' in stats:
+                print(f'  {phase:>9}: {stats["error"]}')
+                continue
+            nodes = (f'{stats["nodes_per_sec"]:>12,.0f} nodes/sec'
+                     if 'nodes_per_sec' in stats else ' ' * 22)
+            print(f'  {phase:>9}: {stats["seconds"] * 1000:9.2f} ms '
+                  f'{stats["tokens_per_sec"]:>12,.0f} tokens/sec {nodes} '
+                  f'{stats["peak_bytes"] / 2 ** 20:8.1f} MiB peak')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+        print(f'results written to {args.json}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Module: lexer_engines
+
+Benchmarks the 'table' lexing engine against the 'legacy' one on a large synthetic
+SARDS program. tests/test_lexer.py checks that both engines produce identical tokens.
+
+Usage:
+    python -m benchmarks.lexer_engines [--statements N] [--repeat R]
+"""
+
+import argparse
+import gc
+import time
+
+from sards.core.lexer import Lexer, LEXER_ENGINES
+
+
+def generate_program(statements):
+    """
+    Builds a synthetic program that exercises every token class.
+
+    Parameters:
+    - statements (int): The number of statement groups to generate.
+
+    Returns:
+    - str: The program text, with ';' separating statements.
+    """
+    lines = []
+    for i in range(statements):
+        lines.append(f'define value_{i} = ({i} + 2.5) * {i} // 3 ** 2 % 7 - value_{i - 1}')
+        lines.append(f'when value_{i} >= {i} and value_{i} != 0 {{ show("line {i} \\t ok") }} '
+                     f'otherwise {{ [1, 2, {i}] }}')
+        lines.append(f'method fn_{i}(a, b) {{ a <= b ? a : b }}')
+    return ';'.join(lines)
+
+
+def time_engine(engine, text, repeat):
+    """
+    Times an engine over the given text.
+
+    Returns:
+    - float: The best wall-clock time in seconds over `repeat` runs.
+    - list: The tokens produced by the last run.
+    """
+    best = float('inf')
+    tokens = None
+    for _ in range(repeat):
+        tokens = None
+        gc.collect()
+        gc.disable()  # Same as timeit: keep collector pauses out of the measurement.
+        try:
+            start = time.perf_counter()
+            tokens, error = Lexer('<benchmark>', text, engine=engine).enumerate_tokens()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        if error:
+            raise RuntimeError(error.to_string())
+    return best, tokens
+
+
+def main():
+    """Runs the benchmark and prints the timings for each engine."""
+    arg_parser = argparse.ArgumentParser(description=__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--statements', type=int, default=5000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    text = generate_program(args.statements)
+    results = {engine: time_engine(engine, text, args.repeat) for engine in LEXER_ENGINES}
+
+    print(f'source: {len(text)} characters, {len(results["table"][1])} tokens')
+    for engine, (seconds, tokens) in results.items():
+        print(f'{engine:>8}: {seconds * 1000:9.2f} ms  '
+              f'({len(tokens) / seconds:,.0f} tokens/sec)')
+    print(f' speedup: {results["legacy"][0] / results["table"][0]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
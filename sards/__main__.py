@@ -0,0 +1,202 @@
+"""
+Module: __main__
+
+Command-line entry point for running SARDS programs from files.
+
+The script is memory-mapped and the lexer scans the mapped buffer directly, so a
+multi-megabyte source is never copied into a Python string; the parser pulls the
+tokens from the lexer as it needs them, so no token list is built either. With
+--cache-dir (or the SARDS_CACHE_DIR environment variable) the parsed program is
+stored as a .sardc entry and later runs of the unchanged script skip lexing and
+parsing. --engine closure runs the program through the closure compiler, and
+--engine bytecode compiles it to bytecode for the stack VM, instead of the
+tree-walking interpreter. The interpreter transpiles a method to Python once it has
+been called --hot-calls times.
+Without a script the interactive shell is started instead.
+
+Usage:
+    python -m sards [script.sards] [--timing] [--parser {recursive,stack}]
+                    [--cache-dir DIR] [--report-removed] [--engine {tree,closure,bytecode}]
+                    [--hot-calls N]
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+
+from sards.core import (Lexer, Parser, StackParser, Interpreter, Context, ProgramCache,
+                        CompiledProgram, BytecodeProgram, RunTimeError, optimize, transpiler)
+from sards.shell import global_symbol_table, repl
+
+PARSERS = {'recursive': Parser, 'stack': StackParser}
+ENGINES = ('tree', 'closure', 'bytecode')
+
+
+def execute(filename, source, timings=None, # pylint: disable=R0913
+            parser_class=Parser, stats=None, cache=None, removed=None, engine='tree'):
+    """
+    Lexes, parses and executes a program.
+
+    Parameters:
+    - filename (str): The name of the source file (used for error reporting).
+    - source (str or bytes-like): The program text, or a UTF-8 encoded buffer.
+    - timings (dict, optional): Receives the seconds spent in each phase that ran,
+        keyed by 'parse' (lexing and parsing, which run together), 'optimize', 'load'
+        (reading a cached program), 'compile' (closure and bytecode engines only) and
+        'execute'.
+    - parser_class (type, optional): The parser to use, Parser or StackParser.
+    - stats (dict, optional): Receives the parser's 'max_depth' when it reports one.
+    - cache (ProgramCache, optional): A cache of compiled programs to load the
+        program from, or to store it in once parsed.
+    - removed (list, optional): Receives a Removal for every piece of dead code the
+        optimizer removed (nothing when the program is loaded from the cache).
+    - engine (str, optional): The execution engine, 'tree' (the Interpreter),
+        'closure' (the ClosureCompiler) or 'bytecode' (the BytecodeCompiler and VM).
+
+    Returns:
+    - tuple:
+        - Value or None: The value of the program.
+        - Error or None: The first error encountered.
+    """
+    timings = {} if timings is None else timings
+
+    node = None
+    if cache:
+        start = time.perf_counter()
+        node = cache.load(filename, source)
+        timings['load'] = time.perf_counter() - start
+
+    if node is None:
+        # The parser pulls the tokens from the lexer as it goes, so the token list is
+        # never built and both phases are timed together.
+        start = time.perf_counter()
+        lexer = Lexer(filename, source)
+        parser = parser_class.from_lexer(lexer)
+        syntax_tree = parser.parse()
+        timings['parse'] = time.perf_counter() - start
+        if stats is not None and hasattr(parser, 'max_depth'):
+            stats['max_depth'] = parser.max_depth
+        error = lexer.error or syntax_tree.error
+        if error:
+            return None, error
+
+        start = time.perf_counter()
+        try:
+            node = optimize(syntax_tree.node, removed)
+        except RecursionError:
+            # Too deep for the recursive optimization passes, which may already have
+            # rewritten part of the tree: run a fresh parse of the program unoptimized.
+            node = parser_class.from_lexer(Lexer(filename, source)).parse().node
+            if removed is not None:
+                removed.clear()
+        timings['optimize'] = time.perf_counter() - start
+        if cache:
+            cache.store(source, node)
+
+    if engine in ('closure', 'bytecode'):
+        start = time.perf_counter()
+        program = CompiledProgram(node) if engine == 'closure' else BytecodeProgram(node)
+        timings['compile'] = time.perf_counter() - start
+        run = program.run
+    else:
+        run = lambda context: Interpreter().visit(node, context)
+
+    context = Context('<program>')
+    context.symbol_table = global_symbol_table
+    start = time.perf_counter()
+    try:
+        result = run(context)
+    except RecursionError:
+        return None, RunTimeError(node.pos_start, node.pos_end,
+                                  'Maximum recursion depth exceeded', context)
+    finally:
+        timings['execute'] = time.perf_counter() - start
+    return result.value, result.error
+
+
+def run_file(path, timing=False, parser='recursive', cache_dir=None, # pylint: disable=R0913
+             report_removed=False, engine='tree'):
+    """
+    Runs a SARDS script from a file.
+
+    Parameters:
+    - path (str): The path of the script.
+    - timing (bool, optional): Whether to print the time spent in each phase to stderr.
+    - parser (str, optional): The parsing mode, a key of PARSERS.
+    - cache_dir (str, optional): The directory of the compiled-program cache, if any.
+    - report_removed (bool, optional): Whether to print the dead code the optimizer
+        removed to stderr.
+    - engine (str, optional): The execution engine, one of ENGINES.
+
+    Returns:
+    - int: The exit status, 0 on success and 1 if the program reported an error.
+    """
+    timings = {}
+    stats = {}
+    removed = []
+    cache = ProgramCache(cache_dir) if cache_dir else None
+    with open(path, 'rb') as file:
+        try:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped.
+            source = b''
+        try:
+            _, error = execute(path, source, timings, PARSERS[parser], stats, cache, removed,
+                               engine)
+            # Positions resolve against the mapped buffer, so render before closing it.
+            message = error.to_string() if error else None
+            removals = [removal.to_string() for removal in removed]
+        finally:
+            if isinstance(source, mmap.mmap):
+                source.close()
+
+    if report_removed:
+        for removal in removals:
+            print(removal, file=sys.stderr)
+    if message:
+        print(message, file=sys.stderr)
+    if timing:
+        for phase, seconds in timings.items():
+            print(f'{phase:>8}: {seconds * 1000:10.2f} ms', file=sys.stderr)
+        print(f'{"total":>8}: {sum(timings.values()) * 1000:10.2f} ms', file=sys.stderr)
+        if 'max_depth' in stats:
+            print(f'max parse depth: {stats["max_depth"]}', file=sys.stderr)
+        if cache:
+            print(f'program cache: {"hit" if cache.hits else "miss"}', file=sys.stderr)
+    return 1 if message else 0
+
+
+def main():
+    """Parses the command line and runs a script or the interactive shell."""
+    arg_parser = argparse.ArgumentParser(prog='python -m sards', description=__doc__,
+                                         formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('script', nargs='?', help='the SARDS script to run')
+    arg_parser.add_argument('--timing', action='store_true',
+                            help='print the time spent lexing, parsing and executing')
+    arg_parser.add_argument('--parser', choices=PARSERS, default='recursive',
+                            help="parsing mode; 'stack' handles arbitrarily deep nesting")
+    arg_parser.add_argument('--cache-dir', metavar='DIR', default=os.environ.get('SARDS_CACHE_DIR'),
+                            help='cache parsed programs in DIR (default: $SARDS_CACHE_DIR)')
+    arg_parser.add_argument('--report-removed', action='store_true',
+                            help='print the dead code removed by the optimizer')
+    arg_parser.add_argument('--engine', choices=ENGINES, default='tree',
+                            help="execution engine; 'closure' compiles the program to closures, "
+                                 "'bytecode' to bytecode run by a stack VM")
+    arg_parser.add_argument('--hot-calls', metavar='N', type=int,
+                            default=transpiler.HOT_CALL_THRESHOLD,
+                            help='calls after which the tree engine transpiles a method to '
+                                 'Python (0 never does; default: %(default)s)')
+    args = arg_parser.parse_args()
+    transpiler.HOT_CALL_THRESHOLD = args.hot_calls
+
+    if args.script is None:
+        repl()
+        return 0
+    return run_file(args.script, args.timing, args.parser, args.cache_dir,
+                    args.report_removed, args.engine)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,7 @@ This module initializes the AST Nodes package.
 
 from .for_node import ForNode
 from .functions_node import FunctionCallNode, FunctionDefinitionNode
+from .hoisted_node import HoistedNode, LoopInvariantsNode
 from .if_node import IfNode
 from .jump_node import BreakNode, ReturnNode, ContinueNode
 from .switch_node import SwitchNode
@@ -12,4 +13,5 @@ from .while_node import WhileNode
 
 __all__ = ["ForNode", "IfNode", "BreakNode", "ReturnNode", "ContinueNode",
            "SwitchNode", "VariableUseNode", "VariableAssignNode", "SymbolTable",
-           "WhileNode", "FunctionCallNode", "FunctionDefinitionNode"]
+           "WhileNode", "FunctionCallNode", "FunctionDefinitionNode", "HoistedNode",
+           "LoopInvariantsNode"]
@@ -18,6 +18,8 @@ class ForNode: # pylint: disable=R0903
         pos_start: The starting position of the 'for' loop in the source code.
         pos_end: The ending position of the 'for' loop in the source code.
         return_null: A flag indicating whether the loop returns null.
+        frame_slot: The slot of the loop variable in the frame of the method the loop is
+                    in, if any (see sards.core.resolver).
     """
     def __init__(self, var_name_tok, start_value_node,
                  end_value_node, step_value_node, body_node, return_null):
@@ -29,3 +31,4 @@ class ForNode: # pylint: disable=R0903
         self.pos_start = self.var_name_tok.pos_start
         self.pos_end = self.body_node.pos_end
         self.return_null = return_null
+        self.frame_slot = None
@@ -19,12 +19,17 @@ class FunctionDefinitionNode: # pylint: disable=R0903
                      the last evaluated expression.
         pos_start: The starting position of the function definition in the source code.
         pos_end: The ending position of the function definition in the source code.
+        frame_slot: The slot of the function name in the frame of the method the
+                    definition is in, if any (see sards.core.resolver).
+        layout: The FrameLayout of the function, once the definition is evaluated.
     """
     def __init__(self, var_name_tok, arg_name_toks, body_node, auto_return):
         self.var_name_tok = var_name_tok
         self.arg_name_toks = arg_name_toks
         self.body_node = body_node
         self.auto_return = auto_return
+        self.frame_slot = None
+        self.layout = None
 
         if self.var_name_tok:
             self.pos_start = self.var_name_tok.pos_start
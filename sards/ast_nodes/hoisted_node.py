@@ -0,0 +1,51 @@
+"""
+This module defines the HoistedNode and LoopInvariantsNode classes, which the
+optimizer uses to evaluate loop-invariant expressions once per run of a loop.
+
+Classes:
+    HoistedNode: A class to represent a loop-invariant expression in the AST.
+    LoopInvariantsNode: A class to represent a loop holding hoisted expressions in the AST.
+"""
+
+class HoistedNode: # pylint: disable=R0903
+    """
+    Represents a loop-invariant expression in the abstract syntax tree (AST).
+
+    The first value the expression produces during a run of its loop is kept in a
+    hidden temporary (a symbol named `slot`, which no program can refer to) and reused
+    by the iterations after it.
+
+    Attributes:
+        expression_node: The node representing the invariant expression.
+        slot: The name of the hidden temporary holding the expression's value.
+        variable_names: The names of the variables the expression reads.
+        builtin_names: The names of the built-in functions the expression calls.
+        pos_start: The starting position of the expression in the source code.
+        pos_end: The ending position of the expression in the source code.
+    """
+    def __init__(self, expression_node, slot, variable_names, builtin_names):
+        self.expression_node = expression_node
+        self.slot = slot
+        self.variable_names = variable_names
+        self.builtin_names = builtin_names
+        self.pos_start = self.expression_node.pos_start
+        self.pos_end = self.expression_node.pos_end
+
+
+class LoopInvariantsNode: # pylint: disable=R0903
+    """
+    Represents a 'for' or 'while' loop holding hoisted expressions in the AST.
+
+    The hidden temporaries of the loop are cleared before and after every run of it.
+
+    Attributes:
+        loop_node: The node representing the loop.
+        slots: The names of the hidden temporaries of the loop's hoisted expressions.
+        pos_start: The starting position of the loop in the source code.
+        pos_end: The ending position of the loop in the source code.
+    """
+    def __init__(self, loop_node, slots):
+        self.loop_node = loop_node
+        self.slots = slots
+        self.pos_start = self.loop_node.pos_start
+        self.pos_end = self.loop_node.pos_end
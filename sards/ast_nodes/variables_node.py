@@ -63,11 +63,14 @@ class VariableUseNode: # pylint: disable=R0903
         var_name_tok: The token representing the variable name.
         pos_start: The starting position of the variable usage in the source code.
         pos_end: The ending position of the variable usage in the source code.
+        frame_slot: The slot of the variable in the frame of the method the node is in,
+                    if the method binds it (see sards.core.resolver).
     """
     def __init__(self, var_name_tok):
         self.var_name_tok = var_name_tok
         self.pos_start = self.var_name_tok.pos_start
         self.pos_end = self.var_name_tok.pos_end
+        self.frame_slot = None
 
     def __repr__(self):
         return f'({self.var_name_tok.value})'
@@ -82,12 +85,15 @@ class VariableAssignNode: # pylint: disable=R0903
         value_node: The node representing the value to assign to the variable.
         pos_start: The starting position of the variable assignment in the source code.
         pos_end: The ending position of the variable assignment in the source code.
+        frame_slot: The slot of the variable in the frame of the method the node is in,
+                    if any (see sards.core.resolver).
     """
     def __init__(self, var_name_tok, value_node):
         self.var_name_tok = var_name_tok
         self.value_node = value_node
         self.pos_start = self.var_name_tok.pos_start
         self.pos_end = self.value_node.pos_end
+        self.frame_slot = None
 
     def __repr__(self):
         return f'({self.var_name_tok.value}:{self.value_node})'
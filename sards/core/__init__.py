@@ -3,16 +3,33 @@ This module initializes the Core package.
 """
 
 from .error import (
-    Error, InvalidSyntaxError, IllegalCharError, ExpectedCharError, RunTimeError, Position
+    Error, InvalidSyntaxError, IllegalCharError, ExpectedCharError, RunTimeError, Position,
+    SourceFile, ParseError
 )
 from .parser import (
     Parser, ParseResult, TernaryOperationNode, UnaryOperationNode, BinaryOperationNode, NumberNode
 )
-from .interpreter import Interpreter, Context, RunTimeResult
+from .interpreter import Interpreter, Context, RunTimeResult, Unwind
+from .compiler import ClosureCompiler, CompiledProgram
+from .bytecode import BytecodeCompiler, CodeObject, disassemble
+from .vm import BytecodeProgram
+from .transpiler import PythonTranspiler, MethodProfile, transpile
+from .optimizer import (
+    NodeTransformer, ConstantFolder, DeadCodeEliminator, LoopInvariantHoister, Removal, optimize
+)
+from .resolver import Frame, FrameLayout, Resolver, resolve
 from .lexer import Lexer, Token
+from .stack_parser import StackParser
+from .cache import ProgramCache
 
 __all__ = ["Error", "InvalidSyntaxError", "IllegalCharError",
-           "ExpectedCharError", "RunTimeError", "Position",
-           "Parser", "ParseResult",
+           "ExpectedCharError", "RunTimeError", "Position", "SourceFile", "ParseError",
+           "Parser", "ParseResult", "StackParser",
            "TernaryOperationNode", "UnaryOperationNode", "BinaryOperationNode", "NumberNode",
-           "Lexer", "Token", "Interpreter", "Context", "RunTimeResult"]
+           "Lexer", "Token", "Interpreter", "Context", "RunTimeResult", "ProgramCache",
+           "ClosureCompiler", "CompiledProgram", "Unwind",
+           "BytecodeCompiler", "CodeObject", "BytecodeProgram", "disassemble",
+           "PythonTranspiler", "MethodProfile", "transpile",
+           "NodeTransformer", "ConstantFolder", "DeadCodeEliminator",
+           "LoopInvariantHoister", "Removal", "optimize",
+           "Frame", "FrameLayout", "Resolver", "resolve"]
@@ -0,0 +1,524 @@
+"""
+Module: bytecode
+
+This module implements the bytecode compiler of the stack virtual machine (see vm.py)
+and its disassembler.
+
+A syntax tree is compiled into a CodeObject: a flat array of instructions, each an
+opcode followed by one integer argument, and a constant pool. Operands that do not
+fit an integer (names, literal values, positions, value-method tables, the code of
+nested methods) are stored in the pool as tuples, and the argument of the
+instruction is their index. Every instruction leaves the stack as the matching
+Interpreter visit method leaves its result, so the VM produces the same values,
+output and errors as the tree-walker.
+
+Loops and menus push a block on the VM's block stack, which tells it where an
+`escape` or `proceed` (possibly raised inside a method the block calls) continues.
+Statements whose value is never used (those of loop, `when` and menu bodies that
+return null, and of the bodies of methods that do not return their last value) are
+compiled without it: blocks, loops and menus do not build their List, and `when`
+chains push no value. A few
+superinstructions fuse common sequences: an operation between a variable and a
+number literal, between two variables or between any operand and a number literal
+(e.g. `i < 10`, `a + b`, `f(n) - 1`), and an assignment whose value is discarded.
+Binary operations carry the NUMBER_OPERATIONS entry of their method, which the VM
+applies directly when both operands are Numbers.
+
+Classes:
+- CodeObject: The compiled bytecode of a program or method.
+- BytecodeCompiler: Compiles a syntax tree into a CodeObject.
+
+Functions:
+- disassemble(code_object): Returns a readable listing of a CodeObject.
+"""
+
+import operator
+from array import array
+
+from sards.ast_nodes import (
+    VariableUseNode, VariableAssignNode, IfNode, ForNode, WhileNode, SwitchNode,
+    LoopInvariantsNode
+)
+from sards.data_types import ListNode
+from .constants import K_MINUS, K_KEYWORD
+from .interpreter import BINARY_OPERATIONS
+from .parser import NumberNode
+from .resolver import resolve
+
+# Opcodes, hottest first (the VM tests them in this order).
+OPCODE_NAMES = (
+    'BINARY', 'BINARY_NUMBER', 'BINARY_NAME_NUMBER', 'BINARY_NAME_NAME', 'LOAD_NAME',
+    'LOAD_NUMBER', 'STORE_POP', 'HOISTED_LOAD', 'POP_JUMP_IF_FALSE', 'JUMP', 'FOR_ITER',
+    'CALL', 'RETURN_VALUE', 'LIST_APPEND', 'POP_TOP', 'STORE_NAME', 'LOAD_STRING',
+    'LOAD_ZERO', 'BUILD_LIST', 'HOISTED_STORE', 'SET_POS', 'UNARY_NEGATE', 'UNARY_NOT',
+    'MENU_ARM', 'MENU_MATCH', 'MENU_DEFAULT', 'SETUP_LOOP', 'POP_BLOCK', 'FOR_SETUP',
+    'BUILD_RESULT', 'NEW_ACCUMULATOR', 'SETUP_SLOTS', 'POP_SLOTS', 'BREAK_LOOP',
+    'CONTINUE_LOOP', 'MAKE_FUNCTION', 'EVAL_NODE', 'END',
+)
+(BINARY, BINARY_NUMBER, BINARY_NAME_NUMBER, BINARY_NAME_NAME, LOAD_NAME, LOAD_NUMBER,
+ STORE_POP, HOISTED_LOAD, POP_JUMP_IF_FALSE, JUMP, FOR_ITER, CALL, RETURN_VALUE,
+ LIST_APPEND, POP_TOP, STORE_NAME, LOAD_STRING, LOAD_ZERO, BUILD_LIST, HOISTED_STORE,
+ SET_POS, UNARY_NEGATE, UNARY_NOT, MENU_ARM, MENU_MATCH, MENU_DEFAULT, SETUP_LOOP,
+ POP_BLOCK, FOR_SETUP, BUILD_RESULT, NEW_ACCUMULATOR, SETUP_SLOTS, POP_SLOTS, BREAK_LOOP,
+ CONTINUE_LOOP, MAKE_FUNCTION, EVAL_NODE, END) = range(len(OPCODE_NAMES))
+
+# Opcodes whose argument is a code offset rather than an index into the constants.
+JUMP_OPCODES = frozenset({POP_JUMP_IF_FALSE, JUMP})
+# Opcodes whose argument is a plain number.
+NUMBER_OPCODES = frozenset({LIST_APPEND, MENU_ARM, END})
+# Opcodes without an argument.
+NO_ARGUMENT_OPCODES = frozenset({POP_TOP, LOAD_ZERO, POP_BLOCK, NEW_ACCUMULATOR, BREAK_LOOP,
+                                 CONTINUE_LOOP, RETURN_VALUE})
+
+# For the Number methods that, between two Numbers, return
+# Number(function(left.value, right.value)) in the context of the left operand: the
+# function, and whether the method fails instead when the right operand is zero.
+NUMBER_OPERATIONS = {
+    'add': (operator.add, False),
+    'subtract': (operator.sub, False),
+    'multiply': (operator.mul, False),
+    'divide': (operator.truediv, True),
+    'modulus': (operator.mod, True),
+    'floor_divide': (operator.floordiv, True),
+    'exponent': (operator.pow, False),
+    'get_comparison_eq': (lambda left, right: int(left == right), False),
+    'get_comparison_neq': (lambda left, right: int(left != right), False),
+    'get_comparison_lt': (lambda left, right: int(left < right), False),
+    'get_comparison_lte': (lambda left, right: int(left <= right), False),
+    'get_comparison_gt': (lambda left, right: int(left > right), False),
+    'get_comparison_gte': (lambda left, right: int(left >= right), False),
+    'and_by': (lambda left, right: int(left != 0 and right != 0), False),
+    'or_by': (lambda left, right: int(left != 0 or right != 0), False),
+}
+
+
+class CodeObject: # pylint: disable=R0903
+    """
+    The compiled bytecode of a program or method.
+
+    Attributes:
+    - name (str): The name of the program or method.
+    - code (array): The instructions, as (opcode, argument) pairs of integers.
+    - constants (list): The constant pool; operand tuples indexed by instruction
+        arguments.
+    """
+
+    def __init__(self, name):
+        """
+        Initializes an empty CodeObject.
+
+        Parameters:
+        - name (str): The name of the program or method.
+        """
+        self.name = name
+        self.code = array('l')
+        self.constants = []
+
+
+class BytecodeCompiler:
+    """
+    Compiles a syntax tree into a CodeObject.
+
+    Like Interpreter.visit, `compile` dispatches on the node's class name, to a
+    `compile_<ClassName>` method emitting the instructions that push the node's
+    value. Node classes without one are evaluated through the Interpreter (EVAL_NODE).
+
+    Methods:
+    - compile_program(node): Compiles the root of a program.
+    - compile(node): Emits the instructions evaluating a node.
+    - discard(node): Emits the instructions evaluating a node for its effects only.
+    """
+
+    def __init__(self, name='<program>'):
+        """
+        Initializes a compiler.
+
+        Parameters:
+        - name (str, optional): The name of the program or method being compiled.
+        """
+        self.code_object = CodeObject(name)
+
+    def compile_program(self, node, returns_value=True):
+        """
+        Compiles the root of a program or the body of a method.
+
+        Parameters:
+        - node (AST Node): The root node.
+        - returns_value (bool, optional): Whether the code returns the node's value;
+            otherwise it is evaluated for its effects and the code returns None.
+
+        Returns:
+        - CodeObject: The compiled code.
+        """
+        if returns_value:
+            self.compile(node)
+        else:
+            self.discard(node)
+        self.emit(END, int(returns_value))
+        return self.code_object
+
+    def emit(self, opcode, argument=0):
+        """Appends an instruction and returns its offset."""
+        code = self.code_object.code
+        code.append(opcode)
+        code.append(argument)
+        return len(code) - 2
+
+    def constant(self, *operands):
+        """Adds an operand tuple to the constant pool and returns its index."""
+        constants = self.code_object.constants
+        constants.append(operands)
+        return len(constants) - 1
+
+    def here(self):
+        """Returns the offset of the next instruction."""
+        return len(self.code_object.code)
+
+    def patch(self, offset, target=None):
+        """Sets the jump target of the instruction at `offset` (default: here)."""
+        self.code_object.code[offset + 1] = self.here() if target is None else target
+
+    def compile(self, node):
+        """Emits the instructions pushing the value of a node."""
+        method = getattr(self, f'compile_{type(node).__name__}', self.generic_compile)
+        method(node)
+
+    def discard(self, node):
+        """Emits the instructions evaluating a node whose value is not used."""
+        if isinstance(node, ListNode):
+            for element in node.element_nodes:
+                self.discard(element)
+        elif isinstance(node, VariableAssignNode):
+            self.compile(node.value_node)
+            self.emit(STORE_POP, self.constant(node.var_name_tok.value))
+        elif isinstance(node, (IfNode, ForNode, WhileNode, SwitchNode, LoopInvariantsNode)):
+            getattr(self, f'compile_{type(node).__name__}')(node, keep=False)
+        else:
+            self.compile(node)
+            self.emit(POP_TOP)
+
+    def generic_compile(self, node):
+        """Evaluates a node the bytecode does not cover through the Interpreter."""
+        self.emit(EVAL_NODE, self.constant(node))
+
+    def compile_NumberNode(self, node): # pylint: disable=C0103
+        """Compiles a number literal."""
+        self.emit(LOAD_NUMBER, self.constant(node.token.value, node.pos_start, node.pos_end))
+
+    def compile_StringNode(self, node): # pylint: disable=C0103
+        """Compiles a string literal."""
+        self.emit(LOAD_STRING, self.constant(node.token.value, node.pos_start, node.pos_end))
+
+    def compile_ListNode(self, node): # pylint: disable=C0103
+        """Compiles a list literal or a block whose value is used."""
+        for element in node.element_nodes:
+            self.compile(element)
+        self.emit(BUILD_LIST, self.constant(len(node.element_nodes), node.pos_start,
+                                            node.pos_end))
+
+    def compile_VariableUseNode(self, node): # pylint: disable=C0103
+        """Compiles a variable read."""
+        self.emit(LOAD_NAME, self.constant(node.var_name_tok.value, node.pos_start,
+                                           node.pos_end))
+
+    def compile_VariableAssignNode(self, node): # pylint: disable=C0103
+        """Compiles a variable assignment."""
+        self.compile(node.value_node)
+        self.emit(STORE_NAME, self.constant(node.var_name_tok.value))
+
+    def compile_BinaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a binary operation, fusing variable and number operands."""
+        left, right = node.left_node, node.right_node
+        operation = (node.method_name, BINARY_OPERATIONS[node.method_name],
+                     *NUMBER_OPERATIONS.get(node.method_name, (None, False)),
+                     node.pos_start, node.pos_end)
+        if isinstance(left, VariableUseNode) and isinstance(right, NumberNode):
+            self.emit(BINARY_NAME_NUMBER, self.constant(
+                left.var_name_tok.value, left.pos_start, left.pos_end,
+                right.token.value, right.pos_start, right.pos_end, *operation))
+        elif isinstance(left, VariableUseNode) and isinstance(right, VariableUseNode):
+            self.emit(BINARY_NAME_NAME, self.constant(
+                left.var_name_tok.value, left.pos_start, left.pos_end,
+                right.var_name_tok.value, right.pos_start, right.pos_end, *operation))
+        elif isinstance(right, NumberNode):
+            self.compile(left)
+            self.emit(BINARY_NUMBER, self.constant(
+                None, None, None, right.token.value, right.pos_start, right.pos_end,
+                *operation))
+        else:
+            self.compile(left)
+            self.compile(right)
+            self.emit(BINARY, self.constant(*operation))
+
+    def compile_UnaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a unary operation."""
+        self.compile(node.node)
+        positions = self.constant(node.pos_start, node.pos_end)
+        if node.operator.kind == K_MINUS:
+            self.emit(UNARY_NEGATE, positions)
+        elif node.operator.kind == K_KEYWORD and node.operator.value == 'not':
+            self.emit(UNARY_NOT, positions)
+        else:
+            self.emit(SET_POS, positions)
+
+    def compile_TernaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a ternary operation."""
+        positions = self.constant(node.pos_start, node.pos_end)
+        self.compile(node.comp_node)
+        to_false = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.true_node)
+        self.emit(SET_POS, positions)
+        to_end = self.emit(JUMP)
+        self.patch(to_false)
+        self.compile(node.false_node)
+        self.emit(SET_POS, positions)
+        self.patch(to_end)
+
+    def compile_arm(self, expression, return_null, keep=True):
+        """Compiles a when/otherwise arm, which evaluates to 0 if it returns null."""
+        if not keep:
+            self.discard(expression)
+        elif return_null:
+            self.discard(expression)
+            self.emit(LOAD_ZERO)
+        else:
+            self.compile(expression)
+
+    def compile_IfNode(self, node, keep=True): # pylint: disable=C0103
+        """Compiles a when/orwhen/otherwise chain (that pushes no value unless `keep`)."""
+        to_end = []
+        for condition, expression, return_null in node.cases:
+            self.compile(condition)
+            to_next = self.emit(POP_JUMP_IF_FALSE)
+            self.compile_arm(expression, return_null, keep)
+            to_end.append(self.emit(JUMP))
+            self.patch(to_next)
+        if node.else_case:
+            self.compile_arm(*node.else_case, keep)
+        elif keep:
+            self.emit(LOAD_ZERO)
+        for offset in to_end:
+            self.patch(offset)
+
+    def compile_result(self, node, keep):
+        """Pushes the value of a loop or menu: 0, or the List of its accumulated values."""
+        if not keep:
+            return
+        if node.return_null:
+            self.emit(LOAD_ZERO)
+        else:
+            self.emit(BUILD_RESULT, self.constant(node.pos_start, node.pos_end))
+
+    def compile_ForNode(self, node, keep=True): # pylint: disable=C0103
+        """Compiles a Cycle loop (that pushes no value unless `keep`)."""
+        accumulate = keep and not node.return_null
+        if accumulate:
+            self.emit(NEW_ACCUMULATOR)
+        self.compile(node.start_value_node)
+        self.compile(node.end_value_node)
+        if node.step_value_node:
+            self.compile(node.step_value_node)
+        self.emit(FOR_SETUP, self.constant(node.step_value_node is not None))
+
+        setup = self.emit(SETUP_LOOP)
+        head = self.here()
+        loop_exit = self.emit(FOR_ITER)
+        if accumulate:
+            self.compile(node.body_node)
+            self.emit(LIST_APPEND, 2)
+        else:
+            self.discard(node.body_node)
+        self.emit(JUMP, head)
+
+        exit_offset = self.here()
+        self.emit(POP_BLOCK)
+        break_offset = self.here()
+        self.emit(POP_TOP)  # The loop state.
+        self.compile_result(node, keep)
+        self.code_object.code[setup + 1] = self.constant(break_offset, head, -1)
+        self.code_object.code[loop_exit + 1] = self.constant(node.var_name_tok.value,
+                                                             exit_offset)
+
+    def compile_WhileNode(self, node, keep=True): # pylint: disable=C0103
+        """Compiles a whenever loop (that pushes no value unless `keep`)."""
+        accumulate = keep and not node.return_null
+        if accumulate:
+            self.emit(NEW_ACCUMULATOR)
+        setup = self.emit(SETUP_LOOP)
+        head = self.here()
+        self.compile(node.condition_node)
+        loop_exit = self.emit(POP_JUMP_IF_FALSE)
+        if accumulate:
+            self.compile(node.body_node)
+            self.emit(LIST_APPEND, 1)
+        else:
+            self.discard(node.body_node)
+        self.emit(JUMP, head)
+
+        self.patch(loop_exit)
+        self.emit(POP_BLOCK)
+        break_offset = self.here()
+        self.compile_result(node, keep)
+        # A jump out of a call in the condition is not the loop's: the Interpreter
+        # evaluates the condition outside of it.
+        self.code_object.code[setup + 1] = self.constant(break_offset, head, loop_exit)
+
+    def compile_SwitchNode(self, node, keep=True): # pylint: disable=C0103
+        """Compiles a menu (that pushes no value unless `keep`)."""
+        accumulate = keep and not node.return_null
+        if accumulate:
+            self.emit(NEW_ACCUMULATOR)
+        self.compile(node.select)
+
+        # Choices are evaluated in order until one matches; the block is only set up
+        # once the arm to start at is known.
+        matches, default = [], None
+        for index, (choice, _, _) in enumerate(node.cases):
+            if choice is None:
+                default = index
+                continue
+            self.compile(choice)
+            matches.append((self.emit(MENU_MATCH), index))
+        no_match = self.emit(MENU_DEFAULT)
+
+        arm_offsets = []
+        for _, body, return_null in node.cases:
+            arm_offsets.append(self.here())
+            if not accumulate:
+                self.discard(body)
+                continue
+            self.emit(MENU_ARM, int(return_null))
+            self.compile_arm(body, return_null)
+            self.emit(LIST_APPEND, 1)
+        end_offset = self.here()
+        self.emit(POP_BLOCK)
+        break_offset = self.here()
+        self.compile_result(node, keep)
+
+        for offset, index in matches:
+            self.code_object.code[offset + 1] = self.constant(arm_offsets[index], break_offset,
+                                                              accumulate)
+        start = arm_offsets[default] if default is not None else end_offset
+        self.code_object.code[no_match + 1] = self.constant(start, break_offset, accumulate)
+
+    def compile_FunctionDefinitionNode(self, node): # pylint: disable=C0103
+        """Compiles a method definition and, into its own CodeObject, its body."""
+        name = node.var_name_tok.value if node.var_name_tok else None
+        body_code = BytecodeCompiler(name or '<anonymous>').compile_program(
+            node.body_node, node.auto_return)
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        if node.layout is None:
+            # Records the names the body binds in BOUND_NAMES (see vm.MethodScope).
+            node.layout = resolve(arg_names, node.body_node)
+        self.emit(MAKE_FUNCTION, self.constant(name, node.body_node, arg_names, node.auto_return,
+                                               body_code, node.pos_start, node.pos_end))
+
+    def compile_FunctionCallNode(self, node): # pylint: disable=C0103
+        """Compiles a call."""
+        self.compile(node.call_node)
+        for arg_node in node.arg_nodes:
+            self.compile(arg_node)
+        self.emit(CALL, self.constant(len(node.arg_nodes), node.pos_start, node.pos_end))
+
+    def compile_ReturnNode(self, node): # pylint: disable=C0103
+        """Compiles a yield."""
+        if node.node_to_return:
+            self.compile(node.node_to_return)
+        else:
+            self.emit(LOAD_ZERO)
+        self.emit(RETURN_VALUE)
+
+    def compile_ContinueNode(self, node): # pylint: disable=C0103,W0613
+        """Compiles a proceed."""
+        self.emit(CONTINUE_LOOP)
+
+    def compile_BreakNode(self, node): # pylint: disable=C0103,W0613
+        """Compiles an escape."""
+        self.emit(BREAK_LOOP)
+
+    def compile_LoopInvariantsNode(self, node, keep=True): # pylint: disable=C0103
+        """Compiles a loop holding hoisted expressions (see LoopInvariantHoister)."""
+        slots = self.constant(node.slots)
+        self.emit(SETUP_SLOTS, slots)
+        if keep:
+            self.compile(node.loop_node)
+        else:
+            self.discard(node.loop_node)
+        self.emit(POP_SLOTS, slots)
+
+    def compile_HoistedNode(self, node): # pylint: disable=C0103
+        """Compiles a loop-invariant expression (see Interpreter.visit_HoistedNode)."""
+        load = self.emit(HOISTED_LOAD)
+        self.compile(node.expression_node)
+        self.emit(HOISTED_STORE, self.constant(node))
+        self.code_object.code[load + 1] = self.constant(node.slot, self.here())
+
+
+def describe_constant(opcode, constant):
+    """Formats the operands of an instruction for the disassembly."""
+    if opcode in (LOAD_NUMBER, LOAD_STRING):
+        return repr(constant[0])
+    if opcode in (LOAD_NAME, STORE_NAME, STORE_POP):
+        return constant[0]
+    if opcode == BINARY:
+        return constant[0]
+    if opcode == BINARY_NUMBER:
+        return f'{constant[6]} {constant[3]!r}'
+    if opcode == BINARY_NAME_NUMBER:
+        return f'{constant[0]} {constant[6]} {constant[3]!r}'
+    if opcode == BINARY_NAME_NAME:
+        return f'{constant[0]} {constant[6]} {constant[3]}'
+    if opcode == CALL:
+        return f'{constant[0]} args'
+    if opcode == FOR_ITER:
+        return f'{constant[0]}, exit to {constant[1]}'
+    if opcode == SETUP_LOOP:
+        return f'escape to {constant[0]}, proceed to {constant[1]}'
+    if opcode in (MENU_MATCH, MENU_DEFAULT):
+        return f'arm at {constant[0]}, escape to {constant[1]}'
+    if opcode == MAKE_FUNCTION:
+        return f'method {constant[0] or "<anonymous>"}({", ".join(constant[2])})'
+    if opcode == HOISTED_LOAD:
+        return f'{constant[0]}, cached skips to {constant[1]}'
+    if opcode in (SETUP_SLOTS, POP_SLOTS):
+        return ', '.join(constant[0])
+    if opcode == FOR_SETUP:
+        return 'with step' if constant[0] else 'step 1'
+    if opcode == EVAL_NODE:
+        return type(constant[0]).__name__
+    return ''
+
+
+def disassemble(code_object):
+    """
+    Returns a readable listing of a CodeObject and of the methods it defines.
+
+    Each line shows the offset, the opcode, its argument and, for arguments that
+    index the constant pool, the operands they refer to.
+
+    Parameters:
+    - code_object (CodeObject): The compiled code.
+
+    Returns:
+    - str: The listing.
+    """
+    lines = [f'Disassembly of {code_object.name}:']
+    nested = []
+    code, constants = code_object.code, code_object.constants
+    for offset in range(0, len(code), 2):
+        opcode, argument = code[offset], code[offset + 1]
+        name = OPCODE_NAMES[opcode]
+        if opcode in NO_ARGUMENT_OPCODES:
+            lines.append(f'{offset:6} {name}')
+            continue
+        if opcode in JUMP_OPCODES or opcode in NUMBER_OPCODES:
+            described = ''
+        else:
+            described = describe_constant(opcode, constants[argument])
+            if opcode == MAKE_FUNCTION:
+                nested.append(constants[argument][4])
+        lines.append(f'{offset:6} {name:<20} {argument:<6} {described}'.rstrip())
+    for function_code in nested:
+        lines.append('')
+        lines.append(disassemble(function_code))
+    return '\n'.join(lines)
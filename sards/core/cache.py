@@ -0,0 +1,280 @@
+"""
+Module: cache
+
+This module implements an on-disk cache of compiled programs (.sardc files).
+
+Lexing and parsing the same script on every run is wasted work when the script has
+not changed. A ProgramCache stores the optimized syntax tree of each program it
+compiles in a directory, in a compact binary form keyed by a hash of the source text
+and the SARDS_VERSION, and hands it back on later runs so the Lexer, Parser and
+optimizer are skipped.
+
+An entry is a small header followed by the zlib-compressed pickle of the tree, in
+which tokens and positions are stored as constructor arguments rather than slot
+state. The text of the SourceFile they point into is not stored: the file is rebound
+to the source being run when the entry is loaded, so the cached tree reports errors
+against the current file.
+
+Entries are written to a temporary file and renamed into place, so readers never see
+a partial entry, and the least recently used entries are removed once the directory
+outgrows its size limit.
+
+Anything that goes wrong while reading or writing the cache (a missing or read-only
+directory, a truncated or corrupt entry, a tree too deep to pickle) is ignored and
+the program is simply compiled from source.
+
+Entries are unpickled when they are loaded, but the unpickler only resolves the
+classes a syntax tree is made of (PROGRAM_CLASSES), so a tampered entry can at worst
+produce a broken tree, not run code.
+
+Classes:
+- ProgramCache: Loads and stores compiled programs in a cache directory.
+"""
+
+import copyreg
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import zlib
+
+from sards.ast_nodes import (ForNode, FunctionCallNode, FunctionDefinitionNode, HoistedNode,
+                             LoopInvariantsNode, IfNode, BreakNode, ReturnNode, ContinueNode,
+                             SwitchNode, VariableUseNode, VariableAssignNode, WhileNode)
+from sards.data_types import ListNode, StringNode, List, String, Number
+from .constants import SARDS_VERSION
+from .error import Position, SourceFile
+from .lexer import Token
+from .parser import NumberNode, UnaryOperationNode, BinaryOperationNode, TernaryOperationNode
+
+# Bumped whenever the layout of an entry, or the optimizations applied to the stored
+# tree (see optimizer.OPTIMIZATION_PASSES), change.
+CACHE_FORMAT = 6
+MAGIC = b'SARDC'
+HEADER = MAGIC + bytes((CACHE_FORMAT,))
+SUFFIX = '.sardc'
+
+# The only classes an entry may refer to: the syntax tree nodes, the tokens and
+# positions they hold, and the values constant folding can leave in the tree.
+PROGRAM_CLASSES = {
+    (cls.__module__, cls.__qualname__): cls for cls in (
+        NumberNode, UnaryOperationNode, BinaryOperationNode, TernaryOperationNode,
+        ForNode, FunctionCallNode, FunctionDefinitionNode, HoistedNode, LoopInvariantsNode,
+        IfNode, BreakNode, ReturnNode, ContinueNode, SwitchNode, VariableUseNode,
+        VariableAssignNode, WhileNode, ListNode, StringNode, List, String, Number,
+        Token, Position, SourceFile)
+}
+
+
+def reduce_token(token):
+    """Pickles a Token as a constructor call, which loads faster than its slot state."""
+    return Token, (token.kind, token.value, token.start, token.end, token.source)
+
+
+def reduce_position(position):
+    """Pickles a Position as a constructor call."""
+    return Position, (position.index, position.source)
+
+
+def reduce_source_file(source_file):
+    """Pickles a SourceFile without its text; it is rebound when the tree is loaded."""
+    return SourceFile, (source_file.name, '')
+
+
+class ProgramPickler(pickle.Pickler): # pylint: disable=R0903
+    """Pickles a syntax tree using the compact reducers above."""
+
+    dispatch_table = {**copyreg.dispatch_table, Token: reduce_token,
+                      Position: reduce_position, SourceFile: reduce_source_file}
+
+
+class ProgramUnpickler(pickle.Unpickler): # pylint: disable=R0903
+    """
+    Unpickles a syntax tree, binding its SourceFile to the program being run.
+
+    Only the classes in PROGRAM_CLASSES can be loaded.
+    """
+
+    def __init__(self, file, source_file):
+        super().__init__(file)
+        self.source_file = source_file
+
+    def find_class(self, module, name):
+        """Resolves a class, replacing SourceFile with the current source file."""
+        cls = PROGRAM_CLASSES.get((module, name))
+        if cls is None:
+            raise pickle.UnpicklingError(f'{module}.{name} is not part of a compiled program')
+        if cls is SourceFile:
+            return lambda name, text: self.source_file
+        return cls
+
+
+class ProgramCache:
+    """
+    Stores compiled programs in a directory, keyed by source hash and SARDS version.
+
+    Attributes:
+    - directory (str): The directory holding the .sardc entries.
+    - max_bytes (int): The total size the entries may take before the least recently
+        used ones are evicted.
+    - hits (int): The number of programs loaded from the cache.
+    - misses (int): The number of programs that had to be compiled.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 2 ** 20):
+        """
+        Initializes a ProgramCache instance.
+
+        Parameters:
+        - directory (str): The cache directory; it is created when the first entry
+            is stored.
+        - max_bytes (int, optional): The size limit of the directory's entries.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source):
+        """
+        Computes the cache key of a program.
+
+        Text and UTF-8 encoded buffers get different keys, since token offsets are
+        character offsets in the first and byte offsets in the second.
+
+        Parameters:
+        - source (str or bytes-like): The program text or its UTF-8 encoded buffer.
+
+        Returns:
+        - str: The hexadecimal key.
+        """
+        digest = hashlib.sha256(f'{SARDS_VERSION}:{CACHE_FORMAT}:'.encode())
+        if isinstance(source, str):
+            digest.update(b'str:')
+            digest.update(source.encode('utf-8', 'surrogatepass'))
+        else:
+            digest.update(b'bytes:')
+            digest.update(source)
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Returns the path of the entry for a key."""
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, filename, source):
+        """
+        Loads the compiled program for a source, if it is cached.
+
+        Parameters:
+        - filename (str): The name of the source file (used for error reporting).
+        - source (str or bytes-like): The program text or its UTF-8 encoded buffer.
+
+        Returns:
+        - The root node of the program's syntax tree, or None if there is no usable
+            entry for this source.
+        """
+        path = self.path(self.key(source))
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            if not data.startswith(HEADER):
+                raise ValueError('not a compiled program of this format')
+            payload = io.BytesIO(zlib.decompress(data[len(HEADER):]))
+            node = ProgramUnpickler(payload, SourceFile(filename, source)).load()
+        except Exception: # pylint: disable=W0718
+            # Stale or corrupt entry: drop it and compile from source.
+            self.discard(path)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Marks the entry as recently used for eviction.
+        except OSError:
+            pass
+        self.hits += 1
+        return node
+
+    def store(self, source, node):
+        """
+        Stores the compiled program for a source and evicts old entries if needed.
+
+        Parameters:
+        - source (str or bytes-like): The program text or its UTF-8 encoded buffer.
+        - node: The root node of the program's syntax tree.
+
+        Returns:
+        - bool: Whether the entry was written.
+        """
+        try:
+            buffer = io.BytesIO()
+            ProgramPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(node)
+            data = HEADER + zlib.compress(buffer.getvalue())
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+
+        path = self.path(self.key(source))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(data)
+                os.replace(temporary, path)
+            except BaseException:
+                self.discard(temporary)
+                raise
+        except OSError:
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as iterator:
+                for entry in iterator:
+                    if not entry.name.endswith(SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    def clear(self):
+        """Removes every entry from the cache directory."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(SUFFIX):
+                self.discard(os.path.join(self.directory, name))
+
+    @staticmethod
+    def discard(path):
+        """Removes a file, ignoring a file that is already gone."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,393 @@
+"""
+Module: compiler
+
+This module implements the closure-compilation execution engine, an alternative to the
+tree-walking Interpreter.
+
+The ClosureCompiler turns a syntax tree, once, into a tree of nested Python closures:
+one per node, each taking the execution context, calling the closures of its children
+directly and returning the node's value. Running the program then costs no per-node
+dispatch through the Interpreter's handler table.
+
+Whatever stops the evaluation (a runtime error, `yield`, `escape` or `proceed`) is
+raised as an Unwind holding its RunTimeResult, as in the Interpreter. The closures of
+loops, menus and functions catch it where the Interpreter's handlers do, so both
+engines produce the same values, output and errors, with the same positions. Both share the
+Number, String, List and function value types: methods defined in compiled code are
+CompiledFunctions, whose bodies are closures too, and any function can be called from
+either engine.
+
+Classes:
+- ClosureCompiler: Compiles AST nodes into closures.
+- CompiledProgram: A compiled syntax tree, run like Interpreter.visit.
+"""
+
+from sards.ast_nodes import ReturnNode, ContinueNode, BreakNode
+from sards.data_types import Number, String, List
+from .constants import K_MINUS, K_KEYWORD
+from .error import RunTimeError
+from .interpreter import (
+    Interpreter, RunTimeResult, Unwind, BINARY_OPERATIONS, registered, failure,
+    binary_operation, loop_values
+)
+from .resolver import resolve
+from .vm import call
+
+
+class ClosureCompiler:
+    """
+    Compiles AST nodes into closures.
+
+    Like Interpreter.visit, `compile` dispatches on the node's class name, to a
+    `compile_<ClassName>` method. Node classes without one (e.g. those installed with
+    Interpreter.register) compile to a closure that runs them through the Interpreter.
+
+    Methods:
+    - compile(node): Compiles a node into a closure.
+    """
+
+    def compile(self, node):
+        """
+        Compiles a node.
+
+        Parameters:
+        - node (AST Node): The node to compile.
+
+        Returns:
+        - function: A closure taking the execution context and returning the node's
+            value, or raising Unwind.
+        """
+        method = getattr(self, f'compile_{type(node).__name__}', self.generic_compile)
+        return method(node)
+
+    @staticmethod
+    def generic_compile(node):
+        """Compiles a node the closures cannot evaluate into a call of the Interpreter."""
+        def evaluate(context):
+            return Interpreter().evaluate(node, context)
+        return evaluate
+
+    @staticmethod
+    def compile_NumberNode(node): # pylint: disable=C0103
+        """Compiles a number literal."""
+        value, pos_start, pos_end = node.token.value, node.pos_start, node.pos_end
+
+        def number(context):
+            return Number(value).set_context(context).set_pos(pos_start, pos_end)
+        return number
+
+    @staticmethod
+    def compile_StringNode(node): # pylint: disable=C0103
+        """Compiles a string literal."""
+        value, pos_start, pos_end = node.token.value, node.pos_start, node.pos_end
+
+        def string(context):
+            return String(value).set_context(context).set_pos(pos_start, pos_end)
+        return string
+
+    def compile_ListNode(self, node): # pylint: disable=C0103
+        """Compiles a list literal or a block of statements."""
+        elements = [self.compile(element) for element in node.element_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def list_(context):
+            values = [element(context) for element in elements]
+            return List(values).set_context(context).set_pos(pos_start, pos_end)
+        return list_
+
+    @staticmethod
+    def compile_VariableUseNode(node): # pylint: disable=C0103
+        """Compiles a variable read."""
+        name, pos_start, pos_end = node.var_name_tok.value, node.pos_start, node.pos_end
+
+        def variable(context):
+            value = context.symbol_table.get(name)
+            if value is None:
+                raise failure(RunTimeError(pos_start, pos_end, f"'{name}' is not defined",
+                                           context))
+            return value.copy().set_pos(pos_start, pos_end).set_context(context)
+        return variable
+
+    def compile_VariableAssignNode(self, node): # pylint: disable=C0103
+        """Compiles a variable assignment."""
+        name, value_of = node.var_name_tok.value, self.compile(node.value_node)
+
+        def assign(context):
+            value = value_of(context)
+            context.symbol_table.set(name, value)
+            return value
+        return assign
+
+    def compile_BinaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a binary operation."""
+        left_of, right_of = self.compile(node.left_node), self.compile(node.right_node)
+        method_name, pos_start, pos_end = node.method_name, node.pos_start, node.pos_end
+        operations = BINARY_OPERATIONS[method_name]
+
+        def binary(context):
+            return binary_operation(left_of(context), right_of(context), method_name,
+                                    operations, pos_start, pos_end)
+        return binary
+
+    def compile_UnaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a unary operation."""
+        operand_of, pos_start, pos_end = self.compile(node.node), node.pos_start, node.pos_end
+        operator = node.operator
+
+        if operator.kind == K_MINUS:
+            def unary(context):
+                number, error = operand_of(context).multiply(Number(-1))
+                if error:
+                    raise failure(error)
+                return number.set_pos(pos_start, pos_end)
+        elif operator.kind == K_KEYWORD and operator.value == 'not':
+            def unary(context):
+                number, error = operand_of(context).not_by()
+                if error:
+                    raise failure(error)
+                return number.set_pos(pos_start, pos_end)
+        else:
+            def unary(context):
+                return operand_of(context).set_pos(pos_start, pos_end)
+        return unary
+
+    def compile_TernaryOperationNode(self, node): # pylint: disable=C0103
+        """Compiles a ternary operation."""
+        condition_of = self.compile(node.comp_node)
+        true_of, false_of = self.compile(node.true_node), self.compile(node.false_node)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def ternary(context):
+            if condition_of(context).is_true():
+                return true_of(context).set_pos(pos_start, pos_end)
+            return false_of(context).set_pos(pos_start, pos_end)
+        return ternary
+
+    def compile_IfNode(self, node): # pylint: disable=C0103
+        """Compiles a when/orwhen/otherwise chain."""
+        cases = [(self.compile(condition), self.compile(expression), return_null)
+                 for condition, expression, return_null in node.cases]
+        else_case = None
+        if node.else_case:
+            expression, return_null = node.else_case
+            else_case = (self.compile(expression), return_null)
+
+        def when(context):
+            for condition_of, expression_of, return_null in cases:
+                if condition_of(context).is_true():
+                    value = expression_of(context)
+                    return Number(0) if return_null else value
+            if else_case:
+                expression_of, return_null = else_case
+                value = expression_of(context)
+                return Number(0) if return_null else value
+            return Number(0)
+        return when
+
+    def compile_ForNode(self, node): # pylint: disable=C0103
+        """Compiles a Cycle loop."""
+        start_of, end_of = self.compile(node.start_value_node), self.compile(node.end_value_node)
+        step_of = self.compile(node.step_value_node) if node.step_value_node else None
+        body_of, name = self.compile(node.body_node), node.var_name_tok.value
+        return_null, pos_start, pos_end = node.return_null, node.pos_start, node.pos_end
+
+        def cycle(context):
+            start_value = start_of(context)
+            end_value = end_of(context)
+            step_value = step_of(context) if step_of else Number(1)
+
+            def iterations():
+                i = start_value.value
+                ascending = step_value.value >= 0
+                while i <= end_value.value if ascending else i >= end_value.value:
+                    context.symbol_table.set(name, Number(i))
+                    i += step_value.value
+                    yield
+
+            elements = loop_values(iterations(), body_of, context)
+            if return_null:
+                return Number(0)
+            return List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return cycle
+
+    def compile_WhileNode(self, node): # pylint: disable=C0103
+        """Compiles a whenever loop."""
+        condition_of, body_of = self.compile(node.condition_node), self.compile(node.body_node)
+        return_null, pos_start, pos_end = node.return_null, node.pos_start, node.pos_end
+
+        def whenever(context):
+            def iterations():
+                while condition_of(context).is_true():
+                    yield
+
+            elements = loop_values(iterations(), body_of, context)
+            if return_null:
+                return Number(0)
+            return List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return whenever
+
+    def compile_SwitchNode(self, node): # pylint: disable=C0103
+        """Compiles a menu."""
+        selection_of = self.compile(node.select)
+        cases = [(None if choice is None else self.compile(choice), self.compile(body),
+                  return_null) for choice, body, return_null in node.cases]
+        return_null, pos_start, pos_end = node.return_null, node.pos_start, node.pos_end
+
+        def menu(context):
+            selection = selection_of(context)
+            start_index = default_index = len(cases)
+            for index, (choice_of, _, _) in enumerate(cases):
+                if choice_of is None:
+                    default_index = index
+                elif selection.value == choice_of(context).value:
+                    start_index = index
+                    break
+            else:
+                start_index = default_index
+
+            elements = []
+            for _, body_of, arm_return_null in cases[start_index:]:
+                try:
+                    value = body_of(context)
+                except Unwind as unwind:
+                    if not unwind.result.loop_or_switch_break:
+                        raise
+                    elements.append(Number(0) if arm_return_null else None)
+                    break
+                elements.append(Number(0) if arm_return_null else value)
+
+            if return_null:
+                return Number(0)
+            return List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return menu
+
+    def compile_FunctionDefinitionNode(self, node): # pylint: disable=C0103
+        """Compiles a method definition, compiling its body once."""
+        from sards.user_functions import CompiledFunction
+
+        name = node.var_name_tok.value if node.var_name_tok else None
+        body_node, body_of = node.body_node, self.compile(node.body_node)
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        auto_return, pos_start, pos_end = node.auto_return, node.pos_start, node.pos_end
+
+        def define(context):
+            if node.layout is None:
+                node.layout = resolve(arg_names, body_node)
+            function = (CompiledFunction(name, body_node, arg_names, auto_return, body_of,
+                                         node.layout)
+                        .set_context(context)
+                        .set_pos(pos_start, pos_end))
+            if name:
+                context.symbol_table.set(name, function)
+            return function
+        return define
+
+    def compile_FunctionCallNode(self, node): # pylint: disable=C0103
+        """Compiles a call."""
+        callee_of = self.compile(node.call_node)
+        args_of = [self.compile(arg_node) for arg_node in node.arg_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def call_(context):
+            function = callee_of(context)
+            args = [arg_of(context) for arg_of in args_of]
+            return call(function, args, pos_start, pos_end, context)
+        return call_
+
+    def compile_ReturnNode(self, node): # pylint: disable=C0103
+        """Compiles a yield."""
+        value_of = self.compile(node.node_to_return) if node.node_to_return else None
+
+        def yield_(context):
+            try:
+                value = value_of(context) if value_of else Number(0)
+            except Unwind as unwind:
+                raise Unwind(registered(unwind.result)) from None
+            raise Unwind(RunTimeResult().success_return(value))
+        return yield_
+
+    @staticmethod
+    def compile_ContinueNode(node): # pylint: disable=C0103,W0613
+        """Compiles a proceed."""
+        def proceed(context): # pylint: disable=W0613
+            raise Unwind(RunTimeResult().success_continue())
+        return proceed
+
+    @staticmethod
+    def compile_BreakNode(node): # pylint: disable=C0103,W0613
+        """Compiles an escape."""
+        def escape(context): # pylint: disable=W0613
+            raise Unwind(RunTimeResult().success_break())
+        return escape
+
+    def compile_LoopInvariantsNode(self, node): # pylint: disable=C0103
+        """Compiles a loop holding hoisted expressions (see LoopInvariantHoister)."""
+        loop_of, slots = self.compile(node.loop_node), node.slots
+
+        def loop(context):
+            symbols = context.symbol_table.symbols
+            for slot in slots:
+                symbols.pop(slot, None)
+            try:
+                return loop_of(context)
+            finally:
+                for slot in slots:
+                    symbols.pop(slot, None)
+        return loop
+
+    def compile_HoistedNode(self, node): # pylint: disable=C0103
+        """Compiles a loop-invariant expression (see Interpreter.visit_HoistedNode)."""
+        expression_of, slot = self.compile(node.expression_node), node.slot
+
+        def hoisted(context):
+            symbols = context.symbol_table.symbols
+            cached = symbols.get(slot)
+            if cached is not None:
+                return cached.copy()
+            value = expression_of(context)
+            if Interpreter.is_invariant(node, value, context):
+                symbols[slot] = value.copy()
+            return value
+        return hoisted
+
+
+class CompiledProgram: # pylint: disable=R0903
+    """
+    A syntax tree compiled by the ClosureCompiler.
+
+    Attributes:
+    - node (AST Node): The root of the syntax tree.
+    - closure (function): The closure evaluating it.
+
+    Methods:
+    - run(context): Runs the program and returns its RunTimeResult.
+    """
+
+    def __init__(self, node):
+        """
+        Compiles a syntax tree.
+
+        Parameters:
+        - node (AST Node): The root of the tree, as returned by Parser.parse() or
+            optimize().
+        """
+        self.node = node
+        self.closure = ClosureCompiler().compile(node)
+
+    def run(self, context):
+        """
+        Runs the program, as Interpreter().visit(node, context) would.
+
+        Parameters:
+        - context (Context): The execution context.
+
+        Returns:
+        - RunTimeResult: The result of the program.
+        """
+        try:
+            return RunTimeResult().success(self.closure(context))
+        except Unwind as unwind:
+            # The Interpreter hands a jump's own result back unregistered.
+            if isinstance(self.node, (ReturnNode, ContinueNode, BreakNode)):
+                return unwind.result
+            return registered(unwind.result)
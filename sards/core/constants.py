@@ -6,11 +6,19 @@ and token types for mathematical expressions.
 """
 import string
 
+# Version of the language implementation. Compiled programs cached on disk are only
+# reused by the version that wrote them (see cache.ProgramCache).
+SARDS_VERSION = '0.0.4'
+
 # Set of characters representing numerical digits
 DIGITS = '0123456789'
 LETTERS = string.ascii_letters
 LETTERS_DIGITS = DIGITS + LETTERS
 
+# Character classes used by the lexer's scanners for constant-time membership tests
+IDENTIFIER_CHARS = frozenset(LETTERS_DIGITS + '_')
+NUMBER_CHARS = frozenset(DIGITS + '.')
+
 # Token Types for mathematical operations and symbols
 T_INT = 'INT'  # Integer number token
 T_FLOAT = 'FLOAT'  # Floating-point number token
@@ -43,7 +51,41 @@ T_NEWLINE = 'NEWLINE'
 T_EOF = 'EOF'  # End of File
 T_QUESTION = 'QUESTION'
 
-# Keywords list
+# Integer token kinds. Tokens store these instead of the type names above, so the
+# parser compares small integers; TOKEN_NAMES maps a kind back to its type name.
+TOKEN_NAMES = (T_INT, T_FLOAT, T_STRING, T_IDENTIFIER, T_KEYWORD, T_PLUS, T_MINUS, T_MUL,
+               T_DIVIDE, T_MODULUS, T_FLOOR, T_EXP, T_EQ, T_NEQ, T_EE, T_LT, T_GT, T_LTE,
+               T_GTE, T_LPAREN, T_RPAREN, T_LPAREN2, T_RPAREN2, T_LPAREN3, T_RPAREN3,
+               T_COLON, T_COMMA, T_NEWLINE, T_EOF, T_QUESTION)
+TOKEN_KINDS = {name: kind for kind, name in enumerate(TOKEN_NAMES)}
+
+(K_INT, K_FLOAT, K_STRING, K_IDENTIFIER, K_KEYWORD, K_PLUS, K_MINUS, K_MUL,
+ K_DIVIDE, K_MODULUS, K_FLOOR, K_EXP, K_EQ, K_NEQ, K_EE, K_LT, K_GT, K_LTE,
+ K_GTE, K_LPAREN, K_RPAREN, K_LPAREN2, K_RPAREN2, K_LPAREN3, K_RPAREN3,
+ K_COLON, K_COMMA, K_NEWLINE, K_EOF, K_QUESTION) = range(len(TOKEN_NAMES))
+
+# Single-character and two-character symbols mapped to their token kinds
+SYMBOL_TOKENS = {
+    '+': K_PLUS, '-': K_MINUS, '*': K_MUL, '/': K_DIVIDE, '%': K_MODULUS,
+    '**': K_EXP, '//': K_FLOOR, '=': K_EQ, '==': K_EE, '!=': K_NEQ,
+    '<': K_LT, '>': K_GT, '<=': K_LTE, '>=': K_GTE,
+    '(': K_LPAREN, ')': K_RPAREN, '{': K_LPAREN2, '}': K_RPAREN2,
+    '[': K_LPAREN3, ']': K_RPAREN3, ':': K_COLON, ',': K_COMMA,
+    '?': K_QUESTION, ';': K_NEWLINE, '\n': K_NEWLINE
+}
+
+# Keywords set
+
+KEYWORDS = frozenset({'define', 'and', 'or', 'not', 'when', 'orwhen', 'otherwise', 'Cycle',
+                      'whenever', 'method', 'yield', 'escape', 'proceed', 'menu', 'choice',
+                      'fallback'})
 
-KEYWORDS = ['define', 'and', 'or', 'not', 'when', 'orwhen', 'otherwise', 'Cycle', 'whenever',
-            'method', 'yield', 'escape', 'proceed', 'menu', 'choice', 'fallback']
+# Names of the value methods (Number, String, List) implementing each binary operator,
+# by token kind, and for the `and`/`or` keywords by keyword.
+BINARY_OPERATION_METHODS = {
+    K_PLUS: 'add', K_MINUS: 'subtract', K_MUL: 'multiply', K_DIVIDE: 'divide',
+    K_MODULUS: 'modulus', K_FLOOR: 'floor_divide', K_EXP: 'exponent',
+    K_EE: 'get_comparison_eq', K_NEQ: 'get_comparison_neq', K_GT: 'get_comparison_gt',
+    K_GTE: 'get_comparison_gte', K_LT: 'get_comparison_lt', K_LTE: 'get_comparison_lte',
+}
+KEYWORD_OPERATION_METHODS = {'and': 'and_by', 'or': 'or_by'}
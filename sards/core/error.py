@@ -5,61 +5,150 @@ This module provides utility classes for tracking the position of characters in
 and handling errors encountered during tokenization or parsing.
 
 Classes:
-- Position: Maintains the current position in the input text, including index, line, and column.
+- SourceFile: Holds a source text and a lazily built index of its line start offsets.
+- Position: Maintains the current position in the input text as an offset into a SourceFile.
 - Error: Serves as a base class for error handling, storing details about errors that occur.
 - IllegalCharError: A specific error subclass for handling illegal character occurrences.
 - InvalidSyntaxError: A specific error subclass for handling invalid syntax occurrences.
+- ParseError: The exception the Parser raises to abandon a parse at a syntax error.
 - RunTimeError: Handles runtime errors encountered during execution.
 """
 
+from bisect import bisect_right
+
+
+class SourceFile:
+    """
+    Holds the name and text of a source file and resolves character offsets to lines.
+
+    The offsets at which each line starts are found once, the first time a line or
+    column is asked for, so sources that never report an error never pay for them.
+
+    Attributes:
+    - name (str): The name of the file.
+    - text (str or bytes-like): The full content of the file, either as a string or as a
+        UTF-8 encoded buffer such as a memory-mapped file (offsets are then byte offsets).
+    """
+
+    __slots__ = ('name', 'text', '_line_starts')
+
+    def __init__(self, name, text):
+        """
+        Initializes a SourceFile instance.
+
+        Parameters:
+        - name (str): The name of the file.
+        - text (str): The full content of the file.
+        """
+        self.name = name
+        self.text = text
+        self._line_starts = None
+
+    @property
+    def line_starts(self):
+        """list: The offset at which each line of the text starts."""
+        if self._line_starts is None:
+            text = self.text
+            separator = '\n' if isinstance(text, str) else b'\n'
+            line_starts = [0]
+            newline = text.find(separator)
+            while newline != -1:
+                line_starts.append(newline + 1)
+                newline = text.find(separator, newline + 1)
+            self._line_starts = line_starts
+        return self._line_starts
+
+    def edit(self, offset, deleted_length, inserted_text):
+        """
+        Replaces a span of the text, invalidating the line index.
+
+        Positions into the file keep pointing at the same offsets, so positions
+        created before the edit resolve against the edited text.
+
+        Parameters:
+        - offset (int): The offset at which the edit starts.
+        - deleted_length (int): The number of characters removed at the offset.
+        - inserted_text (str): The text inserted in their place.
+        """
+        self.text = self.text[:offset] + inserted_text + self.text[offset + deleted_length:]
+        self._line_starts = None
+
+    def line_col(self, index):
+        """
+        Resolves a character offset to its line and column.
+
+        Parameters:
+        - index (int): The character offset in the text.
+
+        Returns:
+        - tuple: The zero-based (line, column) of the offset.
+        """
+        line_starts = self.line_starts
+        line = max(bisect_right(line_starts, index) - 1, 0)
+        return line, index - line_starts[line]
+
 
 class Position:
     """
-    Tracks the current position in the input text, including index, line, and column.
+    Tracks a position in the input text as a character offset into its source file.
+
+    The line and column are not stored; they are looked up in the source file's line
+    index when they are read, which in practice only happens when an error is shown.
 
     Attributes:
-    - index (int): The current character index in the input text.
-    - line (int): The current line number in the input text.
-    - col (int): The current column number in the input text.
+    - index (int): The character index in the input text.
+    - source (SourceFile): The file the index points into.
+    - line (int): The line number of the index (computed on access).
+    - col (int): The column number of the index (computed on access).
     - file_name (str): The name of the file being processed.
     - file_text (str): The full content of the file being processed.
     """
 
-    def __init__(self, index, line, col, file_name, file_text):
+    __slots__ = ('index', 'source')
+
+    def __init__(self, index, source):
         """
         Initializes a Position instance.
 
         Parameters:
         - index (int): The character index in the input text.
-        - line (int): The line number in the input text.
-        - col (int): The column number in the input text.
-        - file_name (str): The name of the file being processed.
-        - file_text (str): The full content of the file.
+        - source (SourceFile): The file the index points into.
         """
         self.index = index
-        self.line = line
-        self.col = col
-        self.file_name = file_name
-        self.file_text = file_text
+        self.source = source
+
+    @property
+    def line(self):
+        """int: The zero-based line number of the position."""
+        return self.source.line_col(self.index)[0]
 
-    def advance(self, current_char=None):
+    @property
+    def col(self):
+        """int: The zero-based column number of the position."""
+        return self.source.line_col(self.index)[1]
+
+    @property
+    def file_name(self):
+        """str: The name of the file being processed."""
+        return self.source.name
+
+    @property
+    def file_text(self):
+        """str: The full content of the file being processed."""
+        return self.source.text
+
+    def advance(self, current_char=None): # pylint: disable=W0613
         """
         Moves the position forward by one character.
 
-        If the character is a newline ('\n'), it increments the line number
-        and resets the column number. Otherwise, it simply increments the column number.
-
         Parameters:
-        - current_char (str, optional): The character currently being processed.
+        - current_char (str, optional): The character currently being processed. Kept
+            for compatibility; line breaks are resolved from the source file.
 
         Returns:
         - Position: The updated position object.
         """
         self.index += 1
-        self.col += 1
-        if current_char == '\n':
-            self.line += 1
-            self.col = 0
         return self
 
     def copy(self):
@@ -69,7 +158,7 @@ class Position:
         Returns:
         - Position: A new instance of Position with the same values.
         """
-        return Position(self.index, self.line, self.col, self.file_name, self.file_text)
+        return Position(self.index, self.source)
 
 
 class Error: # pylint: disable=too-few-public-methods
@@ -164,6 +253,29 @@ class InvalidSyntaxError(Error): # pylint: disable=too-few-public-methods
         super().__init__(pos_start, pos_end, 'Invalid Syntax', details)
 
 
+class ParseError(Exception):
+    """
+    Raised by the Parser's grammar rules when the tokens do not match the grammar.
+
+    The exception unwinds every rule in progress at once; Parser.parse catches it and
+    returns the error it carries in a ParseResult, so callers still receive errors as
+    values.
+
+    Attributes:
+    - error (InvalidSyntaxError): The syntax error that stopped the parse.
+    """
+
+    def __init__(self, error):
+        """
+        Initializes a ParseError instance.
+
+        Parameters:
+        - error (InvalidSyntaxError): The syntax error that stopped the parse.
+        """
+        super().__init__(error.details)
+        self.error = error
+
+
 class RunTimeError(Error):
     """
     Represents an error encountered during the execution phase.
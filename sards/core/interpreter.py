@@ -7,12 +7,31 @@ It includes classes for handling runtime context, execution results, and evaluat
 Classes:
 - Context: Maintains execution context (e.g., scope, parent context).
 - RunTimeResult: Stores the result of an evaluation, including errors.
+- Unwind: Carries the result of a runtime error or jump up through the evaluation.
 - Interpreter: Evaluates AST nodes and executes operations.
 """
 
+from functools import partial
+
+from sards.ast_nodes import VariableUseNode, FunctionCallNode
 from sards.data_types import Number, String, List
-from .constants import (T_PLUS, T_MINUS, T_MUL, T_DIVIDE, T_MODULUS, T_FLOOR, T_EXP, T_EE,
-                        T_NEQ, T_GT, T_GTE, T_LT, T_LTE, T_KEYWORD)
+from .constants import (K_MINUS, K_KEYWORD, BINARY_OPERATION_METHODS,
+                        KEYWORD_OPERATION_METHODS)
+from .error import RunTimeError
+from .resolver import resolve
+
+# The function implementing each binary operation for each value type, by method name
+# (see BinaryOperationNode.method_name).
+BINARY_OPERATIONS = {
+    method: {value_type: getattr(value_type, method)
+             for value_type in (Number, String, List) if hasattr(value_type, method)}
+    for method in (*BINARY_OPERATION_METHODS.values(), *KEYWORD_OPERATION_METHODS.values())
+}
+
+# The nodes whose value is shared rather than built for them: a variable read returns
+# the stored value and a call the value the method returned. Their value stands at the
+# position of the node, in the context it is evaluated in, whatever is set on it.
+SHARED_NODES = frozenset((VariableUseNode, FunctionCallNode))
 
 class Context: # pylint: disable=R0903
     """
@@ -97,17 +116,151 @@ class RunTimeResult:
                 self.loop_or_switch_break)
 
 
+class Unwind(Exception):
+    """
+    Carries a RunTimeResult that stops evaluation up through the Interpreter and
+    compiled code.
+
+    Attributes:
+    - result (RunTimeResult): The failure, or the result of a `yield`, `escape` or
+        `proceed`.
+    - node (AST Node): The jump node that raised it, if any.
+    """
+
+    def __init__(self, result, node=None):
+        super().__init__(result)
+        self.result = result
+        self.node = node
+
+
+def registered(result):
+    """
+    Returns a result as it is after a RunTimeResult registers it.
+
+    That is how the Interpreter hands a result up from every node but the one that
+    produced it (see RunTimeResult.register).
+    """
+    parent = RunTimeResult()
+    parent.register(result)
+    return parent
+
+
+def failure(error):
+    """Returns an Unwind for a runtime error."""
+    return Unwind(RunTimeResult().failure(error))
+
+
+def placed(node, value, context):
+    """
+    Returns the value of a node positioned at the node, copying it if it is shared.
+
+    Parameters:
+    - node (AST Node): The node evaluated.
+    - value (any): Its value.
+    - context (Context): The context it was evaluated in.
+
+    Returns:
+    - any: The value itself, or a copy positioned at the node if the node is one of
+        SHARED_NODES.
+    """
+    if type(node) in SHARED_NODES:
+        return value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+    return value
+
+
+def binary_operation(left, right, method_name, operations, pos_start, # pylint: disable=R0913
+                     pos_end):
+    """
+    Applies a binary operation to two values, as the compiled engines do.
+
+    Parameters:
+    - left, right (any): The operands.
+    - method_name (str): The name of the operation's method (see
+        BinaryOperationNode.method_name).
+    - operations (dict): The operation of each value type, from BINARY_OPERATIONS.
+    - pos_start, pos_end (Position): The position of the operation.
+
+    Returns:
+    - any: The result, positioned at the operation.
+
+    Raises:
+    - Unwind: For the runtime error of the operation.
+    """
+    operation = operations.get(type(left))
+    if operation is None:
+        result, error = getattr(left, method_name)(right)
+    else:
+        result, error = operation(left, right)
+    if error:
+        raise failure(error)
+    return result.set_pos(pos_start, pos_end)
+
+
+def loop_values(iterations, body, context):
+    """
+    Runs the body of a loop once per iteration, catching its `escape` and `proceed`.
+
+    Parameters:
+    - iterations (iterable): Yields once before each iteration, after preparing it
+        (testing the condition, setting the loop variable); a jump raised there is not
+        the loop's.
+    - body (function): Evaluates the body, given the context.
+    - context (Context): The execution context.
+
+    Returns:
+    - list: The values of the iterations that completed.
+    """
+    elements = []
+    for _ in iterations:
+        try:
+            value = body(context)
+        except Unwind as unwind:
+            if unwind.result.loop_continue:
+                continue
+            if unwind.result.loop_or_switch_break:
+                break
+            raise
+        elements.append(value)
+    return elements
+
+
 class Interpreter:
     """
     Interprets an abstract syntax tree (AST) by visiting its nodes and evaluating expressions.
 
+    Each node class is evaluated by a handler, a function taking the interpreter, the
+    node and the context and returning the node's value. The handler of a class is the
+    `visit_<ClassName>` method, looked up once, the first time a node of the class is
+    visited, and kept in the class-level `handlers` table; node classes defined
+    elsewhere can install theirs with `register`.
+
+    A runtime error, `yield`, `escape` or `proceed` raises an Unwind holding its
+    RunTimeResult, so the handlers of the nodes it passes through do no work for it:
+    only loops catch `escape` and `proceed`, menus `escape`, and Function.execute
+    what leaves a method body.
+
+    Values are not copied to be positioned: a variable read or a call returns the
+    shared value (see SHARED_NODES), and the handlers taking positions or a context
+    from their operands take them from the operand nodes instead. Only a handler
+    handing such a value on as its own copies it, with `placed`.
+
     Methods:
-    - visit(node, context): Determines the appropriate visit method for a node.
+    - visit(node, context): Evaluates a node into a RunTimeResult.
+    - evaluate(node, context): Evaluates a node into its value, raising Unwind.
+    - register(node_class, handler): Installs the handler of a node class.
     - visit_NumberNode(node, context): Evaluates a number node.
     - visit_BinaryOperationNode(node, context): Evaluates binary operations (+, -, *, /).
     - visit_UnaryOperationNode(node, context): Evaluates unary operations (-).
     """
 
+    # Handler of each AST node class, filled as node classes are first visited.
+    handlers = {}
+
+    def __init_subclass__(cls, **kwargs):
+        # A subclass may override visit methods, so it resolves its own handlers.
+        super().__init_subclass__(**kwargs)
+        cls.handlers = {}
+
     def visit(self, node, context):
         """
         Visits an AST node and executes the corresponding evaluation method.
@@ -117,11 +270,83 @@ class Interpreter:
         - context (Context): The execution context.
 
         Returns:
-        - RunTimeResult: The evaluation result.
+        - RunTimeResult: The evaluation result: the value of the node, or the result
+            of the runtime error or jump that stopped it, registered (see
+            RunTimeResult.register) unless the node is the jump itself.
+        """
+        try:
+            return RunTimeResult().success(placed(node, self.evaluate(node, context), context))
+        except Unwind as unwind:
+            if unwind.node is node:
+                return unwind.result
+            return registered(unwind.result)
+
+    def evaluate(self, node, context):
+        """
+        Evaluates an AST node with the handler of its class.
+
+        Parameters:
+        - node (AST Node): The node to evaluate.
+        - context (Context): The execution context.
+
+        Returns:
+        - any: The value of the node.
+
+        Raises:
+        - Unwind: For a runtime error, `yield`, `escape` or `proceed` the node does not
+            handle.
+        """
+        try:
+            handler = self.handlers[type(node)]
+        except KeyError:
+            handler = self.resolve_handler(type(node))
+        return handler(self, node, context)
+
+    @classmethod
+    def resolve_handler(cls, node_class):
+        """
+        Looks up the `visit_<ClassName>` method of a node class and caches it.
+
+        Parameters:
+        - node_class (type): The class of the node.
+
+        Returns:
+        - function: The handler, called with the interpreter, the node and the context;
+            no_visit_method (not cached) if the class has no visit method.
         """
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        handler = getattr(cls, f'visit_{node_class.__name__}', None)
+        if handler is None:
+            return cls.no_visit_method
+        cls.handlers[node_class] = handler
+        return handler
+
+    @classmethod
+    def register(cls, node_class, handler=None):
+        """
+        Installs the handler evaluating a node class, replacing any cached one.
+
+        Can be used as a decorator, `@Interpreter.register(NodeClass)`, on a function
+        taking the interpreter, the node and the context, returning the node's value
+        and raising Unwind to stop the evaluation.
+        The handler is also installed as the `visit_<ClassName>` method, so subclasses
+        of the interpreter find it too.
+
+        Parameters:
+        - node_class (type): The class of the node.
+        - handler (function, optional): The handler; omit it to use the decorator form.
+
+        Returns:
+        - function: The handler, or the decorator installing it.
+        """
+        if handler is None:
+            return lambda handler: cls.register(node_class, handler)
+        setattr(cls, f'visit_{node_class.__name__}', handler)
+        stack = [cls]
+        while stack:
+            interpreter_class = stack.pop()
+            interpreter_class.handlers.pop(node_class, None)
+            stack.extend(interpreter_class.__subclasses__())
+        return handler
 
     def no_visit_method(self, node, context):
         """
@@ -137,157 +362,151 @@ class Interpreter:
         raise NotImplementedError(f'No visit_{type(node).__name__} method defined')
 
     def visit_ListNode(self, node, context):
-        res = RunTimeResult()
         elements = []
-
         for element_node in node.element_nodes:
-            elements.append(res.register(self.visit(element_node, context)))
-            if res.should_return():
-                return res
+            elements.append(self.evaluate(element_node, context))
 
-        return (res.success(List(elements)
-                            .set_context(context)
-                            .set_pos(node.pos_start, node.pos_end)))
+        return List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
 
     def visit_StringNode(self, node, context):
-        return RunTimeResult().success(
-            String(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return String(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
 
     def visit_FunctionDefinitionNode(self, node, context):
         from sards.user_functions import Function
-        res = RunTimeResult()
 
         func_name = node.var_name_tok.value if node.var_name_tok else None
         body_node = node.body_node
         arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-        func_value = (Function(func_name, body_node, arg_names, node.auto_return)
+        if node.layout is None:
+            node.layout = resolve(arg_names, body_node)
+        func_value = (Function(func_name, body_node, arg_names, node.auto_return,
+                               layout=node.layout)
                       .set_context(context)
                       .set_pos(node.pos_start, node.pos_end))
 
-        if node.var_name_tok:
+        if node.frame_slot is not None:
+            context.symbol_table.slots[node.frame_slot] = func_value
+        elif node.var_name_tok:
             context.symbol_table.set(func_name, func_value)
 
-        return res.success(func_value)
+        return func_value
 
     def visit_FunctionCallNode(self, node, context):
-        res = RunTimeResult()
         args = []
 
-        call_value = res.register(self.visit(node.call_node, context))
-        if res.should_return():
-            return res
-        call_value = call_value.copy().set_pos(node.pos_start, node.pos_end)
+        # The callee is a variable read, shared: it is handed the position and the
+        # context of the call rather than having them set on it.
+        call_value = self.evaluate(node.call_node, context)
 
         for arg_node in node.arg_nodes:
-            args.append(res.register(self.visit(arg_node, context)))
-            if res.should_return():
-                return res
-
-        return_value = res.register(call_value.execute(args))
-        if res.should_return():
-            return res
-        return_value = (return_value.copy()
-                        .set_pos(node.pos_start, node.pos_end)
-                        .set_context(context))
+            args.append(self.evaluate(arg_node, context))
 
-        return res.success(return_value)
+        result = call_value.execute(args, node.pos_start, node.pos_end, context)
+        if result.should_return():
+            raise Unwind(result)
+        return result.value
 
     def visit_WhileNode(self, node, context):
-        res = RunTimeResult()
-        elements = []
-
-        while True:
-            condition = res.register(self.visit(node.condition_node, context))
-            if res.should_return():
-                return res
-            if not condition.is_true():
-                break
-
-            value = res.register(self.visit(node.body_node, context))
-            if (res.should_return() and
-                not res.loop_or_switch_break and
-                not res.loop_continue):
-                return res
-
-            if res.loop_continue:
-                continue
-            if res.loop_or_switch_break:
-                break
+        def iterations():
+            # The condition is outside of the loop: a jump in it is not the loop's.
+            while self.evaluate(node.condition_node, context).is_true():
+                yield
 
-            elements.append(value)
-
-        return res.success(
-            Number(0) if node.return_null else (List(elements).set_context(context)
-                                                .set_pos(node.pos_start, node.pos_end)))
+        elements = loop_values(iterations(), partial(self.evaluate, node.body_node), context)
+        return (Number(0) if node.return_null else
+                List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
 
     def visit_ForNode(self, node, context):
-        res = RunTimeResult()
-        elements = []
-
-        start_value = res.register(self.visit(node.start_value_node, context))
-        if res.should_return():
-            return res
-
-        end_value = res.register(self.visit(node.end_value_node, context))
-        if res.should_return():
-            return res
-
+        start_value = self.evaluate(node.start_value_node, context)
+        end_value = self.evaluate(node.end_value_node, context)
         if node.step_value_node:
-            step_value = res.register(self.visit(node.step_value_node, context))
-            if res.should_return():
-                return res
+            step_value = self.evaluate(node.step_value_node, context)
         else:
             step_value = Number(1)
 
-        i = start_value.value
-
-        if step_value.value >= 0:
-            condition = lambda: i <= end_value.value
-        else:
-            condition = lambda: i >= end_value.value
-
-        while condition():
-            context.symbol_table.set(node.var_name_tok.value, Number(i))
-            i += step_value.value
+        def iterations():
+            i = start_value.value
+            ascending = step_value.value >= 0
+            while i <= end_value.value if ascending else i >= end_value.value:
+                if node.frame_slot is None:
+                    context.symbol_table.set(node.var_name_tok.value, Number(i))
+                else:
+                    context.symbol_table.slots[node.frame_slot] = Number(i)
+                i += step_value.value
+                yield
+
+        elements = loop_values(iterations(), partial(self.evaluate, node.body_node), context)
+        return (Number(0) if node.return_null else
+                List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+    def visit_LoopInvariantsNode(self, node, context):
+        symbols = context.symbol_table.symbols
+        for slot in node.slots:
+            symbols.pop(slot, None)
+
+        try:
+            return self.evaluate(node.loop_node, context)
+        finally:
+            for slot in node.slots:
+                symbols.pop(slot, None)
+
+    def visit_HoistedNode(self, node, context):
+        symbols = context.symbol_table.symbols
+        cached = symbols.get(node.slot)
+        if cached is not None:
+            return cached.copy()
+
+        value = placed(node.expression_node, self.evaluate(node.expression_node, context),
+                       context)
+        if self.is_invariant(node, value, context):
+            symbols[node.slot] = value.copy()
+        return value
+
+    @staticmethod
+    def is_invariant(node, value, context):
+        """
+        Checks whether the value of a hoisted expression can be reused for the rest of
+        the loop run.
 
-            value = res.register(self.visit(node.body_node, context))
-            if (res.should_return() and
-                not res.loop_continue and
-                not res.loop_or_switch_break):
-                return res
+        The optimizer only hoists expressions whose variables the loop never assigns,
+        so they keep their values; it is only safe to reuse the result if those values,
+        and the result, are numbers or strings (operations on lists share and modify
+        their elements) and the names called still are the pure built-in functions.
 
-            if res.loop_continue:
-                continue
-            if res.loop_or_switch_break:
-                break
-
-            elements.append(value)
+        Parameters:
+        - node (HoistedNode): The hoisted expression.
+        - value (any): The value it produced.
+        - context (Context): The execution context.
 
-        return res.success(
-            Number(0) if node.return_null else (List(elements)
-                                                .set_context(context)
-                                                .set_pos(node.pos_start,
-                                                                                           node.pos_end)))
+        Returns:
+        - bool: Whether the value can be reused.
+        """
+        from sards.user_functions import BuiltInFunction
+        if not isinstance(value, (Number, String)):
+            return False
+        symbol_table = context.symbol_table
+        for name in node.variable_names:
+            if not isinstance(symbol_table.get(name), (Number, String)):
+                return False
+        for name in node.builtin_names:
+            function = symbol_table.get(name)
+            if not isinstance(function, BuiltInFunction) or function.name != name:
+                return False
+        return True
 
     def visit_SwitchNode(self, node, context):
-        res = RunTimeResult()
         elements = []
         match_index = start_index = 0
         default_index = len(node.cases)
         match_found = False
-        selection_val = res.register(self.visit(node.select, context))
-        if res.should_return():
-            return res
+        selection_val = self.evaluate(node.select, context)
 
         for choice, _, _ in node.cases:
             if choice is None:
                 default_index = match_index
                 match_index = match_index + 1
                 continue
-            choice_val = res.register(self.visit(choice, context))
-            if res.should_return():
-                return res
+            choice_val = self.evaluate(choice, context)
             if selection_val.value == choice_val.value:
                 match_found = True
                 break
@@ -295,173 +514,128 @@ class Interpreter:
         start_index = match_index if match_found else default_index
 
         for choice, body, return_null in node.cases[start_index:]:
-            body_val = res.register(self.visit(body, context))
-            if (res.should_return() and
-                not res.loop_or_switch_break):
-                return res
-            elements.append(Number(0) if return_null else body_val)
-            if res.loop_or_switch_break:
+            try:
+                body_val = self.evaluate(body, context)
+            except Unwind as unwind:
+                if not unwind.result.loop_or_switch_break:
+                    raise
+                # The arm escaped: it is recorded as 0, or as the value (None) of the jump.
+                elements.append(Number(0) if return_null else None)
                 break
+            elements.append(Number(0) if return_null else body_val)
 
-        return res.success(
-            Number(0) if node.return_null else (List(elements)
-                                                .set_context(context)
-                                                .set_pos(node.pos_start,
-                                                                                           node.pos_end)))
+        return (Number(0) if node.return_null else
+                List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
 
     def visit_IfNode(self, node, context):
-        res = RunTimeResult()
-
         for condition, expression, return_null in node.cases:
-            condition_value = res.register(self.visit(condition, context))
-            if res.should_return():
-                return res
-
+            condition_value = self.evaluate(condition, context)
             if condition_value.is_true():
-                expression_value = res.register(self.visit(expression, context))
-                if res.should_return():
-                    return res
-                return res.success(Number(0) if return_null else expression_value)
+                expression_value = self.evaluate(expression, context)
+                return Number(0) if return_null else placed(expression, expression_value, context)
 
         if node.else_case:
             expression, return_null = node.else_case
-            else_value = res.register(self.visit(expression, context))
-            if res.should_return():
-                return res
-            return res.success(Number(0) if return_null else else_value)
+            else_value = self.evaluate(expression, context)
+            return Number(0) if return_null else placed(expression, else_value, context)
 
-        return res.success(Number(0))
+        return Number(0)
 
     def visit_VariableUseNode(self, node, context):
-        res = RunTimeResult()
         var_name = node.var_name_tok.value
-        value = context.symbol_table.get(var_name)
+        if node.frame_slot is None:
+            value = context.symbol_table.get(var_name)
+        else:
+            # Not bound yet in the frame: it may be a variable of a caller.
+            value = (context.symbol_table.slots[node.frame_slot] or
+                     context.symbol_table.parent.get(var_name))
 
         if value is None:
-            return (res.failure(
-                RuntimeError(node.pos_start,
-                             node.pos_end,
-                             f"'{var_name}' is not defined",
-                             context)))
+            raise failure(RunTimeError(node.pos_start,
+                                       node.pos_end,
+                                       f"'{var_name}' is not defined",
+                                       context))
 
-        value = value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-        return res.success(value)
+        return value
 
     def visit_VariableAssignNode(self, node, context):
-        res = RunTimeResult()
         var_name = node.var_name_tok.value
-        value = res.register(self.visit(node.value_node, context))
+        value = placed(node.value_node, self.evaluate(node.value_node, context), context)
 
-        if res.should_return():
-            return res
-
-        context.symbol_table.set(var_name, value)
-        return res.success(value)
+        if node.frame_slot is None:
+            context.symbol_table.set(var_name, value)
+        else:
+            context.symbol_table.slots[node.frame_slot] = value
+        return value
 
     def visit_NumberNode(self, node, context):
-        return RunTimeResult().success(
-            Number(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return Number(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
 
     def visit_ReturnNode(self, node, context):
-        res = RunTimeResult()
-
         if node.node_to_return:
-            value = res.register(self.visit(node.node_to_return, context))
-            if res.should_return():
-                return res
+            value = placed(node.node_to_return, self.evaluate(node.node_to_return, context),
+                           context)
         else:
             value = Number(0)
 
-        return res.success_return(value)
+        raise Unwind(RunTimeResult().success_return(value), node)
 
     def visit_ContinueNode(self, node, context):
-        return RunTimeResult().success_continue()
+        raise Unwind(RunTimeResult().success_continue(), node)
 
     def visit_BreakNode(self, node, context):
-        return RunTimeResult().success_break()
+        raise Unwind(RunTimeResult().success_break(), node)
 
     def visit_BinaryOperationNode(self, node, context):
-        res = RunTimeResult()
-        left_node = res.register(self.visit(node.left_node, context))
-        if res.should_return():
-            return res
-        right_node = res.register(self.visit(node.right_node, context))
-        if res.should_return():
-            return res
+        left_node = self.evaluate(node.left_node, context)
+        right_node = self.evaluate(node.right_node, context)
 
-        error = None
-        if node.operator.type == T_PLUS:
-            result, error = left_node.add(right_node)
-        elif node.operator.type == T_MINUS:
-            result, error = left_node.subtract(right_node)
-        elif node.operator.type == T_MUL:
-            result, error = left_node.multiply(right_node)
-        elif node.operator.type == T_DIVIDE:
-            result, error = left_node.divide(right_node)
-        elif node.operator.type == T_MODULUS:
-            result, error = left_node.modulus(right_node)
-        elif node.operator.type == T_FLOOR:
-            result, error = left_node.floor_divide(right_node)
-        elif node.operator.type == T_EXP:
-            result, error = left_node.exponent(right_node)
-        elif node.operator.type == T_EE:
-            result, error = left_node.get_comparison_eq(right_node)
-        elif node.operator.type == T_NEQ:
-            result, error = left_node.get_comparison_neq(right_node)
-        elif node.operator.type == T_GT:
-            result, error = left_node.get_comparison_gt(right_node)
-        elif node.operator.type == T_GTE:
-            result, error = left_node.get_comparison_gte(right_node)
-        elif node.operator.type == T_LT:
-            result, error = left_node.get_comparison_lt(right_node)
-        elif node.operator.type == T_LTE:
-            result, error = left_node.get_comparison_lte(right_node)
-        elif node.operator.type == T_KEYWORD and node.operator.value == 'and':
-            result, error = left_node.and_by(right_node)
-        elif node.operator.type == T_KEYWORD and node.operator.value == 'or':
-            result, error = left_node.or_by(right_node)
+        operation = BINARY_OPERATIONS[node.method_name].get(type(left_node))
+        if operation is None:
+            # Not an operation of this type: fails as calling the method would.
+            result, error = getattr(left_node, node.method_name)(right_node)
+        else:
+            result, error = operation(left_node, right_node)
 
+        # The operations take the context of the left operand and the position of the
+        # right one, which a shared operand has from its node.
+        shared_left = type(node.left_node) in SHARED_NODES
         if error:
-            return res.failure(error)
-        return res.success(result.set_pos(node.pos_start, node.pos_end))
+            if shared_left:
+                error.context = context
+            if type(node.right_node) in SHARED_NODES:
+                error.pos_start = node.right_node.pos_start
+                error.pos_end = node.right_node.pos_end
+            raise failure(error)
+        if shared_left:
+            result.context = context
+        return result.set_pos(node.pos_start, node.pos_end)
 
     def visit_TernaryOperationNode(self, node, context):
-        res = RunTimeResult()
-        comp_node = res.register(self.visit(node.comp_node, context))
-        if res.should_return():
-            return res
-
-        if comp_node.is_true():
-            true_node = res.register(self.visit(node.true_node, context))
-            if res.should_return():
-                return res
-            result, error = true_node, None
-        else:
-            false_node = res.register(self.visit(node.false_node, context))
-            if res.should_return():
-                return res
-            result, error = false_node, None
+        comp_node = self.evaluate(node.comp_node, context)
 
-        if error:
-            return res.failure(error)
-        else:
-            return res.success(result.set_pos(node.pos_start, node.pos_end))
+        branch = node.true_node if comp_node.is_true() else node.false_node
+        result = placed(branch, self.evaluate(branch, context), context)
+
+        return result.set_pos(node.pos_start, node.pos_end)
 
     def visit_UnaryOperationNode(self, node, context):
-        res = RunTimeResult()
-        number = res.register(self.visit(node.node, context))
-        if res.should_return():
-            return res
+        number = self.evaluate(node.node, context)
+        shared = type(node.node) in SHARED_NODES
 
         error = None
-        if node.operator.type == T_MINUS:
+        if node.operator.kind == K_MINUS:
             number, error = number.multiply(Number(-1))
 
-        elif node.operator.type == T_KEYWORD and node.operator.value == 'not':
+        elif node.operator.kind == K_KEYWORD and node.operator.value == 'not':
             number, error = number.not_by()
 
+        elif shared:
+            # A unary plus hands its operand on as its own value.
+            number = number.copy()
+
         if error:
-            return res.failure(error)
-        else:
-            return res.success(number.set_pos(node.pos_start, node.pos_end))
+            raise failure(error)
+        if shared:
+            number.context = context
+        return number.set_pos(node.pos_start, node.pos_end)
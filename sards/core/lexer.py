@@ -5,6 +5,11 @@ This module implements a simple lexical analyzer (lexer) for mathematical expres
 It reads an input string and converts it into a sequence of tokens,
 handling numbers, operators, and parentheses.
 
+Two lexing engines are available and produce identical tokens and errors:
+- 'table': scans the text with a single compiled master regex and dispatches on the
+  matched group (default).
+- 'legacy': walks the text one character at a time through an if/elif chain.
+
 Classes:
 - Token: Represents a single token with a type and an optional value.
 - Lexer: Performs lexical analysis, converting input text into tokens.
@@ -13,33 +18,74 @@ Functions:
 - run: Executes the lexer on a given input and returns tokens or errors.
 """
 
+import re
+import sys
+
 from .constants import *
-from .error import Position, IllegalCharError, ExpectedCharError
+from .error import Position, SourceFile, IllegalCharError, ExpectedCharError
+
+LEXER_ENGINES = ('table', 'legacy')
+
+# Master pattern used by the table engine. Leading blanks (spaces, tabs and carriage
+# returns) are consumed by the same match as the token that follows them, and a line
+# feed ends a statement like ';'. The alternatives mirror the branches of the legacy
+# engine: numbers start with a digit and hold at most one '.', identifiers
+# start with a letter, strings run up to the next '"' (or the end of the text).
+TOKEN_PATTERN = r'''[ \t\r]*(?:
+    (?P<NUMBER>[0-9]+(?:\.[0-9]*)?)
+  | (?P<WORD>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<STRING>"[^"]*"?)
+  | (?P<SYMBOL>\*\*|//|==|!=|<=|>=|[-+*/%%=<>(){}\[\]:,?;\n])
+  | (?P<ERROR>%s)
+)'''
+TOKEN_REGEX = re.compile(TOKEN_PATTERN % r'[^ \t\r]', re.VERBOSE | re.DOTALL)
+
+# Same pattern for UTF-8 encoded buffers (bytes, mmap). An illegal character is
+# matched as a whole multi-byte sequence so that it can be decoded for the error.
+BINARY_TOKEN_REGEX = re.compile((TOKEN_PATTERN % r'[\xc0-\xff][\x80-\xbf]*|[^ \t\r]').encode(),
+                                re.VERBOSE | re.DOTALL)
 
 
 class Token:
     """
-    Represents a token in the input with a specific type and optional value.
+    Represents a token in the input with a specific kind and optional value.
+
+    Tokens are compact: they store an integer kind (see K_* in constants) and the
+    character offsets of their span, and resolve type names and Position objects
+    only when asked for them.
 
     Attributes:
-    - type (str): The type of the token (e.g., INT, FLOAT, PLUS).
+    - kind (int): The kind of the token (e.g., K_INT, K_FLOAT, K_PLUS).
     - value (any, optional): The value of the token (e.g., a number for INT/FLOAT,
         or None for operators).
-    - pos_start (Position, optional): The starting position of the token.
-    - pos_end (Position, optional): The ending position of the token.
+    - start (int): The offset of the first character of the token.
+    - end (int): The offset just past the last character of the token.
+    - source (SourceFile, optional): The file the offsets point into.
     """
 
-    def __init__(self, type_, value=None, pos_start=None, pos_end=None):
-        self.type = type_
+    __slots__ = ('kind', 'value', 'start', 'end', 'source')
+
+    def __init__(self, kind, value=None, start=0, end=None, source=None): # pylint: disable=R0913
+        self.kind = kind
         self.value = value
+        self.start = start
+        self.end = start + 1 if end is None else end
+        self.source = source
+
+    @property
+    def type(self):
+        """str: The type name of the token (e.g., INT, FLOAT, PLUS)."""
+        return TOKEN_NAMES[self.kind]
 
-        if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+    @property
+    def pos_start(self):
+        """Position: The starting position of the token."""
+        return Position(self.start, self.source) if self.source else None
 
-        if pos_end:
-            self.pos_end = pos_end
+    @property
+    def pos_end(self):
+        """Position: The ending position of the token."""
+        return Position(self.end, self.source) if self.source else None
 
     def __repr__(self):
         """
@@ -57,15 +103,30 @@ class Lexer:
 
     Attributes:
     - filename (str): The name of the source file being processed.
-    - text (str): The input string to be tokenized.
+    - text (str or bytes-like): The input to be tokenized. A UTF-8 encoded buffer such as
+        a memory-mapped file is scanned in place by the 'table' engine.
+    - engine (str): The lexing engine to use, one of LEXER_ENGINES.
     - pos (Position): The current position in the input text.
     - current_char (str, optional): The character currently being processed.
+    - source (SourceFile): The file being processed, shared by every token and position.
+    - error (Error, optional): The error that stopped the last call to iter_tokens.
     """
 
-    def __init__(self, filename, text):
+    def __init__(self, filename, text, engine='table'):
+        if engine not in LEXER_ENGINES:
+            raise ValueError(f"Unknown lexer engine '{engine}', expected one of {LEXER_ENGINES}")
+        if not isinstance(text, str) and engine != 'table':
+            raise ValueError("Only the 'table' engine can lex a bytes-like buffer")
         self.filename = filename
         self.text = text
-        self.pos = Position(-1, 0, -1, filename, text)
+        self.engine = engine
+        self.source = SourceFile(filename, text)
+        self.error = None
+        self.reset()
+
+    def reset(self):
+        """Moves the lexer back to the first character of the input text."""
+        self.pos = Position(-1, self.source)
         self.current_char = None
         self.advance()
 
@@ -78,104 +139,137 @@ class Lexer:
         self.pos.advance(self.current_char)
         self.current_char = self.text[self.pos.index] if self.pos.index < len(self.text) else None
 
+    def position(self, index):
+        """
+        Wraps a character offset of the input text in a Position.
+
+        Parameters:
+        - index (int): The character offset.
+
+        Returns:
+        - Position: The position of the offset in this lexer's source file.
+        """
+        return Position(index, self.source)
+
+    def advance_to(self, index):
+        """
+        Moves directly to the given offset in the input text.
+
+        Parameters:
+        - index (int): The offset to move to. It may point past the end of the text.
+        """
+        self.pos.index = index
+        self.current_char = self.text[index] if index < len(self.text) else None
+
     def make_identifier(self):
-        id_str = ''
-        pos_start = self.pos.copy()
+        text = self.text
+        start = end = self.pos.index
+        length = len(text)
 
-        while self.current_char is not None and self.current_char in LETTERS_DIGITS + '_':
-            id_str += self.current_char
-            self.advance()
+        while end < length and text[end] in IDENTIFIER_CHARS:
+            end += 1
 
-        token_type = T_KEYWORD if id_str in KEYWORDS else T_IDENTIFIER
-        return Token(token_type, id_str, pos_start, self.pos)
+        id_str = sys.intern(text[start:end])
+        self.advance_to(end)
+        kind = K_KEYWORD if id_str in KEYWORDS else K_IDENTIFIER
+        return Token(kind, id_str, start, self.pos.index, self.source)
 
     def make_equals(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
-        token_type = T_EQ
+        kind = K_EQ
 
         if self.current_char == '=':
             self.advance()
-            token_type = T_EE
+            kind = K_EE
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
+        return Token(kind, None, start, self.pos.index, self.source)
 
     def make_floor(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
-        token_type = T_DIVIDE
+        kind = K_DIVIDE
 
         if self.current_char == '/':
             self.advance()
-            token_type = T_FLOOR
+            kind = K_FLOOR
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
+        return Token(kind, None, start, self.pos.index, self.source)
 
     def make_mul(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
-        token_type = T_MUL
+        kind = K_MUL
 
         if self.current_char == '*':
             self.advance()
-            token_type = T_EXP
+            kind = K_EXP
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
+        return Token(kind, None, start, self.pos.index, self.source)
 
     def make_not_equals(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
 
         if self.current_char == '=':
             self.advance()
-            return Token(T_NEQ, pos_start=pos_start, pos_end=self.pos), None
+            return Token(K_NEQ, None, start, self.pos.index, self.source), None
 
         self.advance()
-        return None, ExpectedCharError(pos_start, self.pos, "'=' (after !)")
+        return None, ExpectedCharError(self.position(start), self.pos.copy(), "'=' (after !)")
 
     def make_lesser(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
-        token_type = T_LT
+        kind = K_LT
 
         if self.current_char == '=':
             self.advance()
-            token_type = T_LTE
+            kind = K_LTE
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
+        return Token(kind, None, start, self.pos.index, self.source)
 
     def make_greater(self):
-        pos_start = self.pos.copy()
+        start = self.pos.index
         self.advance()
-        token_type = T_GT
+        kind = K_GT
 
         if self.current_char == '=':
             self.advance()
-            token_type = T_GTE
+            kind = K_GTE
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
+        return Token(kind, None, start, self.pos.index, self.source)
 
     def make_string(self):
-        string = ''
-        pos_start = self.pos.copy()
-        escape_character = False
-        self.advance()
+        text = self.text
+        start = self.pos.index
+        end = text.find('"', start + 1)
+        if end == -1:
+            end = len(text)
+
+        string = text[start + 1:end]
+        if '\\' in string:
+            string = self.unescape(string)
+
+        # Step past the closing quote, or one past the end of an unterminated string.
+        self.advance_to(end + 1)
+        return Token(K_STRING, string, start, self.pos.index, self.source)
+
+    @staticmethod
+    def unescape(string):
+        """
+        Processes the backslashes in the body of a string literal.
 
-        escape_characters = {'n': '\n', 't': '\t'}
+        A backslash is dropped and the character after it is kept as it is, so this
+        only runs for literals that contain one.
 
-        while self.current_char is not None and self.current_char != '"' or escape_character:
-            if escape_character:
-                string += escape_characters.get(self.current_char, self.current_char)
-            else:
-                if self.current_char == '\\':
-                    escape_character = True
-                else:
-                    string += self.current_char
-            self.advance()
-            escape_character = False
+        Parameters:
+        - string (str): The body of the string literal.
 
-        self.advance()
-        return Token(T_STRING, string, pos_start, self.pos)
+        Returns:
+        - str: The string value.
+        """
+        return string.replace('\\', '')
 
     def make_number(self):
         """
@@ -184,101 +278,285 @@ class Lexer:
         Returns:
         - Token: A token of type INT or FLOAT based on the extracted number.
         """
-        number = ''
+        text = self.text
+        start = end = self.pos.index
+        length = len(text)
         is_float = False
-        pos_start = self.pos.copy()
 
-        while self.current_char is not None and self.current_char in DIGITS + '.':
-            if self.current_char == '.':
+        while end < length and text[end] in NUMBER_CHARS:
+            if text[end] == '.':
                 if is_float:
                     break
                 is_float = True
-                number += '.'
-            else:
-                number += self.current_char
-            self.advance()
+            end += 1
 
-        return (Token(T_FLOAT, float(number), pos_start, self.pos) if is_float
-                else Token(T_INT, int(number), pos_start, self.pos))
+        number = text[start:end]
+        self.advance_to(end)
+        return (Token(K_FLOAT, float(number), start, self.pos.index, self.source) if is_float
+                else Token(K_INT, int(number), start, self.pos.index, self.source))
 
     def enumerate_tokens(self):
         """
-        Tokenizes the input text into a list of tokens.
+        Tokenizes the input text into a list of tokens using the selected engine.
 
         Returns:
         - list: A list of Token objects.
         - Error or None: Returns an error if an invalid character is encountered.
         """
-        tokens = []
+        tokens = list(self.iter_tokens())
+        if self.error:
+            return [], self.error
+        return tokens, None
+
+    def iter_tokens(self, start=0):
+        """
+        Lazily yields the tokens of the input text using the selected engine.
+
+        Tokens are produced one at a time, so a consumer such as the Parser can start
+        before the whole text has been scanned. If an invalid character is found, the
+        error is stored in `self.error` and an EOF token is yielded at its position,
+        so the consumer always sees a terminated token stream.
+
+        Parameters:
+        - start (int, optional): The offset to start scanning at. It must be the start
+            of a token or of the blanks before one. Defaults to 0.
+
+        Returns:
+        - generator: Yields the Token objects of the input text, ending with an EOF token.
+        """
+        self.error = None
+        if self.engine == 'legacy':
+            return self.iter_tokens_legacy(start)
+        return self.iter_tokens_table(start)
+
+    def relex(self, tokens, offset, deleted_length, inserted_text): # pylint: disable=R0914
+        """
+        Updates the tokens of the input text after an edit, re-scanning only the damaged region.
+
+        Scanning restarts just after the last newline token (';' or a line feed) that
+        ends before the edit, and stops as soon as it produces a newline token that the
+        old stream also had at the same (shifted) offset: from there on both scans see
+        the same text, so the remaining old tokens are reused with their offsets
+        shifted. The input text and the source file are updated to the edited text.
+
+        Parameters:
+        - tokens (list): The tokens of the text before the edit, as returned by
+            enumerate_tokens. The list and the tokens after the edit are updated in place.
+        - offset (int): The offset at which the edit starts.
+        - deleted_length (int): The number of characters removed at the offset.
+        - inserted_text (str): The text inserted in their place.
+
+        Returns:
+        - list: The tokens of the edited text.
+        - Error or None: Returns an error if an invalid character is encountered.
+        """
+        self.source.edit(offset, deleted_length, inserted_text)
+        self.text = self.source.text
+
+        if not tokens:
+            # The previous scan failed, so there is no stream to resynchronize with.
+            return self.enumerate_tokens()
+
+        delta = len(inserted_text) - deleted_length
+        edit_end = offset + deleted_length
+
+        # First damaged token: the first one that ends at or after the edit. A token
+        # ending right at the edit may be extended by the inserted text.
+        low, high = 0, len(tokens) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if tokens[middle].end < offset:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+        while first > 0 and tokens[first - 1].kind != K_NEWLINE:
+            first -= 1
+        restart = tokens[first - 1].end if first else 0
+
+        # Walk the old stream alongside the new one, looking for a newline token at
+        # the same shifted offset past the edit.
+        old = first
+        last = len(tokens) - 1
+        relexed = []
+        for token in self.iter_tokens(restart):
+            relexed.append(token)
+            if token.kind != K_NEWLINE or token.start - delta < edit_end:
+                continue
+            while tokens[old].start + delta < token.start and old < last:
+                old += 1
+            if tokens[old].kind == K_NEWLINE and tokens[old].start + delta == token.start:
+                last = old
+                break
+
+        if self.error:
+            return [], self.error
+
+        for token in tokens[last + 1:]:
+            token.start += delta
+            token.end += delta
+        tokens[first:last + 1] = relexed
+        return tokens, None
+
+    def iter_tokens_table(self, start=0):
+        """
+        Yields tokens by scanning the input text with the compiled master regex.
+
+        Each match is dispatched on its group name, so the text is scanned in a single
+        pass without per-character position bookkeeping.
+
+        Parameters:
+        - start (int, optional): The offset to start scanning at. Defaults to 0.
+
+        Yields:
+        - Token: The next token in the input text, ending with an EOF token.
+        """
+        text = self.text
+        source = self.source
+        intern = sys.intern
+        binary = not isinstance(text, str)
+        end = start
+
+        for match in (BINARY_TOKEN_REGEX if binary else TOKEN_REGEX).finditer(text, start):
+            group = match.lastgroup
+            start, end = match.span(group)
+            lexeme = match.group(group)
+            if binary:
+                lexeme = lexeme.decode('utf-8', 'replace')
+
+            if group == 'SYMBOL':
+                yield Token(SYMBOL_TOKENS[lexeme], None, start, end, source)
+            elif group == 'WORD':
+                lexeme = intern(lexeme)
+                yield Token(K_KEYWORD if lexeme in KEYWORDS else K_IDENTIFIER,
+                            lexeme, start, end, source)
+            elif group == 'NUMBER':
+                yield (Token(K_FLOAT, float(lexeme), start, end, source) if '.' in lexeme
+                       else Token(K_INT, int(lexeme), start, end, source))
+            elif group == 'STRING':
+                if len(lexeme) > 1 and lexeme[-1] == '"':
+                    value = lexeme[1:-1]
+                else:
+                    # An unterminated string runs to the end of the text and the
+                    # legacy engine steps one position past it.
+                    value = lexeme[1:]
+                    end += 1
+                if '\\' in value:
+                    value = self.unescape(value)
+                yield Token(K_STRING, value, start, end, source)
+            else:
+                self.error = self.make_table_error(lexeme, start)
+                yield Token(K_EOF, None, start, start + 1, source)
+                return
+
+        end = max(end, len(text))
+        yield Token(K_EOF, None, end, end + 1, source)
+
+    def make_table_error(self, char, index):
+        """
+        Builds the error raised by the table engine for a character no token starts with.
+
+        The end position matches the one the legacy engine reports: one character past
+        an illegal character, or two past a '!' that is not followed by '='.
+
+        Parameters:
+        - char (str): The offending character.
+        - index (int): The offset of the offending character.
+
+        Returns:
+        - Error: An ExpectedCharError for a lone '!', otherwise an IllegalCharError.
+        """
+        if char == '!':
+            return ExpectedCharError(self.position(index), self.position(index + 2),
+                                     "'=' (after !)")
+
+        return IllegalCharError(self.position(index), self.position(index + 1), f'"{char}"')
+
+    def iter_tokens_legacy(self, start=0): # pylint: disable=R0912,R0915
+        """
+        Yields tokens by walking the input text one character at a time.
+
+        Parameters:
+        - start (int, optional): The offset to start scanning at. Defaults to 0.
+
+        Yields:
+        - Token: The next token in the input text, ending with an EOF token.
+        """
+        self.reset()
+        self.advance_to(start)
 
         while self.current_char is not None:
-            if self.current_char in ' \t':
+            if self.current_char in ' \t\r':
                 self.advance()
-            elif self.current_char in ';':
-                tokens.append(Token(T_NEWLINE, pos_start=self.pos))
+            elif self.current_char in ';\n':
+                yield Token(K_NEWLINE, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
+                yield self.make_number()
             elif self.current_char in LETTERS:
-                tokens.append(self.make_identifier())
+                yield self.make_identifier()
             elif self.current_char == '"':
-                tokens.append(self.make_string())
+                yield self.make_string()
             elif self.current_char == '+':
-                tokens.append(Token(T_PLUS, pos_start=self.pos))
+                yield Token(K_PLUS, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '-':
-                tokens.append(Token(T_MINUS, pos_start=self.pos))
+                yield Token(K_MINUS, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '*':
-                tokens.append(self.make_mul())
+                yield self.make_mul()
             elif self.current_char == '/':
-                tokens.append(self.make_floor())
+                yield self.make_floor()
             elif self.current_char == '%':
-                tokens.append(Token(T_MODULUS, pos_start=self.pos))
+                yield Token(K_MODULUS, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '=':
-                tokens.append(self.make_equals())
+                yield self.make_equals()
             elif self.current_char == '!':
                 tok, error = self.make_not_equals()
                 if error:
-                    return [], error
-                tokens.append(tok)
+                    self.error = error
+                    start = error.pos_start.index
+                    yield Token(K_EOF, None, start, start + 1, self.source)
+                    return
+                yield tok
             elif self.current_char == '>':
-                tokens.append(self.make_greater())
+                yield self.make_greater()
             elif self.current_char == '<':
-                tokens.append(self.make_lesser())
+                yield self.make_lesser()
             elif self.current_char == '(':
-                tokens.append(Token(T_LPAREN, pos_start=self.pos))
+                yield Token(K_LPAREN, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == ')':
-                tokens.append(Token(T_RPAREN, pos_start=self.pos))
+                yield Token(K_RPAREN, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '{':
-                tokens.append(Token(T_LPAREN2, pos_start=self.pos))
+                yield Token(K_LPAREN2, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '}':
-                tokens.append(Token(T_RPAREN2, pos_start=self.pos))
+                yield Token(K_RPAREN2, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '[':
-                tokens.append(Token(T_LPAREN3, pos_start=self.pos))
+                yield Token(K_LPAREN3, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == ']':
-                tokens.append(Token(T_RPAREN3, pos_start=self.pos))
+                yield Token(K_RPAREN3, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == ':':
-                tokens.append(Token(T_COLON, pos_start=self.pos))
+                yield Token(K_COLON, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == ',':
-                tokens.append(Token(T_COMMA, pos_start=self.pos))
+                yield Token(K_COMMA, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             elif self.current_char == '?':
-                tokens.append(Token(T_QUESTION, pos_start=self.pos))
+                yield Token(K_QUESTION, None, self.pos.index, self.pos.index + 1, self.source)
                 self.advance()
             else:
-                pos_start = self.pos.copy()
+                start = self.pos.index
                 char = self.current_char
                 self.advance()
-                return [], IllegalCharError(pos_start, self.pos, f'"{char}"')
+                self.error = IllegalCharError(self.position(start), self.pos.copy(), f'"{char}"')
+                yield Token(K_EOF, None, start, start + 1, self.source)
+                return
 
-        tokens.append(Token(T_EOF, pos_start=self.pos))
-        return tokens, None
+        yield Token(K_EOF, None, self.pos.index, self.pos.index + 1, self.source)
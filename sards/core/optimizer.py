@@ -0,0 +1,699 @@
+"""
+Module: optimizer
+
+This module implements the optimization passes that rewrite the Abstract Syntax Tree
+(AST) between Parser.parse() and Interpreter.visit().
+
+Every pass must leave the observable behaviour of the program unchanged: the values
+it computes, the output it prints and the runtime errors it reports, including their
+positions. A rewrite that cannot be proven safe from the tree alone is not made, or
+is guarded by a check the Interpreter makes at run time.
+
+Classes:
+- Removal: Records a piece of code that an optimization pass removed.
+- NodeTransformer: Walks an AST and lets subclasses replace nodes by type.
+- ConstantFolder: Folds operations over literals and applies algebraic simplifications.
+- DeadCodeEliminator: Removes branches and statements that can never run.
+- LoopInvariantHoister: Evaluates loop-invariant expressions once per run of a loop.
+
+Functions:
+- optimize(node, report): Runs every optimization pass over a syntax tree.
+"""
+
+import copy
+import math
+
+from sards.ast_nodes import (IfNode, ReturnNode, ContinueNode, BreakNode, ForNode,
+                             VariableUseNode, VariableAssignNode, FunctionCallNode,
+                             FunctionDefinitionNode, HoistedNode, LoopInvariantsNode)
+from sards.data_types import Number, String, StringNode, ListNode
+from .constants import (K_INT, K_FLOAT, K_STRING, K_PLUS, K_MINUS, K_MUL, K_MODULUS, K_FLOOR,
+                        K_EXP, K_EE, K_NEQ, K_GT, K_GTE, K_LT, K_LTE, K_KEYWORD)
+from .lexer import Token
+from .parser import NumberNode, UnaryOperationNode, BinaryOperationNode, TernaryOperationNode
+
+COMPARISON_KINDS = frozenset({K_EE, K_NEQ, K_GT, K_GTE, K_LT, K_LTE})
+INTEGER_ARITHMETIC_KINDS = frozenset({K_PLUS, K_MINUS, K_MUL, K_MODULUS, K_FLOOR})
+
+# Static result types (see numeric_type). INTEGER is a NUMBER whose value is an int.
+NUMBER = 'number'
+INTEGER = 'integer'
+
+# Keywords of the jump statements, by node class.
+JUMP_KEYWORDS = {ReturnNode: 'yield', BreakNode: 'escape', ContinueNode: 'proceed'}
+
+# Built-in functions by whether a call has no effect besides producing its value:
+# show and type print, and listen reads from standard input.
+BUILTIN_PURITY = {'show': False, 'type': False, 'listen': False, 'Integer': True,
+                  'String': True}
+
+# Folds that would build values larger than this (in bits for integers, characters
+# for strings) are left to run time, so that a huge literal expression in a branch
+# that never runs cannot stall or bloat the compiled program.
+MAX_FOLDED_SIZE = 4096
+
+
+def is_not(node):
+    """Checks whether a node is a `not` operation."""
+    return (isinstance(node, UnaryOperationNode) and node.operator.kind == K_KEYWORD and
+            node.operator.value == 'not')
+
+
+def is_integer_literal(node, value):
+    """Checks whether a node is the integer literal `value`."""
+    return (isinstance(node, NumberNode) and isinstance(node.token.value, int) and
+            node.token.value == value)
+
+
+def numeric_type(node):
+    """
+    Infers the type a node evaluates to, when that can be told from the tree alone.
+
+    Only numbers are tracked: comparisons, `and`, `or` and `not` always produce an
+    integer when they succeed, and arithmetic over numbers produces a number.
+
+    Parameters:
+    - node: The AST node.
+
+    Returns:
+    - str or None: INTEGER, NUMBER, or None if the node may produce something else.
+    """
+    if isinstance(node, NumberNode):
+        return INTEGER if isinstance(node.token.value, int) else NUMBER
+
+    if isinstance(node, BinaryOperationNode):
+        operator = node.operator
+        if operator.kind in COMPARISON_KINDS or operator.kind == K_KEYWORD:
+            return INTEGER
+        left, right = numeric_type(node.left_node), numeric_type(node.right_node)
+        if left is None or right is None:
+            return None
+        if left == right == INTEGER and operator.kind in INTEGER_ARITHMETIC_KINDS:
+            return INTEGER
+        return NUMBER
+
+    if isinstance(node, UnaryOperationNode):
+        return INTEGER if is_not(node) else numeric_type(node.node)
+
+    if isinstance(node, TernaryOperationNode):
+        true_type, false_type = numeric_type(node.true_node), numeric_type(node.false_node)
+        if true_type is None or false_type is None:
+            return None
+        return true_type if true_type == false_type else NUMBER
+
+    return None
+
+
+def literal_value(node):
+    """Returns the value a literal node evaluates to, or None for any other node."""
+    if isinstance(node, NumberNode):
+        return Number(node.token.value)
+    if isinstance(node, StringNode):
+        return String(node.token.value)
+    return None
+
+
+def literal_node(value, node):
+    """
+    Builds the literal node that evaluates to a folded value in place of `node`.
+
+    The literal takes over the span of the node it replaces, so the value it produces
+    carries the same positions as the value of the original expression.
+
+    Returns:
+    - NumberNode, StringNode or None: The literal, or None if the value has no
+        literal form.
+    """
+    if isinstance(value, Number) and isinstance(value.value, (int, float)):
+        kind, node_class = (K_INT if isinstance(value.value, int) else K_FLOAT), NumberNode
+    elif isinstance(value, String):
+        kind, node_class = K_STRING, StringNode
+    else:
+        return None
+
+    pos_start, pos_end = node.pos_start, node.pos_end
+    literal = node_class(Token(kind, value.value, pos_start.index, pos_end.index,
+                               pos_start.source))
+    literal.pos_start, literal.pos_end = pos_start, pos_end
+    return literal
+
+
+def retarget(node, target):
+    """
+    Returns a copy of `node` that takes over the span of `target`.
+
+    Only used for the node types whose value takes its positions from the node
+    itself (see numeric_type), so the value keeps the positions of `target`'s value.
+    """
+    node = copy.copy(node)
+    node.pos_start, node.pos_end = target.pos_start, target.pos_end
+    return node
+
+
+def literal_truth(node):
+    """Returns whether a literal node's value is true, or None for any other node."""
+    value = literal_value(node)
+    return None if value is None else value.is_true()
+
+
+def always_jumps(node):
+    """
+    Checks whether evaluating a node always ends in a yield, escape or proceed.
+
+    That is the case for the jump statements themselves, for a block or list holding
+    one (its elements run in order and the jump stops it), and for a when chain with
+    an otherwise arm whose arms all jump.
+    """
+    if isinstance(node, (ReturnNode, BreakNode, ContinueNode)):
+        return True
+    if isinstance(node, ListNode):
+        return any(always_jumps(element) for element in node.element_nodes)
+    if isinstance(node, IfNode):
+        return (node.else_case is not None and always_jumps(node.else_case[0]) and
+                all(always_jumps(expression) for _, expression, _ in node.cases))
+    return False
+
+
+def folded_size(method, left, right):
+    """Estimates the size of a folded value, in bits or characters (see MAX_FOLDED_SIZE)."""
+    if method == 'exponent' and isinstance(right.value, int) and right.value > 0:
+        if isinstance(left.value, int) and abs(left.value) > 1:
+            return right.value * math.log2(abs(left.value))
+    elif method == 'multiply' and isinstance(left, String) and isinstance(right.value, int):
+        return len(left.value) * right.value
+    return 0
+
+
+def child_nodes(node):
+    """Yields the child nodes of a node, including those held in list or tuple attributes."""
+    stack = list(vars(node).values())
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif hasattr(value, '__dict__'):
+            yield value
+
+
+def assigned_names(node, names=None):
+    """
+    Collects the names a node can assign in the scope it runs in.
+
+    The bodies of methods defined in the node are not searched: they run in a scope
+    of their own, and assignments there never reach the enclosing scope.
+
+    Parameters:
+    - node (AST Node): The node to search.
+    - names (set, optional): Receives the names; a new set is used if omitted.
+
+    Returns:
+    - set: The names assigned by variable assignments, Cycle loops and method
+        definitions.
+    """
+    names = set() if names is None else names
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (VariableAssignNode, ForNode)):
+            names.add(node.var_name_tok.value)
+        elif isinstance(node, FunctionDefinitionNode):
+            if node.var_name_tok:
+                names.add(node.var_name_tok.value)
+            continue
+        stack.extend(child_nodes(node))
+    return names
+
+
+def pure_reads(node):
+    """
+    Finds what a pure expression reads.
+
+    An expression is pure when evaluating it has no effect besides producing its
+    value: literals, variables, unary, binary and ternary operations over pure
+    operands, and calls of the pure built-in functions (see BUILTIN_PURITY) with pure
+    arguments.
+
+    Parameters:
+    - node (AST Node): The expression.
+
+    Returns:
+    - tuple or None: The set of variable names and the set of built-in function names
+        the expression reads, or None if it is not pure.
+    """
+    variables, builtins = set(), set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (NumberNode, StringNode)):
+            continue
+        if isinstance(node, VariableUseNode):
+            variables.add(node.var_name_tok.value)
+        elif isinstance(node, BinaryOperationNode):
+            stack += (node.left_node, node.right_node)
+        elif isinstance(node, UnaryOperationNode):
+            stack.append(node.node)
+        elif isinstance(node, TernaryOperationNode):
+            stack += (node.comp_node, node.true_node, node.false_node)
+        elif (isinstance(node, FunctionCallNode) and
+              isinstance(node.call_node, VariableUseNode) and
+              BUILTIN_PURITY.get(node.call_node.var_name_tok.value)):
+            builtins.add(node.call_node.var_name_tok.value)
+            stack.extend(node.arg_nodes)
+        else:
+            return None
+    return variables, builtins
+
+
+class Removal: # pylint: disable=R0903
+    """
+    Records a piece of code that an optimization pass removed.
+
+    Attributes:
+    - description (str): What was removed, e.g. "'orwhen' arm".
+    - reason (str): Why it could never run.
+    - pos_start (Position): The starting position of the removed code.
+    - pos_end (Position): The ending position of the removed code.
+    """
+
+    def __init__(self, description, reason, pos_start, pos_end):
+        """
+        Initializes a Removal instance.
+
+        Parameters:
+        - description (str): What was removed.
+        - reason (str): Why it could never run.
+        - pos_start (Position): The starting position of the removed code.
+        - pos_end (Position): The ending position of the removed code.
+        """
+        self.description = description
+        self.reason = reason
+        self.pos_start = pos_start
+        self.pos_end = pos_end
+
+    def to_string(self):
+        """
+        Formats the removal for display.
+
+        Returns:
+        - str: The file and line of the removed code, what was removed and why.
+        """
+        return (f"File {self.pos_start.file_name}, line {self.pos_start.line + 1}: "
+                f"removed {self.description}: {self.reason}")
+
+
+class NodeTransformer:
+    """
+    Walks an AST and rebuilds it from the nodes returned by its visit methods.
+
+    Like Interpreter.visit, `visit` dispatches on the node's class name to a
+    `visit_<ClassName>` method; nodes without one are handled by `generic_visit`,
+    which visits every child node (directly, or inside a list or tuple attribute) and
+    stores the node returned in its place. Nodes are updated in place.
+
+    Attributes:
+    - report (list): Receives a Removal for every piece of code the pass removes.
+
+    Methods:
+    - visit(node): Transforms a node and returns its replacement.
+    - generic_visit(node): Transforms the children of a node and returns the node.
+    """
+
+    def __init__(self, report=None):
+        self.report = [] if report is None else report
+
+    def visit(self, node):
+        """
+        Transforms a node.
+
+        Parameters:
+        - node (AST Node): The node to transform.
+
+        Returns:
+        - AST Node: The node to use in its place (possibly the same node).
+        """
+        method = getattr(self, f'visit_{type(node).__name__}', self.generic_visit)
+        return method(node)
+
+    def generic_visit(self, node):
+        """Transforms every child of a node and returns the node."""
+        for name, value in vars(node).items():
+            transformed = self.visit_field(value)
+            if transformed is not value:
+                setattr(node, name, transformed)
+        return node
+
+    def visit_field(self, value):
+        """Transforms an attribute value: a node, or a list or tuple holding nodes."""
+        if isinstance(value, list):
+            value[:] = [self.visit_field(item) for item in value]
+            return value
+        if isinstance(value, tuple):
+            return tuple(self.visit_field(item) for item in value)
+        if hasattr(value, '__dict__'):  # Tokens and positions have no __dict__.
+            return self.visit(value)
+        return value
+
+
+class ConstantFolder(NodeTransformer):
+    """
+    Evaluates operations over literals ahead of time and simplifies identities.
+
+    Folding calls the same Number/String methods the Interpreter calls, so a folded
+    literal holds exactly the value the expression would have produced. An operation
+    that fails (e.g. a division by zero) is left in the tree, where it still reports
+    its error, at its original position, when it runs.
+
+    The algebraic identities `x * 1`, `1 * x`, `x - 0`, `x ** 1`, `x + 0` and `0 + x`
+    are only simplified when x is known to evaluate to a number (an integer for the
+    last two, since `-0.0 + 0` is `0.0`), and `not not x` only in a condition, where
+    only the truth of the value is used.
+    """
+
+    def visit_BinaryOperationNode(self, node): # pylint: disable=C0103
+        """Folds or simplifies a binary operation once its operands are transformed."""
+        node.left_node = self.visit(node.left_node)
+        node.right_node = self.visit(node.right_node)
+
+        method = node.method_name
+        left, right = literal_value(node.left_node), literal_value(node.right_node)
+        if method and left is not None and right is not None:
+            if folded_size(method, left, right) <= MAX_FOLDED_SIZE:
+                folded = self.fold(node, getattr(left, method, None), right)
+                if folded is not None:
+                    return folded
+
+        return self.simplify(node)
+
+    def visit_UnaryOperationNode(self, node): # pylint: disable=C0103
+        """Folds a unary operation over a literal once its operand is transformed."""
+        node.node = self.visit(node.node)
+
+        operand = literal_value(node.node)
+        if operand is None:
+            return node
+        if node.operator.kind == K_MINUS:
+            folded = self.fold(node, operand.multiply, Number(-1))
+        elif is_not(node):
+            folded = self.fold(node, getattr(operand, 'not_by', None))
+        else:
+            folded = literal_node(operand, node)
+        return node if folded is None else folded
+
+    def visit_IfNode(self, node): # pylint: disable=C0103
+        """Simplifies the conditions of a when/orwhen chain."""
+        self.generic_visit(node)
+        node.cases = [(self.condition(condition), expression, return_null)
+                      for condition, expression, return_null in node.cases]
+        return node
+
+    def visit_WhileNode(self, node): # pylint: disable=C0103
+        """Simplifies the condition of a whenever loop."""
+        self.generic_visit(node)
+        node.condition_node = self.condition(node.condition_node)
+        return node
+
+    def visit_TernaryOperationNode(self, node): # pylint: disable=C0103
+        """Simplifies the condition of a ternary operation."""
+        self.generic_visit(node)
+        node.comp_node = self.condition(node.comp_node)
+        return node
+
+    @staticmethod
+    def fold(node, method, *operands):
+        """
+        Evaluates an operation over literal values.
+
+        Parameters:
+        - node (AST Node): The operation being folded.
+        - method (callable or None): The bound value method implementing the operation.
+        - operands (Number or String): The remaining operands of the method.
+
+        Returns:
+        - NumberNode, StringNode or None: The literal holding the result, or None if
+            the operation has to run at run time (it is unsupported for these operand
+            types, reports an error, or fails).
+        """
+        if method is None:
+            return None
+        try:
+            outcome = method(*operands)
+        except Exception: # pylint: disable=W0718
+            return None
+        if outcome is None:
+            return None
+        value, error = outcome
+        if error:
+            return None
+        return literal_node(value, node)
+
+    @staticmethod
+    def simplify(node):
+        """Applies the algebraic identities that hold for the operands' types."""
+        left, right, kind = node.left_node, node.right_node, node.operator.kind
+
+        if kind == K_MUL:
+            if is_integer_literal(right, 1) and numeric_type(left):
+                return retarget(left, node)
+            if is_integer_literal(left, 1) and numeric_type(right):
+                return retarget(right, node)
+        elif kind == K_PLUS:
+            if is_integer_literal(right, 0) and numeric_type(left) == INTEGER:
+                return retarget(left, node)
+            if is_integer_literal(left, 0) and numeric_type(right) == INTEGER:
+                return retarget(right, node)
+        elif kind == K_MINUS:
+            if is_integer_literal(right, 0) and numeric_type(left):
+                return retarget(left, node)
+        elif kind == K_EXP:
+            if is_integer_literal(right, 1) and numeric_type(left):
+                return retarget(left, node)
+        return node
+
+    @staticmethod
+    def condition(node):
+        """Removes pairs of `not` around a number whose truth is all a condition uses."""
+        while is_not(node) and is_not(node.node) and numeric_type(node.node.node):
+            node = node.node.node
+        return node
+
+
+class DeadCodeEliminator(NodeTransformer):
+    """
+    Removes branches and statements that can never run, reporting each removal.
+
+    Runs after ConstantFolder, so conditions that fold to literals are known:
+    - a when/orwhen arm whose condition is always false is removed, and an arm whose
+      condition is always true becomes the otherwise arm, dropping the arms after it;
+    - a menu whose selection is a literal keeps only the choice or fallback arm it
+      starts at and the arms it falls through to, up to the first arm that always
+      escapes (or otherwise jumps);
+    - statements that follow a statement that always jumps are removed from blocks.
+
+    Literal conditions and choices are only dropped where they would have been
+    evaluated without effect, so every other expression still runs, in order.
+    """
+
+    def removed(self, description, reason, node):
+        """Adds a Removal for `node` to the report."""
+        self.report.append(Removal(description, reason, node.pos_start, node.pos_end))
+
+    def visit_ListNode(self, node): # pylint: disable=C0103
+        """Removes the statements of a block that follow a statement that always jumps."""
+        self.generic_visit(node)
+        elements = node.element_nodes
+        for index, element in enumerate(elements[:-1]):
+            if always_jumps(element):
+                reason = (f"it follows '{JUMP_KEYWORDS[type(element)]}'"
+                          if type(element) in JUMP_KEYWORDS else
+                          'it follows a statement that always jumps')
+                for statement in elements[index + 1:]:
+                    self.removed('unreachable statement', reason, statement)
+                del elements[index + 1:]
+                break
+        return node
+
+    def visit_IfNode(self, node): # pylint: disable=C0103
+        """Removes the arms of a when chain that are never taken."""
+        self.generic_visit(node)
+
+        cases = []
+        for index, (condition, expression, return_null) in enumerate(node.cases):
+            arm = "'when' arm" if index == 0 else "'orwhen' arm"
+            truth = literal_truth(condition)
+            if truth is False:
+                self.removed(arm, 'its condition is always false', condition)
+            elif truth is True:
+                for _, later_expression, _ in node.cases[index + 1:]:
+                    self.removed("'orwhen' arm", 'an earlier condition is always true',
+                                 later_expression)
+                if node.else_case:
+                    self.removed("'otherwise' arm", 'an earlier condition is always true',
+                                 node.else_case[0])
+                node.else_case = (expression, return_null)
+                break
+            else:
+                cases.append((condition, expression, return_null))
+        node.cases = cases
+
+        # A chain reduced to its otherwise arm evaluates to that arm's value.
+        if not node.cases and node.else_case and not node.else_case[1]:
+            return node.else_case[0]
+        return node
+
+    def visit_SwitchNode(self, node): # pylint: disable=C0103
+        """Removes the arms of a menu over a literal that can never run."""
+        self.generic_visit(node)
+        selection = literal_value(node.select)
+        if selection is None:
+            return node
+
+        # The first literal choice equal to the selection always matches; the choices
+        # after it are never evaluated.
+        match = None
+        for index, (choice, _, _) in enumerate(node.cases):
+            value = literal_value(choice) if choice is not None else None
+            if value is not None and value.value == selection.value:
+                match = index
+                break
+
+        cases = []
+        reachable, previous_body = False, None
+        for index, case in enumerate(node.cases):
+            choice, body, _ = case
+            if match is not None and index > match:
+                can_start = False
+            elif choice is None:
+                can_start = match is None
+            else:
+                can_start = index == match or literal_value(choice) is None
+            # An arm also runs when the arm before it ran and did not jump.
+            reachable = can_start or (reachable and not always_jumps(previous_body))
+            previous_body = body
+
+            evaluated = choice is not None and literal_value(choice) is None and (
+                match is None or index < match)
+            if reachable or evaluated:
+                cases.append(case)
+            else:
+                self.removed("'fallback' arm" if choice is None else "'choice' arm",
+                             'it can never be selected or reached', body)
+        node.cases = cases
+        return node
+
+
+class LoopInvariantHoister(NodeTransformer):
+    """
+    Evaluates the loop-invariant expressions of Cycle and whenever loops once per run.
+
+    An operation or built-in call in the body (or the whenever condition) of a loop is
+    invariant when it is pure (see pure_reads) and the loop assigns none of the names
+    it reads. Each such expression, taken as large as possible, is replaced by a
+    HoistedNode, and the loop by a LoopInvariantsNode that owns their hidden
+    temporaries.
+
+    The expression is not moved: it still runs where it is, the first time it is
+    reached, so a loop that never reaches it never evaluates it, and an error it
+    reports is reported at the same point and position. Only the iterations after a
+    successful first evaluation reuse its value, and only when the Interpreter finds
+    that safe at run time (see Interpreter.is_invariant). Invariants of an inner loop
+    that the outer loop does not assign either are moved to the outer loop's run.
+    """
+
+    def __init__(self, report=None):
+        super().__init__(report)
+        self.count = 0
+        self.owners = {}
+
+    def visit_ForNode(self, node): # pylint: disable=C0103
+        """Hoists the invariant expressions of a Cycle loop's body."""
+        self.generic_visit(node)
+        assigned = assigned_names(node.body_node, {node.var_name_tok.value})
+        slots = []
+        node.body_node = self.hoist(node.body_node, assigned, slots)
+        return self.wrap(node, slots)
+
+    def visit_WhileNode(self, node): # pylint: disable=C0103
+        """Hoists the invariant expressions of a whenever loop's condition and body."""
+        self.generic_visit(node)
+        assigned = assigned_names(node.body_node)
+        slots = []
+        node.condition_node = self.hoist(node.condition_node, assigned, slots)
+        node.body_node = self.hoist(node.body_node, assigned, slots)
+        return self.wrap(node, slots)
+
+    def wrap(self, node, slots):
+        """Returns the loop wrapped in a LoopInvariantsNode owning `slots`, if any."""
+        if not slots:
+            return node
+        for slot in slots:
+            self.owners[slot] = slots
+        return LoopInvariantsNode(node, slots)
+
+    def hoist(self, node, assigned, slots):
+        """
+        Replaces the largest invariant expressions within a node with HoistedNodes.
+
+        Parameters:
+        - node (AST Node): A node of the loop.
+        - assigned (set): The names the loop assigns.
+        - slots (list): Receives the slots of the expressions hoisted to the loop.
+
+        Returns:
+        - AST Node: The node to use in its place.
+        """
+        if isinstance(node, FunctionDefinitionNode):
+            return node
+
+        if isinstance(node, HoistedNode):
+            # Invariant in an inner loop; move it to this loop if it is invariant here.
+            if not assigned & (set(node.variable_names) | set(node.builtin_names)):
+                self.owners[node.slot].remove(node.slot)
+                self.owners[node.slot] = slots
+                slots.append(node.slot)
+            return node
+
+        if isinstance(node, (BinaryOperationNode, UnaryOperationNode, TernaryOperationNode,
+                             FunctionCallNode)):
+            reads = pure_reads(node)
+            if reads is not None and not assigned & (reads[0] | reads[1]):
+                slot = f'<hoisted {self.count}>'
+                self.count += 1
+                slots.append(slot)
+                return HoistedNode(node, slot, sorted(reads[0]), sorted(reads[1]))
+
+        for name, value in vars(node).items():
+            transformed = self.hoist_field(value, assigned, slots)
+            if transformed is not value:
+                setattr(node, name, transformed)
+        return node
+
+    def hoist_field(self, value, assigned, slots):
+        """Hoists within an attribute value: a node, or a list or tuple holding nodes."""
+        if isinstance(value, list):
+            value[:] = [self.hoist_field(item, assigned, slots) for item in value]
+            return value
+        if isinstance(value, tuple):
+            return tuple(self.hoist_field(item, assigned, slots) for item in value)
+        if hasattr(value, '__dict__'):
+            return self.hoist(value, assigned, slots)
+        return value
+
+
+# The passes run by optimize(), in order.
+OPTIMIZATION_PASSES = (ConstantFolder, DeadCodeEliminator, LoopInvariantHoister)
+
+
+def optimize(node, report=None):
+    """
+    Runs every optimization pass over a syntax tree.
+
+    Parameters:
+    - node (AST Node): The root of the tree, as returned by Parser.parse().
+    - report (list, optional): Receives a Removal for every piece of code removed.
+
+    Returns:
+    - AST Node: The root of the optimized tree. The tree is rewritten in place.
+    """
+    for optimization_pass in OPTIMIZATION_PASSES:
+        node = optimization_pass(report).visit(node)
+    return node
@@ -4,9 +4,13 @@ Module: parser
 This module implements a recursive descent parser for mathematical expressions.
 It converts a sequence of tokens into an Abstract Syntax Tree (AST) by following
 rules for arithmetic expressions, including handling unary and binary operations.
+Operator expressions are parsed by precedence climbing over a binding-power table.
+Grammar rules return AST nodes and raise ParseError at the first syntax error, which
+parse() turns back into a ParseResult.
 
 Classes:
 - ParseResult: Stores the result of a parsing operation, including success or failure.
+- TokenBuffer: Pulls tokens lazily from the lexer through a small lookahead/history window.
 - NumberNode: Represents a numeric literal in the AST.
 - UnaryOperationNode: Represents a unary operation (e.g., negation) in the AST.
 - BinaryOperationNode: Represents a binary operation (e.g., addition, multiplication) in the AST.
@@ -14,22 +18,48 @@ Classes:
 
 Methods:
 - ParseResult:
-  - register(res): Handles the propagation of errors and nodes during parsing.
   - success(node): Marks parsing as successful with a resulting node.
   - failure(error): Marks parsing as failed with an error.
 
 - Parser:
   - advance(): Moves to the next token in the sequence.
   - parse(): Initiates parsing and returns the final AST or an error.
-  - factor(): Parses factors (numbers, parentheses, unary operations).
-  - term(): Parses terms (handles multiplication and division operations).
-  - expression(): Parses full expressions (handles addition and subtraction operations).
+  - factor(): Parses factors (numbers, parentheses, calls, compound expressions).
+  - operation(min_power): Parses operator expressions by precedence climbing.
+  - expression(): Parses full expressions (jump statements and ternary expressions).
 """
 
+from collections import deque
+
 from sards.ast_nodes import *
 from sards.data_types import ListNode, StringNode
 from .constants import *
-from .error import InvalidSyntaxError
+from .error import InvalidSyntaxError, ParseError
+
+# Binding powers of the operator levels, loosest first (see Parser.operation).
+TERNARY_POWER = 0
+LOGICAL_POWER = 1
+COMPARISON_POWER = 2
+ARITH_POWER = 3
+TERM_POWER = 4
+EXPONENT_POWER = 5
+
+BINARY_POWERS = {
+    K_EE: COMPARISON_POWER, K_NEQ: COMPARISON_POWER, K_LT: COMPARISON_POWER,
+    K_GT: COMPARISON_POWER, K_LTE: COMPARISON_POWER, K_GTE: COMPARISON_POWER,
+    K_PLUS: ARITH_POWER, K_MINUS: ARITH_POWER,
+    K_MUL: TERM_POWER, K_DIVIDE: TERM_POWER, K_MODULUS: TERM_POWER, K_FLOOR: TERM_POWER,
+    K_EXP: EXPONENT_POWER,
+}
+KEYWORD_POWERS = {'and': LOGICAL_POWER, 'or': LOGICAL_POWER}
+
+# FIRST set of `expression` (docs/grammar_rules.md): the token kinds, and the keywords,
+# that can start an expression or a statement. `define` is left out because statements
+# are only recognised from an IDENTIFIER followed by '='.
+EXPRESSION_FIRST_KINDS = frozenset({K_INT, K_FLOAT, K_STRING, K_IDENTIFIER, K_LPAREN,
+                                    K_LPAREN3, K_PLUS, K_MINUS})
+EXPRESSION_FIRST_KEYWORDS = frozenset({'not', 'when', 'Cycle', 'whenever', 'method', 'menu',
+                                       'yield', 'proceed', 'escape'})
 
 
 class ParseResult:
@@ -38,22 +68,6 @@ class ParseResult:
     def __init__(self):
         self.error = None
         self.node = None
-        self.last_registered_advance_count = 0
-        self.advance_count = 0
-        self.to_reverse_count = 0
-
-    def register_advancement(self):
-        """Advances through token after parsing operation."""
-        self.last_registered_advance_count = 1
-        self.advance_count += 1
-
-    def register(self, res):
-        """Registers the result of a parsing operation, propagating errors and nodes."""
-        self.last_registered_advance_count = res.advance_count
-        self.advance_count += res.advance_count
-        if res.error:
-            self.error = res.error
-        return res.node
 
     def success(self, node):
         """Marks the parsing as successful and stores the resulting node."""
@@ -62,16 +76,67 @@ class ParseResult:
 
     def failure(self, error):
         """Marks the parsing as failed and stores the associated error."""
-        if not self.error or self.advance_count == 0:
-            self.error = error
+        self.error = error
         return self
 
-    def try_register(self, res):
-        """Registers the result of a parsing operation, returning None on encountering errors."""
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return None
-        return self.register(res)
+
+class TokenBuffer:
+    """
+    Gives the Parser indexed access to a lazily produced token stream.
+
+    Only the most recently pulled tokens are kept, which is enough for the parser's
+    `peek()` and short `reverse()` calls. The parser itself never backtracks, but
+    rewinding past the kept window still works: it restarts the token source and
+    skips forward to the requested index.
+
+    Attributes:
+    - token_source (callable): Returns a fresh token iterator, e.g. `lexer.iter_tokens`.
+    - history (int): The number of tokens kept for rewinding.
+    """
+
+    def __init__(self, token_source, history=64):
+        self.token_source = token_source
+        self.history = history
+        self.restart()
+
+    def restart(self):
+        """Starts pulling tokens from the beginning of the token source."""
+        self.iterator = iter(self.token_source())
+        self.window = deque(maxlen=self.history)
+        self.offset = 0
+        self.exhausted = False
+
+    def __getitem__(self, index):
+        """
+        Returns the token at the given absolute index.
+
+        Raises:
+        - IndexError: If the token stream ends before the index.
+        """
+        if index < self.offset:
+            self.restart()
+
+        window = self.window
+        while index >= self.offset + len(window):
+            if self.exhausted:
+                raise IndexError(index)
+            try:
+                token = next(self.iterator)
+            except StopIteration:
+                self.exhausted = True
+                raise IndexError(index) from None
+            if len(window) == self.history:
+                self.offset += 1
+            window.append(token)
+
+        return window[index - self.offset]
+
+    def drain(self):
+        """Pulls the rest of the token stream, so the lexer scans the whole text."""
+        if not self.exhausted:
+            for _ in self.iterator:
+                pass
+            self.exhausted = True
 
 
 class NumberNode: # pylint: disable=R0903
@@ -99,13 +164,26 @@ class UnaryOperationNode: # pylint: disable=R0903
         return f'({self.operator}, {self.node})'
 
 
+def operation_method(operator):
+    """Returns the name of the value method implementing a binary operator token."""
+    if operator.kind == K_KEYWORD:
+        return KEYWORD_OPERATION_METHODS.get(operator.value)
+    return BINARY_OPERATION_METHODS.get(operator.kind)
+
+
 class BinaryOperationNode: # pylint: disable=R0903
-    """Represents a binary operation (e.g., addition, multiplication) in the AST."""
+    """
+    Represents a binary operation (e.g., addition, multiplication) in the AST.
+
+    The operator is resolved once, when the node is built, to the name of the value
+    method implementing it (`method_name`, e.g. 'add' or 'get_comparison_lt').
+    """
 
     def __init__(self, left_node, operator, right_node):
         self.left_node = left_node
         self.operator = operator
         self.right_node = right_node
+        self.method_name = operation_method(operator)
         self.pos_start = self.left_node.pos_start
         self.pos_end = self.right_node.pos_end
 
@@ -128,7 +206,12 @@ class TernaryOperationNode: # pylint: disable=R0903
 
 
 class Parser: # pylint: disable=R0904
-    """Performs recursive descent parsing of tokenized mathematical expressions."""
+    """
+    Performs recursive descent parsing of tokenized mathematical expressions.
+
+    `tokens` is either the complete token list or a TokenBuffer that pulls tokens
+    from the lexer while parsing (see `Parser.from_lexer`).
+    """
 
     def __init__(self, tokens):
         self.tokens = tokens
@@ -136,6 +219,19 @@ class Parser: # pylint: disable=R0904
         self.tok_index = -1
         self.advance()
 
+    @classmethod
+    def from_lexer(cls, lexer):
+        """
+        Creates a parser that consumes the lexer's tokens as they are produced.
+
+        Lexing and parsing then run in a single pass and the full token list is never
+        held in memory. Lexer errors are reported through `lexer.error` once parsing
+        returns; the token stream ends with EOF at the offending character. When the
+        parse fails first, the rest of the text is still scanned, so an illegal
+        character is reported wherever it is, as when the text is lexed up front.
+        """
+        return cls(TokenBuffer(lexer.iter_tokens))
+
     def advance(self):
         """Moves to the next token in the token sequence."""
         self.tok_index += 1
@@ -150,25 +246,47 @@ class Parser: # pylint: disable=R0904
 
     def update_current_tok(self):
         """Updates current token in the token sequence."""
-        if self.tok_index >= 0 and self.tok_index < len(self.tokens):
-            self.current_tok = self.tokens[self.tok_index]
+        if self.tok_index >= 0:
+            try:
+                self.current_tok = self.tokens[self.tok_index]
+            except IndexError:
+                pass
 
     def peek(self):
         """Check the next token in the token sequence."""
-        next_index = self.tok_index + 1
-        if next_index < len(self.tokens):
-            return self.tokens[next_index]
-        return None
+        try:
+            return self.tokens[self.tok_index + 1]
+        except IndexError:
+            return None
+
+    def starts_expression(self):
+        """Checks whether the current token can start an expression or a statement."""
+        token = self.current_tok
+        if token.kind == K_KEYWORD:
+            return token.value in EXPRESSION_FIRST_KEYWORDS
+        return token.kind in EXPRESSION_FIRST_KINDS
 
     def parse(self):
-        """Initiates parsing and returns the final AST or an error if parsing fails."""
-        result = self.multiline()
+        """
+        Initiates parsing and returns the final AST or an error if parsing fails.
 
-        if not result.error and self.current_tok.type != T_EOF:
-            print(self.current_tok)
-            return result.failure(
-                InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end,
-                                   "Expected '+', '-', '*', '/'"))
+        The grammar rules return nodes and raise ParseError at the first syntax error;
+        this is the only place the exception is caught.
+
+        Returns:
+        - ParseResult: The AST of the program, or the syntax error that stopped the parse.
+        """
+        result = ParseResult()
+        try:
+            result.success(self.multiline())
+            if self.current_tok.kind != K_EOF:
+                raise ParseError(
+                    InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end,
+                                       "Expected '+', '-', '*', '/'"))
+        except ParseError as exception:
+            result.failure(exception.error)
+            if isinstance(self.tokens, TokenBuffer):
+                self.tokens.drain()
         return result
 
     def multiline(self):
@@ -178,50 +296,35 @@ class Parser: # pylint: disable=R0904
         NEWLINE* (expression|statements|jump_statements)
         (NEWLINE* (expression|statements|jump_statements))* NEWLINE*
         """
-        res = ParseResult()
         statements = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        while self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        while self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-        if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-            statement = res.register(self.statements())
+        if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+            statement = self.statements()
 
         else:
-            statement = res.register(self.expression())
-        if res.error:
-            return res
+            statement = self.expression()
         statements.append(statement)
 
-        more_statements = True
-
-        while True:
-            newline_count = 0
-            while self.current_tok.type == T_NEWLINE:
-                res.register_advancement()
+        # Another statement follows only if the newlines are followed by a token that
+        # can start one; otherwise the block ends here (e.g. before a closing '}').
+        while self.current_tok.kind == K_NEWLINE:
+            while self.current_tok.kind == K_NEWLINE:
                 self.advance()
-                newline_count += 1
-            if newline_count == 0:
-                more_statements = False
 
-            if not more_statements:
+            if not self.starts_expression():
                 break
 
-            if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-                statement = res.try_register(self.statements())
-
+            if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+                statement = self.statements()
             else:
-                statement = res.try_register(self.expression())
-
-            if not statement:
-                self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
+                statement = self.expression()
             statements.append(statement)
 
-        return res.success(ListNode(statements, pos_start, self.current_tok.pos_end.copy()))
+        return ListNode(statements, pos_start, self.current_tok.pos_end)
 
     def list_expression(self):
         """
@@ -229,45 +332,35 @@ class Parser: # pylint: disable=R0904
 
         LPAREN3 (expression(COMMA expression)*)? RPAREN RPAREN3
         """
-        res = ParseResult()
         element_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        if self.current_tok.type != T_LPAREN3:
-            return res.failure(
+        if self.current_tok.kind != K_LPAREN3:
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected '['"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_RPAREN3:
-            res.register_advancement()
+        if self.current_tok.kind == K_RPAREN3:
             self.advance()
         else:
-            element_nodes.append(res.register(self.expression()))
-            if res.error:
-                return res
-            while self.current_tok and self.current_tok.type == T_COMMA:
-                res.register_advancement()
+            element_nodes.append(self.expression())
+            while self.current_tok and self.current_tok.kind == K_COMMA:
                 self.advance()
 
-                element_nodes.append(res.register(self.expression()))
-                if res.error:
-                    return res
+                element_nodes.append(self.expression())
 
-            if self.current_tok.type != T_RPAREN3:
-                print(self.current_tok)
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN3:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected ',' or ']"))
 
-            res.register_advancement()
             self.advance()
 
-        return res.success(ListNode(element_nodes, pos_start, self.current_tok.pos_end.copy()))
+        return ListNode(element_nodes, pos_start, self.current_tok.pos_end)
 
     def function_definition(self):
         """
@@ -276,118 +369,100 @@ class Parser: # pylint: disable=R0904
         KEYWORD:method IDENTIFIER?LPAREN (IDENTIFIER (COMMA IDENTIFIER)*)? RPAREN
         LPAREN2 ((expression|statements)RPAREN2)| (NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
-
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'method'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'method'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'method'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_IDENTIFIER:
+        if self.current_tok.kind == K_IDENTIFIER:
             var_name_tok = self.current_tok
-            res.register_advancement()
             self.advance()
 
-            if self.current_tok.type != T_LPAREN:
-                return res.failure(
+            if self.current_tok.kind != K_LPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '('"))
         else:
             var_name_tok = None
-            if self.current_tok.type != T_LPAREN:
-                return res.failure(
+            if self.current_tok.kind != K_LPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '('"))
 
-        res.register_advancement()
         self.advance()
 
         arg_name_toks = []
 
-        if self.current_tok.type == T_IDENTIFIER:
+        if self.current_tok.kind == K_IDENTIFIER:
             arg_name_toks.append(self.current_tok)
-            res.register_advancement()
             self.advance()
 
-            while self.current_tok and self.current_tok.type == T_COMMA:
-                res.register_advancement()
+            while self.current_tok and self.current_tok.kind == K_COMMA:
                 self.advance()
 
-                if self.current_tok.type != T_IDENTIFIER:
-                    return res.failure(
+                if self.current_tok.kind != K_IDENTIFIER:
+                    raise ParseError(
                         InvalidSyntaxError(self.current_tok.pos_start,
                                            self.current_tok.pos_end,
                                            "Expected identifier"))
 
                 arg_name_toks.append(self.current_tok)
-                res.register_advancement()
                 self.advance()
 
-            if self.current_tok.type != T_RPAREN:
-                print(self.current_tok)
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected ',' or ')'"))
 
         else:
-            if self.current_tok.type != T_RPAREN:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end,
                                        "Expected identifier  or ')'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type != T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if self.current_tok.kind != K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            body = res.register(self.multiline())
-            if res.error:
-                return res
+            body = self.multiline()
 
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            return res.success(FunctionDefinitionNode(var_name_tok, arg_name_toks, body, True))
+            return FunctionDefinitionNode(var_name_tok, arg_name_toks, body, True)
 
-        if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-            body_node = res.register(self.statements())
+        if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+            body_node = self.statements()
         else:
-            body_node = res.register(self.expression())
-        if res.error:
-            return res
+            body_node = self.expression()
 
-        if self.current_tok.type != T_RPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '}'"))
+        if self.current_tok.kind != K_RPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '}'"))
 
-        res.register_advancement()
         self.advance()
 
-        return res.success(FunctionDefinitionNode(var_name_tok, arg_name_toks, body_node, False))
+        return FunctionDefinitionNode(var_name_tok, arg_name_toks, body_node, False)
 
     def function_call(self):
         """
@@ -395,57 +470,42 @@ class Parser: # pylint: disable=R0904
 
         IDENTIFIER LPAREN (expression(COMMA expression)*)? RPAREN
         """
-        res = ParseResult()
         arg_nodes = []
 
-        if self.current_tok.type == T_IDENTIFIER:
-            call_node = res.register(res.success(VariableUseNode(self.current_tok)))
-            if res.error:
-                return res
-            res.register_advancement()
+        if self.current_tok.kind == K_IDENTIFIER:
+            call_node = VariableUseNode(self.current_tok)
             self.advance()
         else:
-            res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                           self.current_tok.pos_end,
-                                           "Expected identifier"))
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected identifier"))
 
-        if res.error:
-            return res
+        if self.current_tok.kind != K_LPAREN:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '('"))
 
-        if self.current_tok.type != T_LPAREN:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '('"))
-
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_RPAREN:
-            res.register_advancement()
+        if self.current_tok.kind == K_RPAREN:
             self.advance()
         else:
-            arg_nodes.append(res.register(self.expression()))
-            if res.error:
-                return res
+            arg_nodes.append(self.expression())
 
-            while self.current_tok and self.current_tok.type == T_COMMA:
-                res.register_advancement()
+            while self.current_tok and self.current_tok.kind == K_COMMA:
                 self.advance()
 
-                arg_nodes.append(res.register(self.expression()))
-                if res.error:
-                    return res
+                arg_nodes.append(self.expression())
 
-            if self.current_tok.type != T_RPAREN:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected ',' or ')"))
 
-            res.register_advancement()
             self.advance()
 
-        return res.success(FunctionCallNode(call_node, arg_nodes))
+        return FunctionCallNode(call_node, arg_nodes)
 
     def switch_statement(self):
         """
@@ -454,75 +514,62 @@ class Parser: # pylint: disable=R0904
         KEYWORD:menu ternary-expression LPAREN2 NEWLINE* (case-statement* NEWLINE*)*
         default-statement? NEWLINE* (case_statement* NEWLINE*)* RPAREN2
         """
-        res = ParseResult()
         cases = []
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'menu'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'menu'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'menu'"))
 
-        res.register_advancement()
         self.advance()
 
-        selection = res.register(self.ternary_expression())
-        if res.error:
-            return res
+        selection = self.ternary_expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        while self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        while self.current_tok.kind == K_NEWLINE:
             self.advance()
 
         found_default = False
         count = 0
 
-        while (self.current_tok.type == T_KEYWORD and
+        while (self.current_tok.kind == K_KEYWORD and
               (self.current_tok.value in ('choice', 'fallback'))):
-            if (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'choice'):
-                case = res.register(self.case_statement())
-                if res.error:
-                    return res
+            if (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'choice'):
+                case = self.case_statement()
                 cases.append(case)
-                while self.current_tok.type == T_NEWLINE:
-                    res.register_advancement()
+                while self.current_tok.kind == K_NEWLINE:
                     self.advance()
             else:
                 if found_default:
-                    return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                          self.current_tok.pos_end,
-                                                          "Multiple 'fallback' statements found"))
+                    raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                        self.current_tok.pos_end,
+                                                        "Multiple 'fallback' statements found"))
                 found_default = True
-                case = res.register(self.default_statement())
-                if res.error:
-                    return res
+                case = self.default_statement()
                 cases.append(case)
-                while self.current_tok.type == T_NEWLINE:
-                    res.register_advancement()
+                while self.current_tok.kind == K_NEWLINE:
                     self.advance()
             count = count + 1
 
         if count == 0:
-            return res.failure(
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end,
                                    "Expected 'choice' or 'fallback'"))
 
-        if not self.current_tok.type == T_RPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '}'"))
+        if not self.current_tok.kind == K_RPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '}'"))
 
-        res.register_advancement()
         self.advance()
 
-        return res.success(SwitchNode(selection, cases, False))
+        return SwitchNode(selection, cases, False)
 
     def case_statement(self):
         """
@@ -531,63 +578,51 @@ class Parser: # pylint: disable=R0904
         KEYWORD:choice ternary-expression LPAREN2 ((expression|statements) RPAREN2)|
         (NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
         case = None
 
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'choice'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'choice'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'choice'"))
-        res.register_advancement()
         self.advance()
 
-        choice_val = res.register(self.ternary_expression())
-        if res.error:
-            return res
+        choice_val = self.ternary_expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            body = res.register(self.multiline())
-            if res.error:
-                return res
+            body = self.multiline()
             case = (choice_val, body, True)
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
         else:
-            if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-                body_node = res.register(self.statements())
+            if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+                body_node = self.statements()
             else:
-                body_node = res.register(self.expression())
-            if res.error:
-                return res
+                body_node = self.expression()
             case = (choice_val, body_node, False)
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-        return res.success(case)
+        return case
 
     def default_statement(self):
         """
@@ -595,59 +630,49 @@ class Parser: # pylint: disable=R0904
 
         KEYWORD:fallback LPAREN2 ((expression|statements) RPAREN2)| (NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
         default_case = None
 
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'fallback'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'fallback'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'fallback'"))
-        res.register_advancement()
         self.advance()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            body = res.register(self.multiline())
-            if res.error:
-                return res
+            body = self.multiline()
             default_case = (None, body, True)
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
         else:
-            if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-                body_node = res.register(self.statements())
+            if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+                body_node = self.statements()
             else:
-                body_node = res.register(self.expression())
-            if res.error:
-                return res
+                body_node = self.expression()
             default_case = (None, body_node, False)
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-        return res.success(default_case)
+        return default_case
 
     def while_expression(self):
         """
@@ -656,64 +681,51 @@ class Parser: # pylint: disable=R0904
         KEYWORD:whenever expression LPAREN2 ((expression|statements) RPAREN2)|
         (NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
-
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'whenever'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'whenever'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'whenever'"))
 
-        res.register_advancement()
         self.advance()
 
-        condition = res.register(self.expression())
-        if res.error:
-            return res
+        condition = self.expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            body = res.register(self.multiline())
-            if res.error:
-                return res
+            body = self.multiline()
 
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            return res.success(WhileNode(condition, body, True))
+            return WhileNode(condition, body, True)
 
-        if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-            body_node = res.register(self.statements())
+        if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+            body_node = self.statements()
         else:
-            body_node = res.register(self.expression())
-        if res.error:
-            return res
+            body_node = self.expression()
 
-        if not self.current_tok.type == T_RPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '}'"))
+        if not self.current_tok.kind == K_RPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '}'"))
 
-        res.register_advancement()
         self.advance()
 
-        return res.success(WhileNode(condition, body_node, False))
+        return WhileNode(condition, body_node, False)
 
     def for_expression(self):
         """
@@ -722,103 +734,83 @@ class Parser: # pylint: disable=R0904
         KEYWORD:Cycle IDENTIFIER EQUAL expression COLON expression (COLON:expression)?
         LPAREN2 ((expression|statements)RPAREN2)| (NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
         step_value = None
 
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'Cycle'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'Cycle'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'Cycle'"))
 
-        res.register_advancement()
         self.advance()
 
-        if not self.current_tok.type == T_IDENTIFIER:
-            return res.failure(
+        if not self.current_tok.kind == K_IDENTIFIER:
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected identifier"))
 
         var_name = self.current_tok
-        res.register_advancement()
         self.advance()
 
-        if not self.current_tok.type == T_EQ:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '='"))
+        if not self.current_tok.kind == K_EQ:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '='"))
 
-        res.register_advancement()
         self.advance()
 
-        start_value = res.register(self.expression())
-        if res.error:
-            return res
+        start_value = self.expression()
 
-        if not self.current_tok.type == T_COLON:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected ':'"))
+        if not self.current_tok.kind == K_COLON:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected ':'"))
 
-        res.register_advancement()
         self.advance()
 
-        end_value = res.register(self.expression())
-        if res.error:
-            return res
+        end_value = self.expression()
 
-        if self.current_tok.type == T_COLON:
-            res.register_advancement()
+        if self.current_tok.kind == K_COLON:
             self.advance()
 
-            step_value = res.register(self.expression())
-            if res.error:
-                return res
+            step_value = self.expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            body = res.register(self.multiline())
-            if res.error:
-                return res
+            body = self.multiline()
 
-            if not self.current_tok.type == T_RPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            return res.success(ForNode(var_name, start_value, end_value, step_value, body, True))
+            return ForNode(var_name, start_value, end_value, step_value, body, True)
 
-        if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-            body_node = res.register(self.statements())
+        if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+            body_node = self.statements()
         else:
-            body_node = res.register(self.expression())
-        if res.error:
-            return res
+            body_node = self.expression()
 
-        if not self.current_tok.type == T_RPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '}'"))
+        if not self.current_tok.kind == K_RPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '}'"))
 
-        res.register_advancement()
         self.advance()
 
-        return res.success(ForNode(var_name, start_value, end_value, step_value, body_node, False))
+        return ForNode(var_name, start_value, end_value, step_value, body_node, False)
 
     def if_expression(self):
         """
@@ -828,99 +820,77 @@ class Parser: # pylint: disable=R0904
         (elif-expression|else-expression)?) | (NEWLINE multiline RPAREN2
         (elif-expression|else-expression))
         """
-        res = ParseResult()
         cases = []
 
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'when'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'when'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'when'"))
 
-        res.register_advancement()
         self.advance()
 
-        condition = res.register(self.expression())
-        if res.error:
-            return res
+        condition = self.expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            statements = res.register(self.multiline())
-            if res.error:
-                return res
-            print(statements)
+            statements = self.multiline()
             cases.append((condition, statements, True))
 
-            if self.current_tok.type != T_RPAREN2:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            all_cases = res.register(self.elif_or_else_expression())
-            if res.error:
-                return res
+            all_cases = self.elif_or_else_expression()
             new_cases, else_case = all_cases
             cases.extend(new_cases)
 
         else:
-            if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-                expression = res.register(self.statements())
+            if self.current_tok.kind == K_IDENTIFIER and self.peek() and self.peek().kind == K_EQ:
+                expression = self.statements()
             else:
-                expression = res.register(self.expression())
-            if res.error:
-                return res
+                expression = self.expression()
             cases.append((condition, expression, False))
 
-            if self.current_tok.type != T_RPAREN2:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            all_cases = res.register(self.elif_or_else_expression())
-            if res.error:
-                return res
+            all_cases = self.elif_or_else_expression()
             new_cases, else_case = all_cases
             cases.extend(new_cases)
 
-        return res.success(IfNode(cases, else_case))
+        return IfNode(cases, else_case)
 
     def elif_or_else_expression(self):
         """
         Helper method for elif_expression and else_expression.
         """
-        res = ParseResult()
         cases, else_case = [], None
 
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'orwhen':
-            all_cases = res.register(self.elif_expression())
-            if res.error:
-                return res
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'orwhen':
+            all_cases = self.elif_expression()
             cases, else_case = all_cases
         else:
-            else_case = res.register(self.else_expression())
-            if res.error:
-                return res
+            else_case = self.else_expression()
 
-        return res.success((cases, else_case))
+        return (cases, else_case)
 
     def elif_expression(self):
         """
@@ -930,80 +900,64 @@ class Parser: # pylint: disable=R0904
         (elif-expression|else-expression)?) | (NEWLINE multiline RPAREN2
         (elif-expression|else-expression))
         """
-        res = ParseResult()
         cases = []
 
-        if not (self.current_tok.type == T_KEYWORD and self.current_tok.value == 'orwhen'):
-            return res.failure(
+        if not (self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'orwhen'):
+            raise ParseError(
                 InvalidSyntaxError(self.current_tok.pos_start,
                                    self.current_tok.pos_end,
                                    "Expected 'when'"))
 
-        res.register_advancement()
         self.advance()
 
-        condition = res.register(self.expression())
-        if res.error:
-            return res
+        condition = self.expression()
 
-        if not self.current_tok.type == T_LPAREN2:
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start,
-                                                  self.current_tok.pos_end,
-                                                  "Expected '{'"))
+        if not self.current_tok.kind == K_LPAREN2:
+            raise ParseError(InvalidSyntaxError(self.current_tok.pos_start,
+                                                self.current_tok.pos_end,
+                                                "Expected '{'"))
 
-        res.register_advancement()
         self.advance()
 
-        if self.current_tok.type == T_NEWLINE:
-            res.register_advancement()
+        if self.current_tok.kind == K_NEWLINE:
             self.advance()
 
-            statements = res.register(self.multiline())
-            if res.error:
-                return res
+            statements = self.multiline()
             cases.append((condition, statements, True))
 
-            if self.current_tok.type != T_RPAREN2:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            all_cases = res.register(self.elif_or_else_expression())
-            if res.error:
-                return res
+            all_cases = self.elif_or_else_expression()
             new_cases, else_case = all_cases
             cases.extend(new_cases)
 
         else:
-            if (self.current_tok.type == T_IDENTIFIER and
-                self.peek() and self.peek().type == T_EQ):
-                expression = res.register(self.statements())
+            if (self.current_tok.kind == K_IDENTIFIER and
+                self.peek() and self.peek().kind == K_EQ):
+                expression = self.statements()
             else:
-                expression = res.register(self.expression())
-            if res.error:
-                return res
+                expression = self.expression()
             cases.append((condition, expression, False))
 
-            if self.current_tok.type != T_RPAREN2:
-                return res.failure(
+            if self.current_tok.kind != K_RPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '}'"))
 
-            res.register_advancement()
             self.advance()
 
-            all_cases = res.register(self.elif_or_else_expression())
-            if res.error:
-                return res
+            all_cases = self.elif_or_else_expression()
             new_cases, else_case = all_cases
             cases.extend(new_cases)
 
-        return res.success((cases, else_case))
+        return (cases, else_case)
 
     def else_expression(self):
         """
@@ -1011,145 +965,134 @@ class Parser: # pylint: disable=R0904
 
         KEYWORD:otherwise LPAREN2 (((expression|statements)RPAREN2)|NEWLINE multiline RPAREN2)
         """
-        res = ParseResult()
         else_case = None
 
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'otherwise':
-            res.register_advancement()
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'otherwise':
             self.advance()
 
-            if not self.current_tok.type == T_LPAREN2:
-                return res.failure(
+            if not self.current_tok.kind == K_LPAREN2:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '{'"))
 
-            res.register_advancement()
             self.advance()
 
-            if self.current_tok.type == T_NEWLINE:
-                res.register_advancement()
+            if self.current_tok.kind == K_NEWLINE:
                 self.advance()
 
-                statements = res.register(self.multiline())
-                if res.error:
-                    return res
+                statements = self.multiline()
                 else_case = (statements, True)
 
-                if not self.current_tok.type == T_RPAREN2:
-                    return res.failure(
+                if not self.current_tok.kind == K_RPAREN2:
+                    raise ParseError(
                         InvalidSyntaxError(self.current_tok.pos_start,
                                            self.current_tok.pos_end,
                                            "Expected '}'"))
 
-                res.register_advancement()
                 self.advance()
 
             else:
-                if (self.current_tok.type == T_IDENTIFIER and
-                    self.peek() and self.peek().type == T_EQ):
-                    expression = res.register(self.statements())
+                if (self.current_tok.kind == K_IDENTIFIER and
+                    self.peek() and self.peek().kind == K_EQ):
+                    expression = self.statements()
                 else:
-                    expression = res.register(self.expression())
-                if res.error:
-                    return res
+                    expression = self.expression()
 
-                if not self.current_tok.type == T_RPAREN2:
-                    return res.failure(
+                if not self.current_tok.kind == K_RPAREN2:
+                    raise ParseError(
                         InvalidSyntaxError(self.current_tok.pos_start,
                                            self.current_tok.pos_end,
                                            "Expected '}'"))
 
-                res.register_advancement()
                 self.advance()
 
                 else_case = (expression, False)
 
-        return res.success(else_case)
+        return else_case
 
-    def unary(self):
+    def ternary_expression(self):
         """
         Grammar Rule:
 
-        (PLUS | MINUS) unary | exponent
+        (logical-expression|statements) (QUESTION ternary-expression COLON ternary-expression)*
         """
-        res = ParseResult()
-        token = self.current_tok
-
-        if token.type in (T_PLUS, T_MINUS):
-            res.register_advancement()
-            self.advance()
-            factor = res.register(self.unary())
-            if res.error:
-                return res
-            return res.success(UnaryOperationNode(token, factor))
-
-        return self.exponent()
+        return self.operation(TERNARY_POWER)
 
-    def exponent(self):
+    def operation(self, min_power): # pylint: disable=R0911,R0912
         """
-        Grammar Rule:
+        Parses an operator expression by precedence climbing.
 
-        factor (EXP unary)*
-        """
-        res = ParseResult()
-        left_node = res.register(self.factor())
-        if res.error:
-            return res
-        while self.current_tok and self.current_tok.type == T_EXP:
-            operator = self.current_tok
-            res.register_advancement()
-            self.advance()
-            right_node = res.register(self.unary())
-            if res.error:
-                return res
-            left_node = BinaryOperationNode(left_node, operator, right_node)
+        Replaces the ternary/logical/comp/arith/term/unary/exponent levels of the grammar
+        with a single loop driven by BINARY_POWERS and KEYWORD_POWERS: an operator is
+        only consumed while it binds at least as tightly as `min_power`, and its right
+        operand is parsed one level higher (or at the same level for the
+        right-associative '**'), so the resulting trees are the same as the grammar's.
 
-        node = res.register(res.success(left_node))
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(self.current_tok.pos_start,
-                                   self.current_tok.pos_end,
-                                   "Expected 'define',int,float,identifier,'+','-' or '('"))
-        return res.success(node)
+        Parameters:
+        - min_power (int): The loosest binding power this call may consume, one of the
+            *_POWER levels.
 
-    def ternary_expression(self):
+        Returns:
+        - The root node of the expression. Raises ParseError on a syntax error.
         """
-        Grammar Rule:
+        token = self.current_tok
+        kind = token.kind
 
-        (logical-expression|statements) (QUESTION ternary-expression COLON ternary-expression)*
-        """
-        res = ParseResult()
-        if self.current_tok.type == T_IDENTIFIER and self.peek() and self.peek().type == T_EQ:
-            comp_node = res.register(self.statements())
+        # Prefix position: plain literals and names are built inline, statements only
+        # start a ternary operand and 'not' only starts a comparison.
+        if kind in (K_INT, K_FLOAT):
+            self.advance()
+            left_node = NumberNode(token)
+        elif kind == K_STRING:
+            self.advance()
+            left_node = StringNode(token)
+        elif kind == K_IDENTIFIER and self.peek().kind not in (K_LPAREN, K_EQ):
+            self.advance()
+            left_node = VariableUseNode(token)
+        elif (min_power == TERNARY_POWER and kind == K_IDENTIFIER and
+              self.peek().kind == K_EQ):
+            left_node = self.statements()
+        elif kind in (K_PLUS, K_MINUS):
+            self.advance()
+            operand = self.operation(EXPONENT_POWER)
+            left_node = UnaryOperationNode(token, operand)
+        elif kind == K_KEYWORD and token.value == 'not' and min_power <= COMPARISON_POWER:
+            self.advance()
+            operand = self.operation(COMPARISON_POWER)
+            left_node = UnaryOperationNode(token, operand)
         else:
-            comp_node = res.register(self.logical_expression())
-        if res.error:
-            return res
-        false_node = true_node = None
+            left_node = self.factor()
 
-        while self.current_tok and self.current_tok.type == T_QUESTION:
-            res.register_advancement()
-            self.advance()
-            true_node = res.register(self.ternary_expression())
-            if res.error:
-                return res
-            if self.current_tok and not self.current_tok.type == T_COLON:
-                return res.failure(
-                    InvalidSyntaxError(self.current_tok.pos_start,
-                                       self.current_tok.pos_end,
-                                       "Expected ':' "))
+        while True:
+            operator = self.current_tok
+            if operator.kind == K_KEYWORD:
+                power = KEYWORD_POWERS.get(operator.value)
+            elif operator.kind == K_QUESTION and min_power == TERNARY_POWER:
+                power = TERNARY_POWER
+            else:
+                power = BINARY_POWERS.get(operator.kind)
+            if power is None or power < min_power:
+                break
 
-            res.register_advancement()
             self.advance()
-            false_node = res.register(self.ternary_expression())
-            if res.error:
-                return res
 
-        if not (true_node and false_node):
-            return res.success(comp_node)
+            if power == TERNARY_POWER:
+                true_node = self.operation(TERNARY_POWER)
+                if self.current_tok.kind != K_COLON:
+                    raise ParseError(
+                        InvalidSyntaxError(self.current_tok.pos_start,
+                                           self.current_tok.pos_end,
+                                           "Expected ':' "))
+                self.advance()
+                false_node = self.operation(TERNARY_POWER)
+                left_node = TernaryOperationNode(left_node, true_node, false_node)
+                continue
+
+            right_node = self.operation(power if power == EXPONENT_POWER else power + 1)
+            left_node = BinaryOperationNode(left_node, operator, right_node)
 
-        return res.success(TernaryOperationNode(comp_node, true_node, false_node))
+        return left_node
 
     def factor(self):
         """
@@ -1161,110 +1104,64 @@ class Parser: # pylint: disable=R0904
         if-expression | for-expression | while-expression |
         function-definition | function-call | list-expression | switch-statement
         """
-        res = ParseResult()
         token = self.current_tok
 
-        if token.type in (T_INT, T_FLOAT):
-            res.register_advancement()
+        if token.kind in (K_INT, K_FLOAT):
             self.advance()
-            return res.success(NumberNode(token))
+            return NumberNode(token)
 
-        if token.type == T_STRING:
-            res.register_advancement()
+        if token.kind == K_STRING:
             self.advance()
-            return res.success(StringNode(token))
+            return StringNode(token)
 
-        if (self.current_tok and self.current_tok.type == T_IDENTIFIER and
-              self.peek() and self.peek().type == T_LPAREN):
-            call_expression = res.register(self.function_call())
-            if res.error:
-                return res
-            return res.success(call_expression)
+        if (self.current_tok and self.current_tok.kind == K_IDENTIFIER and
+              self.peek() and self.peek().kind == K_LPAREN):
+            call_expression = self.function_call()
+            return call_expression
 
-        if token.type == T_IDENTIFIER:
-            res.register_advancement()
+        if token.kind == K_IDENTIFIER:
             self.advance()
-            return res.success(VariableUseNode(token))
+            return VariableUseNode(token)
 
-        if token.type == T_LPAREN:
-            res.register_advancement()
+        if token.kind == K_LPAREN:
             self.advance()
-            expression = res.register(self.expression())
-            if res.error:
-                return res
-            if self.current_tok.type != T_RPAREN:
-                return res.failure(
+            expression = self.expression()
+            if self.current_tok.kind != K_RPAREN:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected ')'"))
-            res.register_advancement()
             self.advance()
-            return res.success(expression)
-
-        if token.type == T_KEYWORD and token.value == 'when':
-            if_expr = res.register(self.if_expression())
-            if res.error:
-                return res
-            return res.success(if_expr)
-
-        if token.type == T_KEYWORD and token.value == 'Cycle':
-            for_expr = res.register(self.for_expression())
-            if res.error:
-                return res
-            return res.success(for_expr)
-
-        if token.type == T_KEYWORD and token.value == 'whenever':
-            while_expr = res.register(self.while_expression())
-            if res.error:
-                return res
-            return res.success(while_expr)
-
-        if token.type == T_KEYWORD and token.value == 'method':
-            method_expr = res.register(self.function_definition())
-            if res.error:
-                return res
-            return res.success(method_expr)
-
-        if token.type == T_KEYWORD and token.value == 'menu':
-            switch_statement = res.register(self.switch_statement())
-            if res.error:
-                return res
-            return res.success(switch_statement)
-
-        if token.type == T_LPAREN3:
-            list_expression = res.register(self.list_expression())
-            if res.error:
-                return res
-            return res.success(list_expression)
-
-        return res.failure(
-            InvalidSyntaxError(token.pos_start,
-                               token.pos_end,
-                               "Expected int, float,identifier,'+','-'or '('"))
+            return expression
 
-    def term(self):
-        """Parses terms, handling multiplication and division operations.
-        
-        Grammar Rule:
+        if token.kind == K_KEYWORD and token.value == 'when':
+            if_expr = self.if_expression()
+            return if_expr
 
-        unary ((MUL | DIV | MODULUS | FLOOR_DIV) unary)*
-        """
-        res = ParseResult()
+        if token.kind == K_KEYWORD and token.value == 'Cycle':
+            for_expr = self.for_expression()
+            return for_expr
 
-        left_node = res.register(self.unary())
-        if res.error:
-            return res
+        if token.kind == K_KEYWORD and token.value == 'whenever':
+            while_expr = self.while_expression()
+            return while_expr
 
-        while self.current_tok and self.current_tok.type in (T_MUL, T_DIVIDE, T_MODULUS, T_FLOOR):
-            operator = self.current_tok
-            res.register_advancement()
-            self.advance()
-            right_node = res.register(self.unary())
-            if res.error:
-                return res
-            left_node = BinaryOperationNode(left_node, operator, right_node)
+        if token.kind == K_KEYWORD and token.value == 'method':
+            method_expr = self.function_definition()
+            return method_expr
 
-        return res.success(left_node)
+        if token.kind == K_KEYWORD and token.value == 'menu':
+            switch_statement = self.switch_statement()
+            return switch_statement
+
+        if token.kind == K_LPAREN3:
+            list_expression = self.list_expression()
+            return list_expression
+
+        raise ParseError(
+            InvalidSyntaxError(token.pos_start,
+                               token.pos_end,
+                               "Expected int, float,identifier,'+','-'or '('"))
 
     def statements(self):
         """
@@ -1272,57 +1169,46 @@ class Parser: # pylint: disable=R0904
 
         (KEYWORD:define)? IDENTIFIER EQUAL expression
         """
-        res = ParseResult()
-
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'define':
-            res.register_advancement()
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'define':
             self.advance()
 
-            if self.current_tok.type != T_IDENTIFIER:
-                return res.failure(
+            if self.current_tok.kind != K_IDENTIFIER:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected identifier"))
 
             var_name = self.current_tok
-            res.register_advancement()
             self.advance()
 
-            if self.current_tok.type != T_EQ:
-                return res.failure(
+            if self.current_tok.kind != K_EQ:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected '='"))
 
-            res.register_advancement()
             self.advance()
 
-            expression = res.register(self.expression())
-            if res.error:
-                return res
-            return res.success(VariableAssignNode(var_name, expression))
+            expression = self.expression()
+            return VariableAssignNode(var_name, expression)
 
-        if self.current_tok.type == T_IDENTIFIER:
+        if self.current_tok.kind == K_IDENTIFIER:
             var_name = self.current_tok
-            res.register_advancement()
             self.advance()
 
-            if self.current_tok.type != T_EQ:
-                return res.failure(
+            if self.current_tok.kind != K_EQ:
+                raise ParseError(
                     InvalidSyntaxError(self.current_tok.pos_start,
                                        self.current_tok.pos_end,
                                        "Expected ="))
 
-            res.register_advancement()
             self.advance()
 
-            expression = res.register(self.expression())
-            if res.error:
-                return res
+            expression = self.expression()
 
-            return res.success(VariableAssignNode(var_name, expression))
+            return VariableAssignNode(var_name, expression)
 
-        return res.failure(
+        raise ParseError(
             InvalidSyntaxError(self.current_tok.pos_start,
                                self.current_tok.pos_end,
                                "Expected 'define' or identifier"))
@@ -1333,139 +1219,23 @@ class Parser: # pylint: disable=R0904
 
         jump_statements | ternary-expression
         """
-        res = ParseResult()
-
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'yield':
-            res.register_advancement()
-            self.advance()
-
-            expression = res.try_register(self.expression())
-            if not expression:
-                self.reverse(res.to_reverse_count)
-            return res.success(
-                ReturnNode(expression, self.current_tok.pos_start.copy(),
-                           self.current_tok.pos_start.copy()))
-
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'proceed':
-            res.register_advancement()
-            self.advance()
-            return res.success(ContinueNode(self.current_tok.pos_start.copy(),
-                                            self.current_tok.pos_start.copy()))
-
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'escape':
-            res.register_advancement()
-            self.advance()
-            return res.success(BreakNode(self.current_tok.pos_start.copy(),
-                                         self.current_tok.pos_start.copy()))
-
-        ternary_node = res.register(self.ternary_expression())
-        if res.error:
-            return res
-        node = res.register(res.success(ternary_node))
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(self.current_tok.pos_start,
-                                   self.current_tok.pos_end,
-                                   "Expected int,float,identifier"))
-        return res.success(node)
-
-    def logical_expression(self):
-        """
-        Grammar Rule:
-
-        comp-expression ((KEYWORD:AND | KEYWORD:OR) comp-expression)*
-        """
-        res = ParseResult()
-        left_node = res.register(self.comp_expression())
-        if res.error:
-            return res
-
-        while (self.current_tok and
-               self.current_tok.type == T_KEYWORD and
-               self.current_tok.value in ('and', 'or')):
-            operator = self.current_tok
-            res.register_advancement()
-            self.advance()
-
-            right_node = res.register(self.comp_expression())
-            if res.error:
-                return res
-
-            left_node = BinaryOperationNode(left_node, operator, right_node)
-
-        node = res.register(res.success(left_node))
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(self.current_tok.pos_start,
-                                   self.current_tok.pos_end,
-                                   "Expected int,float,identifier"))
-        return res.success(node)
-
-    def comp_expression(self):
-        """
-        Grammar Rule:
-
-        KEYWORD:NOT comp-expression | arith-expression
-        ((EE | NEQ | LT | GT | LTE | GTE) arith-expression)*
-        """
-        res = ParseResult()
-
-        if self.current_tok.type == T_KEYWORD and self.current_tok.value == 'not':
-            operator_token = self.current_tok
-            res.register_advancement()
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'yield':
             self.advance()
 
-            node = res.register(self.comp_expression())
-            if res.error:
-                return res
-            return res.success(UnaryOperationNode(operator_token, node))
+            expression = None
+            if self.starts_expression():
+                expression = self.expression()
+            return ReturnNode(expression, self.current_tok.pos_start,
+                              self.current_tok.pos_start)
 
-        left_node = res.register(self.arith_expression())
-        if res.error:
-            return res
-
-        while self.current_tok and self.current_tok.type in (T_EE, T_LT, T_GT, T_GTE, T_LTE):
-            operator = self.current_tok
-            res.register_advancement()
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'proceed':
             self.advance()
-            right_node = res.register(self.arith_expression())
-            if res.error:
-                return res
-            left_node = BinaryOperationNode(left_node, operator, right_node)
-
-        node = res.register(res.success(left_node))
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(self.current_tok.pos_start,
-                                   self.current_tok.pos_end,
-                                   "Expected int,float,identifier,'+','-','not' or '('"))
-        return res.success(node)
+            return ContinueNode(self.current_tok.pos_start,
+                                self.current_tok.pos_start)
 
-    def arith_expression(self):
-        """Parses full expressions, handling addition and subtraction operations.
-        
-        Grammar Rule:
-
-        term ((PLUS | MINUS) term)*
-        """
-        res = ParseResult()
-        left_node = res.register(self.term())
-        if res.error:
-            return res
-
-        while self.current_tok and self.current_tok.type in (T_PLUS, T_MINUS):
-            operator = self.current_tok
-            res.register_advancement()
+        if self.current_tok.kind == K_KEYWORD and self.current_tok.value == 'escape':
             self.advance()
-            right_node = res.register(self.term())
-            if res.error:
-                return res
-            left_node = BinaryOperationNode(left_node, operator, right_node)
+            return BreakNode(self.current_tok.pos_start,
+                             self.current_tok.pos_start)
 
-        node = res.register(res.success(left_node))
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(self.current_tok.pos_start,
-                                   self.current_tok.pos_end,
-                                   "Expected 'define',int,float,identifier,'+','-' or '('"))
-        return res.success(node)
+        return self.ternary_expression()
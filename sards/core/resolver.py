@@ -0,0 +1,233 @@
+"""
+Module: resolver
+
+This module gives every variable of a method a slot in an array-backed frame, so the
+Interpreter reads and writes a method's variables by index instead of by name.
+
+The first time a method definition is evaluated, a Resolver walks the method's body
+and gives a slot to every name the body can bind: its parameters first, then the
+variables it assigns, the variables of its Cycle loops and the methods it defines.
+Every variable read, assignment, loop and method definition of the body is annotated
+with the slot of its name (`frame_slot`). A call of the method then runs in a Frame
+holding its slots in a list, filled with the arguments.
+
+Methods see the variables of their caller, so a name a method does not bind, or reads
+before binding it, is still looked up by name through the frames of its callers. But
+a frame only ever holds the names of its layout, and every name a method can bind is
+recorded in BOUND_NAMES once the method is resolved: a name no method binds is looked
+up in the global scope directly, however deep the calls. The global scope and the
+built-ins stay in SymbolTables, reachable by name from the shell.
+
+Classes:
+- FrameLayout: The slots of the variables of a method.
+- Frame: The variables of a method call, held in slots.
+- Resolver: Gives the variables of a method body their slots.
+
+Functions:
+- resolve(arg_names, body_node): Resolves the variables of a method body.
+"""
+
+from sards.ast_nodes import SymbolTable
+from .optimizer import NodeTransformer
+
+# Every name a Frame (or a vm.MethodScope) may hold: the names bound by the methods
+# resolved so far, and any name set on a frame outside of its layout.
+#
+# It is never reset, deliberately: functions outlive the program that defined them
+# (the shell and long-running hosts keep them in the global scope), and a name dropped
+# while a frame that may hold it can still be called would be looked up in the wrong
+# scope. A stale name only costs a slower lookup. The set grows with the distinct
+# names of the programs resolved, not with the number of programs or calls.
+BOUND_NAMES = set()
+
+
+class FrameLayout: # pylint: disable=R0903
+    """
+    The slots of the variables of a method.
+
+    Attributes:
+    - slots (dict): The slot of each name the method binds.
+    - unbound (list): The initial value (None) of the slots after the parameters'.
+    """
+
+    def __init__(self, slots, size, parameters):
+        """
+        Initializes a FrameLayout.
+
+        Parameters:
+        - slots (dict): The slot of each name the method binds.
+        - size (int): The number of slots.
+        - parameters (int): The number of parameters, which fill the first slots.
+        """
+        self.slots = slots
+        self.unbound = [None] * (size - parameters)
+
+
+class Frame(SymbolTable):
+    """
+    The variables of a method call, held in a list of slots (see FrameLayout).
+
+    It is the SymbolTable of the call's context: names are still read and set through
+    `get` and `set`, by the methods it calls and by the nodes the Resolver leaves
+    unannotated, and `symbols` holds the hidden temporaries of hoisted expressions.
+
+    Attributes:
+    - slots (list): The values of the variables, None for a variable not bound yet.
+    - layout (dict): The slot of each name of the method.
+    - globals (SymbolTable): The first scope up the calls that is not a Frame.
+    """
+
+    def __init__(self, layout, parent, args):
+        """
+        Initializes a Frame.
+
+        Parameters:
+        - layout (FrameLayout): The slots of the method.
+        - parent (SymbolTable): The scope of the caller.
+        - args (list): The arguments of the call, one per parameter.
+        """
+        super().__init__(parent)
+        self.slots = args + layout.unbound
+        self.layout = layout.slots
+        self.globals = parent.globals if isinstance(parent, Frame) else parent
+
+    def get(self, name):
+        """
+        Retrieves the value of a variable, from the frame or the scopes up the calls.
+
+        Parameters:
+        - name (str): The name of the variable.
+
+        Returns:
+        - The value of the variable, or None if the variable is not found.
+        """
+        slot = self.layout.get(name)
+        if slot is not None:
+            value = self.slots[slot]
+            if value is not None:
+                return value
+        elif name not in BOUND_NAMES:
+            # No frame up the calls can hold it.
+            return self.globals.get(name)
+        else:
+            value = self.symbols.get(name)
+            if value is not None:
+                return value
+        return self.parent.get(name)
+
+    def set(self, name, value):
+        """
+        Sets the value of a variable in the frame.
+
+        Parameters:
+        - name (str): The name of the variable.
+        - value: The value to assign to the variable.
+        """
+        slot = self.layout.get(name)
+        if slot is None:
+            BOUND_NAMES.add(name)
+            self.symbols[name] = value
+        else:
+            self.slots[slot] = value
+
+    def remove(self, name):
+        """
+        Removes a variable from the frame.
+
+        Parameters:
+        - name (str): The name of the variable to remove.
+        """
+        slot = self.layout.get(name)
+        if slot is None:
+            del self.symbols[name]
+        else:
+            self.slots[slot] = None
+
+
+class Resolver(NodeTransformer):
+    """
+    Gives the variables of a method body their slots, annotating its nodes.
+
+    The bodies of the methods it defines are left to be resolved on their own, when
+    their definitions are evaluated.
+
+    Attributes:
+    - slots (dict): The slot of each name bound so far.
+    - size (int): The number of slots given so far.
+    - uses (list): The variable reads met, annotated once every name is bound.
+
+    Methods:
+    - layout(body_node): Resolves a body and returns its FrameLayout.
+    """
+
+    def __init__(self, arg_names):
+        """
+        Initializes a Resolver.
+
+        Parameters:
+        - arg_names (list): The names of the method's parameters.
+        """
+        super().__init__()
+        # A repeated parameter takes the last argument, as in a SymbolTable.
+        self.slots = {name: slot for slot, name in enumerate(arg_names)}
+        self.size = self.parameters = len(arg_names)
+        self.uses = []
+
+    def layout(self, body_node):
+        """
+        Resolves a method body.
+
+        Parameters:
+        - body_node (AST Node): The body of the method.
+
+        Returns:
+        - FrameLayout: The slots of the method's variables.
+        """
+        self.visit(body_node)
+        for node in self.uses:
+            node.frame_slot = self.slots.get(node.var_name_tok.value)
+        BOUND_NAMES.update(self.slots)
+        return FrameLayout(self.slots, self.size, self.parameters)
+
+    def bind(self, name):
+        """Returns the slot of a name bound by the method, giving it one if it has none."""
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = self.size
+            self.size += 1
+        return slot
+
+    def visit_VariableUseNode(self, node): # pylint: disable=C0103
+        """Records a variable read."""
+        self.uses.append(node)
+        return node
+
+    def visit_VariableAssignNode(self, node): # pylint: disable=C0103
+        """Binds an assigned variable."""
+        node.frame_slot = self.bind(node.var_name_tok.value)
+        return self.generic_visit(node)
+
+    def visit_ForNode(self, node): # pylint: disable=C0103
+        """Binds the variable of a Cycle loop."""
+        node.frame_slot = self.bind(node.var_name_tok.value)
+        return self.generic_visit(node)
+
+    def visit_FunctionDefinitionNode(self, node): # pylint: disable=C0103
+        """Binds the name of a method defined in the body, without entering its body."""
+        if node.var_name_tok:
+            node.frame_slot = self.bind(node.var_name_tok.value)
+        return node
+
+
+def resolve(arg_names, body_node):
+    """
+    Resolves the variables of a method body (see Resolver).
+
+    Parameters:
+    - arg_names (list): The names of the method's parameters.
+    - body_node (AST Node): The body of the method.
+
+    Returns:
+    - FrameLayout: The slots of the method's variables.
+    """
+    return Resolver(arg_names).layout(body_node)
@@ -0,0 +1,220 @@
+"""
+Module: stack_parser
+
+This module implements a recursion-free parsing mode for very deeply nested programs.
+
+The recursive descent Parser uses one Python frame per grammar rule in progress, so
+machine-generated programs with thousands of nested blocks, parentheses or '**'
+chains exceed the interpreter's recursion limit. StackParser parses the same grammar
+with an explicit stack instead, so its depth is only bounded by memory.
+
+StackParser is derived from Parser's own source: every grammar rule is recompiled as a
+generator in which each call to another rule, `self.rule(...)`, becomes
+`(yield self.rule(...))`. A driver loop keeps the suspended rules on a list and
+resumes the caller with the callee's node once it returns, or throws the callee's
+ParseError into it. The grammar therefore lives in a single place and both modes
+always produce the same trees and errors. Rules must call each other directly in
+their own bodies: a rule call inside a lambda, a comprehension or a nested function
+could not be suspended, so building the rules rejects it with a RuntimeError.
+
+The rules are recompiled once, the first time a StackParser is created, so importing
+sards does not pay for it. This needs the source of the parser module: when it is not
+available (e.g. a .pyc-only install), creating a StackParser raises a RuntimeError.
+
+Classes:
+- StackParser: A Parser that runs its grammar rules on an explicit stack.
+"""
+
+import ast
+import inspect
+
+from .error import ParseError
+from .parser import Parser
+
+
+# Python scopes nested in a method. A rule call inside one of them cannot become a
+# yield of the rule: it would make the nested scope, not the rule, a generator.
+NESTED_SCOPES = (ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef,
+                 ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def grammar_rules(class_tree):
+    """
+    Finds the methods of a class that take part in the recursive descent.
+
+    These are the methods that call, directly or through each other, a method of the
+    same set; helpers such as `advance()` or `peek()` drop out.
+
+    Parameters:
+    - class_tree (ast.ClassDef): The parsed class.
+
+    Returns:
+    - dict: The rule names mapped to their ast.FunctionDef nodes.
+
+    Raises:
+    - RuntimeError: If a rule calls another rule from a nested scope (see
+        check_rule_calls).
+    """
+    methods = {node.name: node for node in class_tree.body if isinstance(node, ast.FunctionDef)}
+    calls = {name: {node.func.attr for node in ast.walk(method) if is_self_call(node)}
+             for name, method in methods.items()}
+
+    rules = set(methods)
+    while True:
+        remaining = {name for name in rules if calls[name] & rules}
+        if remaining == rules:
+            break
+        rules = remaining
+
+    for name in rules:
+        check_rule_calls(class_tree.name, methods[name], rules)
+    return {name: methods[name] for name in rules}
+
+
+def check_rule_calls(class_name, function, rules):
+    """
+    Checks that a grammar rule only calls other rules from its own body.
+
+    Parameters:
+    - class_name (str): The name of the parser class, for the error message.
+    - function (ast.FunctionDef): The rule.
+    - rules (set): The names of the grammar rules.
+
+    Raises:
+    - RuntimeError: If a rule is called inside a lambda, a comprehension or a nested
+        function or class of the rule.
+    """
+    for scope in ast.walk(function):
+        if scope is function or not isinstance(scope, NESTED_SCOPES):
+            continue
+        for node in ast.walk(scope):
+            if is_self_call(node, rules):
+                raise RuntimeError(
+                    f"{class_name}.{function.name} calls the grammar rule "
+                    f"'{node.func.attr}' inside a {type(scope).__name__} (line "
+                    f"{node.lineno}); StackParser needs rules to call each other "
+                    "directly in their own bodies")
+
+
+def is_self_call(node, names=None):
+    """Checks whether an AST node is a call `self.name(...)`, optionally for given names."""
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and
+            isinstance(node.func.value, ast.Name) and node.func.value.id == 'self' and
+            (names is None or node.func.attr in names))
+
+
+class YieldRuleCalls(ast.NodeTransformer):
+    """Rewrites every call to a grammar rule into a yield of the rule's generator."""
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def visit_Call(self, node): # pylint: disable=C0103
+        """Wraps `self.rule(...)` in a yield expression."""
+        self.generic_visit(node)
+        if is_self_call(node, self.rules):
+            return ast.Yield(value=node)
+        return node
+
+
+def build_rules(parser_class):
+    """
+    Recompiles the grammar rules of a Parser class as generators.
+
+    Parameters:
+    - parser_class (type): The Parser class whose rules are recompiled.
+
+    Returns:
+    - dict: The rule names mapped to their generator functions. `parse` is renamed
+        `parse_rule`, since StackParser.parse drives it.
+
+    Raises:
+    - RuntimeError: If a rule calls another rule from a nested scope.
+    """
+    lines, first_line = inspect.getsourcelines(parser_class)
+    class_tree = ast.parse(''.join(lines)).body[0]
+    ast.increment_lineno(class_tree, first_line - 1)
+    rules = grammar_rules(class_tree)
+
+    module = ast.Module(body=[], type_ignores=[])
+    transformer = YieldRuleCalls(set(rules))
+    for name, function in rules.items():
+        function = transformer.visit(function)
+        function.decorator_list = []
+        if name == 'parse':
+            function.name = 'parse_rule'
+        module.body.append(function)
+    ast.fix_missing_locations(module)
+
+    namespace = dict(vars(inspect.getmodule(parser_class)))
+    code = compile(module, inspect.getsourcefile(parser_class), 'exec')
+    exec(code, namespace) # pylint: disable=W0122
+    return {function.name: namespace[function.name] for function in module.body}
+
+
+class StackParser(Parser):
+    """
+    Parses tokens with the same grammar as Parser, using an explicit stack of rules.
+
+    Attributes:
+    - max_depth (int): The largest number of grammar rules that were in progress at
+        once during the last call to parse().
+    """
+
+    def __init__(self, tokens):
+        if 'parse_rule' not in vars(StackParser):
+            install_rules()
+        super().__init__(tokens)
+        self.max_depth = 0
+
+    def parse(self):
+        """
+        Parses the tokens without recursion and records the maximum rule depth.
+
+        Returns:
+        - ParseResult: The same result Parser.parse returns for these tokens.
+        """
+        stack = [self.parse_rule()] # pylint: disable=E1101
+        self.max_depth = 1
+        value, error = None, None
+
+        while True:
+            try:
+                if error is None:
+                    rule = stack[-1].send(value)
+                else:
+                    rule = stack[-1].throw(error)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return stop.value
+                value, error = stop.value, None
+                continue
+            except ParseError as exception:
+                # Re-raise the syntax error inside the caller, as a Python call would.
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, exception
+                continue
+
+            stack.append(rule)
+            value, error = None, None
+            if len(stack) > self.max_depth:
+                self.max_depth = len(stack)
+
+
+def install_rules():
+    """
+    Recompiles Parser's grammar rules and installs them on StackParser.
+
+    Raises:
+    - RuntimeError: If the source of the parser module is not available.
+    """
+    try:
+        rules = build_rules(Parser)
+    except (OSError, TypeError) as exception:
+        raise RuntimeError('StackParser is built from the source of sards.core.parser, '
+                           'which is not available in this installation') from exception
+    for name, rule in rules.items():
+        setattr(StackParser, name, rule)
@@ -0,0 +1,641 @@
+"""
+Module: transpiler
+
+This module translates the bodies of hot SARDS methods into Python source, compiled
+with compile() and run by CPython instead of the tree-walking Interpreter.
+
+Function.execute counts the calls of a method in its MethodProfile. Once a method has
+been called HOT_CALL_THRESHOLD times, its body is transpiled, and that call and every
+later one run the generated Python function.
+
+The generated code works on the Number, String, List and function values of the
+Interpreter and builds them with the same positions and contexts, so it produces the
+same values, output and errors: a runtime error raises an Unwind holding the
+RunTimeError of the SARDS node that failed. Operations on Numbers are computed
+inline, without materializing the copies of their variable and literal operands;
+`when`, `Cycle` and `whenever` become Python `if` and `while` statements, and an
+`escape` or `proceed` in a loop of the method becomes `break` or `continue`. Nodes
+without a translation (menus, method definitions, node classes installed with
+Interpreter.register) are evaluated by the Interpreter from the generated code, and
+a body CPython cannot compile (one nested too deeply) keeps running in the
+Interpreter.
+
+Classes:
+- PythonTranspiler: Translates a method body into the source of a Python function.
+- MethodProfile: Counts the calls of a method and holds its transpiled body.
+
+Functions:
+- transpile(name, body_node, auto_return): Compiles a method body into a Python function.
+"""
+
+from sards.ast_nodes import VariableUseNode
+from sards.data_types import Number, String, List
+from .bytecode import NUMBER_OPERATIONS
+from .constants import K_MINUS, K_KEYWORD
+from .interpreter import (
+    Interpreter, RunTimeResult, Unwind, BINARY_OPERATIONS, failure, binary_operation
+)
+from .parser import NumberNode
+from .vm import new_object, undefined, call
+
+# Calls of a method after which its body is transpiled (0 never transpiles).
+HOT_CALL_THRESHOLD = 100
+
+# Python expressions of the NUMBER_OPERATIONS, on the values of two Numbers.
+NUMBER_EXPRESSIONS = {
+    'add': '{} + {}',
+    'subtract': '{} - {}',
+    'multiply': '{} * {}',
+    'divide': '{} / {}',
+    'modulus': '{} % {}',
+    'floor_divide': '{} // {}',
+    'exponent': '{} ** {}',
+    'get_comparison_eq': '{} == {}',
+    'get_comparison_neq': '{} != {}',
+    'get_comparison_lt': '{} < {}',
+    'get_comparison_lte': '{} <= {}',
+    'get_comparison_gt': '{} > {}',
+    'get_comparison_gte': '{} >= {}',
+    'and_by': '{} != 0 and {} != 0',
+    'or_by': '{} != 0 or {} != 0',
+}
+
+# Methods whose Python expression is a truth value, stored in a Number as an int.
+TRUTH_METHODS = frozenset((
+    'get_comparison_eq', 'get_comparison_neq', 'get_comparison_lt', 'get_comparison_lte',
+    'get_comparison_gt', 'get_comparison_gte', 'and_by', 'or_by'
+))
+
+
+def evaluate(node, context):
+    """Evaluates a node without a translation with the Interpreter."""
+    return Interpreter().evaluate(node, context)
+
+
+def negate(value, pos_start, pos_end):
+    """Applies a unary minus as Interpreter.visit_UnaryOperationNode does."""
+    result, error = value.multiply(Number(-1))
+    if error:
+        raise failure(error)
+    return result.set_pos(pos_start, pos_end)
+
+
+def negation(value, pos_start, pos_end):
+    """Applies a `not` as Interpreter.visit_UnaryOperationNode does."""
+    result, error = value.not_by()
+    if error:
+        raise failure(error)
+    return result.set_pos(pos_start, pos_end)
+
+
+# The names the generated code is run with, besides its constants.
+RUNTIME = {
+    'Number': Number, 'String': String, 'List': List, 'Unwind': Unwind,
+    'RunTimeResult': RunTimeResult, 'new_object': new_object, 'undefined': undefined,
+    'binary_operation': binary_operation, 'evaluate': evaluate,
+    'call': call, 'negate': negate, 'negation': negation,
+    'is_invariant': Interpreter.is_invariant,
+}
+
+
+class PythonTranspiler:
+    """
+    Translates a method body into the source of a Python function.
+
+    The function takes the execution context of a call and returns, as the VM's `run`
+    does, the value of the body (None if the method does not return it) and None, or
+    None and the RunTimeResult of the error or jump that ended it.
+
+    Every node is translated into statements storing its value in a local variable:
+    `value` dispatches on the node's class name to a `value_<ClassName>` method, and
+    falls back to evaluating the node with the Interpreter. Objects the code refers
+    to (positions, nodes, value-method tables) are passed to it as constants.
+
+    Attributes:
+    - lines (list): The lines of source generated so far.
+    - namespace (dict): The globals of the generated function.
+
+    Methods:
+    - source(body_node, auto_return): Returns the source of the function.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = dict(RUNTIME)
+        self.names = {}
+        self.depth = 0
+        self.temps = 0
+        # Whether an `escape` or `proceed` can be a Python break or continue: only in
+        # the body of a loop of the method. Elsewhere it is raised.
+        self.in_loop = False
+
+    def source(self, body_node, auto_return):
+        """
+        Translates a method body.
+
+        Parameters:
+        - body_node (AST Node): The body of the method.
+        - auto_return (bool): Whether the method returns the value of its body.
+
+        Returns:
+        - str: The source of a function named `body`.
+        """
+        self.emit('def body(context):')
+        self.depth += 1
+        self.emit('symbol_table = context.symbol_table')
+        self.emit('symbols = symbol_table.symbols')
+        self.emit('slots = symbol_table.slots')
+        self.emit('try:')
+        self.depth += 1
+        if auto_return:
+            self.emit(f'return {self.value(body_node)}, None')
+        else:
+            self.discard(body_node)
+            self.emit('return None, None')
+        self.depth -= 1
+        self.emit('except Unwind as unwind:')
+        self.emit('    return None, unwind.result')
+        return '\n'.join(self.lines) + '\n'
+
+    def emit(self, line):
+        """Adds a line of source at the current indentation."""
+        self.lines.append('    ' * self.depth + line)
+
+    def constant(self, value):
+        """Returns the name of a global of the generated code holding `value`."""
+        name = self.names.get(id(value))
+        if name is None:
+            name = self.names[id(value)] = f'c{len(self.names)}'
+            self.namespace[name] = value
+        return name
+
+    def temp(self):
+        """Returns the name of a new local variable."""
+        self.temps += 1
+        return f't{self.temps}'
+
+    def number(self, target, value, pos_start, pos_end, context):
+        """Emits the statements building a Number in `target`, as Number(value) would."""
+        self.emit(f'{target} = new_object(Number)')
+        self.emit(f'{target}.value = {value}')
+        self.emit(f'{target}.pos_start = {pos_start}')
+        self.emit(f'{target}.pos_end = {pos_end}')
+        self.emit(f'{target}.context = {context}')
+
+    def positions(self, node):
+        """Returns the names of the constants holding the positions of a node."""
+        return self.constant(node.pos_start), self.constant(node.pos_end)
+
+    def value(self, node):
+        """
+        Emits the statements evaluating a node.
+
+        Returns:
+        - str: The local variable holding its value.
+        """
+        method = getattr(self, f'value_{type(node).__name__}', None)
+        if method is None:
+            target = self.temp()
+            self.emit(f'{target} = evaluate({self.constant(node)}, context)')
+            return target
+        return method(node)
+
+    def discard(self, node):
+        """Emits the statements evaluating a node whose value is not used."""
+        kind, length = type(node).__name__, len(self.lines)
+        if kind == 'ListNode':
+            for element in node.element_nodes:
+                self.discard(element)
+        elif kind in ('IfNode', 'ForNode', 'WhileNode', 'LoopInvariantsNode'):
+            getattr(self, f'value_{kind}')(node, None)
+        else:
+            self.value(node)
+        if len(self.lines) == length:
+            self.emit('pass')
+
+    def condition(self, node):
+        """
+        Emits the statements evaluating a condition.
+
+        Returns:
+        - str: A Python expression true if the value of the node is.
+        """
+        if (type(node).__name__ == 'BinaryOperationNode' and
+                node.method_name in NUMBER_EXPRESSIONS):
+            return self.binary(node, True)
+        return f'{self.value(node)}.is_true()'
+
+    def read(self, node):
+        """Emits the statements reading a variable, uncopied, into a new local variable."""
+        target, name = self.temp(), repr(node.var_name_tok.value)
+        if node.frame_slot is None:
+            self.emit(f'{target} = symbol_table.get({name})')
+        else:
+            self.emit(f'{target} = slots[{node.frame_slot}]')
+            self.emit(f'if {target} is None:')
+            self.emit(f'    {target} = symbol_table.parent.get({name})')
+        self.emit(f'if {target} is None:')
+        self.emit(f'    raise undefined({name}, {", ".join(self.positions(node))}, context)')
+        return target
+
+    def materialize(self, raw, node):
+        """
+        Emits the statements copying a value read by `read`, as a variable read does.
+
+        Returns:
+        - str: The local variable holding the copy.
+        """
+        target, (pos_start, pos_end) = self.temp(), self.positions(node)
+        self.emit(f'if type({raw}) is Number:')
+        self.depth += 1
+        self.number(target, f'{raw}.value', pos_start, pos_end, 'context')
+        self.depth -= 1
+        self.emit('else:')
+        self.emit(f'    {target} = {raw}.copy().set_pos({pos_start}, {pos_end})'
+                  '.set_context(context)')
+        return target
+
+    def value_NumberNode(self, node): # pylint: disable=C0103
+        """Translates a number literal."""
+        target = self.temp()
+        self.number(target, repr(node.token.value), *self.positions(node), 'context')
+        return target
+
+    def value_StringNode(self, node): # pylint: disable=C0103
+        """Translates a string literal."""
+        target = self.temp()
+        self.emit(f'{target} = String({self.constant(node.token.value)})'
+                  f'.set_context(context).set_pos({", ".join(self.positions(node))})')
+        return target
+
+    def value_ListNode(self, node): # pylint: disable=C0103
+        """Translates a list literal or a block whose value is used."""
+        elements = [self.value(element) for element in node.element_nodes]
+        target = self.temp()
+        self.emit(f'{target} = List([{", ".join(elements)}]).set_context(context)'
+                  f'.set_pos({", ".join(self.positions(node))})')
+        return target
+
+    def value_VariableUseNode(self, node): # pylint: disable=C0103
+        """Translates a variable read."""
+        return self.materialize(self.read(node), node)
+
+    def value_VariableAssignNode(self, node): # pylint: disable=C0103
+        """Translates a variable assignment."""
+        value = self.value(node.value_node)
+        self.store(node, value)
+        return value
+
+    def store(self, node, value):
+        """Emits the statement setting the variable of an assignment or a loop."""
+        if node.frame_slot is None:
+            self.emit(f'symbol_table.set({node.var_name_tok.value!r}, {value})')
+        else:
+            self.emit(f'slots[{node.frame_slot}] = {value}')
+
+    def value_BinaryOperationNode(self, node): # pylint: disable=C0103
+        """Translates a binary operation."""
+        if node.method_name in NUMBER_EXPRESSIONS:
+            return self.binary(node, False)
+        left, right = self.value(node.left_node), self.value(node.right_node)
+        target = self.temp()
+        self.emit(f'{target} = binary_operation({left}, {right}, {node.method_name!r}, '
+                  f'{self.constant(BINARY_OPERATIONS[node.method_name])}, '
+                  f'{", ".join(self.positions(node))})')
+        return target
+
+    def operand(self, node, uncopied):
+        """
+        Emits the statements evaluating an operand of a binary operation.
+
+        Returns:
+        - tuple: The kind of the operand ('literal' for a number literal, not built
+            yet; 'variable' for a variable read uncopied, if `uncopied`; otherwise
+            'value') and the Python expression of its value.
+        """
+        if isinstance(node, NumberNode):
+            return 'literal', repr(node.token.value)
+        if uncopied and isinstance(node, VariableUseNode):
+            return 'variable', self.read(node)
+        return 'value', self.value(node)
+
+    def binary(self, node, truth):
+        """
+        Translates an operation with a NUMBER_EXPRESSIONS entry, computed inline when
+        both operands are Numbers.
+
+        A variable operand is only read uncopied when nothing runs between the read
+        and the operation, and a literal only built if the operation is not inline.
+
+        Parameters:
+        - node (BinaryOperationNode): The operation.
+        - truth (bool): Whether only the truth of the result is used, as a condition.
+
+        Returns:
+        - str: The local variable holding the result, or a Python expression of its
+            truth if `truth`.
+        """
+        left_node, right_node, method_name = node.left_node, node.right_node, node.method_name
+        simple_right = isinstance(right_node, (NumberNode, VariableUseNode))
+        left_kind, left = self.operand(left_node, simple_right)
+        right_kind, right = self.operand(right_node, True)
+        zero_checked = NUMBER_OPERATIONS[method_name][1]
+
+        checks = [f'type({operand}) is Number' for kind, operand in
+                  ((left_kind, left), (right_kind, right)) if kind != 'literal']
+        right_value = right if right_kind == 'literal' else f'{right}.value'
+        if zero_checked and right_kind != 'literal':
+            checks.append(f'{right_value} != 0')
+        inline = not (zero_checked and right_kind == 'literal' and right_node.token.value == 0)
+
+        target = self.temp()
+        expression = NUMBER_EXPRESSIONS[method_name].format(
+            left if left_kind == 'literal' else f'{left}.value', right_value)
+        if inline and checks:
+            self.emit(f'if {" and ".join(checks)}:')
+        if inline:
+            self.depth += 1 if checks else 0
+            if truth:
+                self.emit(f'{target} = {expression}' if method_name in TRUTH_METHODS else
+                          f'{target} = ({expression}) != 0')
+            else:
+                self.number(target, f'int({expression})' if method_name in TRUTH_METHODS
+                            else expression, *self.positions(node),
+                            f'{left}.context' if left_kind == 'value' else 'context')
+            self.depth -= 1 if checks else 0
+            if not checks:
+                return target
+            self.emit('else:')
+            self.depth += 1
+
+        left, right = (self.materialize(operand, operand_node) if kind == 'variable' else
+                       self.value_NumberNode(operand_node) if kind == 'literal' else operand
+                       for kind, operand, operand_node in ((left_kind, left, left_node),
+                                                           (right_kind, right, right_node)))
+        self.emit(f'{target} = binary_operation({left}, {right}, {method_name!r}, '
+                  f'{self.constant(BINARY_OPERATIONS[method_name])}, '
+                  f'{", ".join(self.positions(node))})')
+        if truth:
+            self.emit(f'{target} = {target}.is_true()')
+        self.depth -= 1 if inline else 0
+        return target
+
+    def value_UnaryOperationNode(self, node): # pylint: disable=C0103
+        """Translates a unary operation."""
+        value = self.value(node.node)
+        pos_start, pos_end = self.positions(node)
+        if node.operator.kind == K_MINUS:
+            expression, helper = f'{value}.value * -1', 'negate'
+        elif node.operator.kind == K_KEYWORD and node.operator.value == 'not':
+            expression, helper = f'int(not {value}.value)', 'negation'
+        else:
+            self.emit(f'{value}.set_pos({pos_start}, {pos_end})')
+            return value
+        target = self.temp()
+        self.emit(f'if type({value}) is Number:')
+        self.depth += 1
+        self.number(target, expression, pos_start, pos_end, f'{value}.context')
+        self.depth -= 1
+        self.emit('else:')
+        self.emit(f'    {target} = {helper}({value}, {pos_start}, {pos_end})')
+        return target
+
+    def value_TernaryOperationNode(self, node): # pylint: disable=C0103
+        """Translates a ternary operation."""
+        target, positions = self.temp(), ', '.join(self.positions(node))
+        self.emit(f'if {self.condition(node.comp_node)}:')
+        for branch in (node.true_node, node.false_node):
+            self.depth += 1
+            self.emit(f'{target} = {self.value(branch)}.set_pos({positions})')
+            self.depth -= 1
+            if branch is node.true_node:
+                self.emit('else:')
+        return target
+
+    def arm(self, expression, return_null, target):
+        """Translates an arm of a `when` chain, storing its value in `target` if any."""
+        if target is None:
+            self.discard(expression)
+        elif return_null:
+            self.discard(expression)
+            self.emit(f'{target} = Number(0)')
+        else:
+            self.emit(f'{target} = {self.value(expression)}')
+
+    def value_IfNode(self, node, target=''): # pylint: disable=C0103
+        """Translates a when/orwhen/otherwise chain, keeping its value unless `target` is None."""
+        target = self.temp() if target == '' else target
+        depth = self.depth
+        for condition, expression, return_null in node.cases:
+            self.emit(f'if {self.condition(condition)}:')
+            self.depth += 1
+            self.arm(expression, return_null, target)
+            self.depth -= 1
+            self.emit('else:')
+            self.depth += 1
+        if node.else_case:
+            self.arm(*node.else_case, target)
+        elif target is not None:
+            self.emit(f'{target} = Number(0)')
+        else:
+            self.emit('pass')
+        self.depth = depth
+        return target
+
+    def loop_body(self, node, elements):
+        """
+        Translates the body of a loop, appending its values to `elements` if any.
+
+        A jump coming out of a method called, or a node evaluated, in the body ends the
+        iteration or the loop, as the Interpreter's loops handle it.
+        """
+        in_loop, self.in_loop = self.in_loop, True
+        self.emit('try:')
+        self.depth += 1
+        if elements is None:
+            self.discard(node.body_node)
+        else:
+            self.emit(f'{elements}.append({self.value(node.body_node)})')
+        self.depth -= 1
+        self.emit('except Unwind as unwind:')
+        self.emit('    if unwind.result.loop_continue:')
+        self.emit('        continue')
+        self.emit('    if unwind.result.loop_or_switch_break:')
+        self.emit('        break')
+        self.emit('    raise')
+        self.depth -= 1
+        self.in_loop = in_loop
+
+    def loop_result(self, node, target, elements):
+        """Stores the value of a loop in `target`: 0, or the List of its values."""
+        if target is None:
+            return
+        if node.return_null:
+            self.emit(f'{target} = Number(0)')
+        else:
+            self.emit(f'{target} = List({elements}).set_context(context)'
+                      f'.set_pos({", ".join(self.positions(node))})')
+
+    def value_ForNode(self, node, target=''): # pylint: disable=C0103
+        """Translates a Cycle loop, keeping its value unless `target` is None."""
+        target = self.temp() if target == '' else target
+        elements = self.temp() if target is not None and not node.return_null else None
+        start = self.value(node.start_value_node)
+        end = self.value(node.end_value_node)
+        step = self.value(node.step_value_node) if node.step_value_node else None
+        i, number = self.temp(), self.temp()
+        if elements:
+            self.emit(f'{elements} = []')
+        self.emit(f'{i} = {start}.value')
+        if step is None:
+            self.emit(f'while {i} <= {end}.value:')
+        else:
+            ascending = self.temp()
+            self.emit(f'{ascending} = {step}.value >= 0')
+            self.emit(f'while ({i} <= {end}.value) if {ascending} else ({i} >= {end}.value):')
+        self.depth += 1
+        self.number(number, i, 'None', 'None', 'None')
+        self.store(node, number)
+        self.emit(f'{i} += 1' if step is None else f'{i} += {step}.value')
+        self.loop_body(node, elements)
+        self.loop_result(node, target, elements)
+        return target
+
+    def value_WhileNode(self, node, target=''): # pylint: disable=C0103
+        """Translates a whenever loop, keeping its value unless `target` is None."""
+        target = self.temp() if target == '' else target
+        elements = self.temp() if target is not None and not node.return_null else None
+        if elements:
+            self.emit(f'{elements} = []')
+        self.emit('while True:')
+        self.depth += 1
+        # The Interpreter evaluates the condition outside of the loop: a jump in it
+        # is not the loop's.
+        in_loop, self.in_loop = self.in_loop, False
+        self.emit(f'if not ({self.condition(node.condition_node)}):')
+        self.in_loop = in_loop
+        self.emit('    break')
+        self.loop_body(node, elements)
+        self.loop_result(node, target, elements)
+        return target
+
+    def value_FunctionCallNode(self, node): # pylint: disable=C0103
+        """Translates a call."""
+        # The call leaves the callee as it is, so a variable is read without a copy.
+        if isinstance(node.call_node, VariableUseNode):
+            function = self.read(node.call_node)
+        else:
+            function = self.value(node.call_node)
+        args = [self.value(arg_node) for arg_node in node.arg_nodes]
+        target = self.temp()
+        self.emit(f'{target} = call({function}, [{", ".join(args)}], '
+                  f'{", ".join(self.positions(node))}, context)')
+        return target
+
+    def value_ReturnNode(self, node): # pylint: disable=C0103
+        """Translates a yield."""
+        value = self.value(node.node_to_return) if node.node_to_return else 'Number(0)'
+        self.emit(f'return None, RunTimeResult().success_return({value})')
+        return 'None'
+
+    def value_ContinueNode(self, node): # pylint: disable=C0103,W0613
+        """Translates a proceed."""
+        self.emit('continue' if self.in_loop else
+                  'raise Unwind(RunTimeResult().success_continue())')
+        return 'None'
+
+    def value_BreakNode(self, node): # pylint: disable=C0103,W0613
+        """Translates an escape."""
+        self.emit('break' if self.in_loop else 'raise Unwind(RunTimeResult().success_break())')
+        return 'None'
+
+    def value_LoopInvariantsNode(self, node, target=''): # pylint: disable=C0103
+        """Translates a loop holding hoisted expressions (see LoopInvariantHoister)."""
+        slots = self.constant(node.slots)
+        self.emit(f'for slot in {slots}:')
+        self.emit('    symbols.pop(slot, None)')
+        self.emit('try:')
+        self.depth += 1
+        if target is None:
+            self.discard(node.loop_node)
+        else:
+            target = self.value(node.loop_node)
+        self.depth -= 1
+        self.emit('finally:')
+        self.emit(f'    for slot in {slots}:')
+        self.emit('        symbols.pop(slot, None)')
+        return target
+
+    def value_HoistedNode(self, node): # pylint: disable=C0103
+        """Translates a loop-invariant expression (see Interpreter.visit_HoistedNode)."""
+        target = self.temp()
+        self.emit(f'{target} = symbols.get({node.slot!r})')
+        self.emit(f'if {target} is not None:')
+        self.emit(f'    {target} = {target}.copy()')
+        self.emit('else:')
+        self.depth += 1
+        self.emit(f'{target} = {self.value(node.expression_node)}')
+        self.emit(f'if is_invariant({self.constant(node)}, {target}, context):')
+        self.emit(f'    symbols[{node.slot!r}] = {target}.copy()')
+        self.depth -= 1
+        return target
+
+
+def transpile(name, body_node, auto_return):
+    """
+    Compiles a method body into a Python function (see PythonTranspiler).
+
+    Parameters:
+    - name (str): The name of the method, for tracebacks.
+    - body_node (AST Node): The body of the method.
+    - auto_return (bool): Whether the method returns the value of its body.
+
+    Returns:
+    - function: The compiled body, or None if CPython cannot compile its source.
+    """
+    transpiler = PythonTranspiler()
+    try:
+        code = compile(transpiler.source(body_node, auto_return), f'<method {name}>', 'exec')
+    except (SyntaxError, RecursionError, MemoryError):
+        return None
+    exec(code, transpiler.namespace) # pylint: disable=W0122
+    return transpiler.namespace['body']
+
+
+class MethodProfile: # pylint: disable=R0903
+    """
+    Counts the calls of a method, shared by the copies of its Function.
+
+    Attributes:
+    - calls (int): The calls counted so far.
+    - body (function): The transpiled body, once the method is hot.
+    - failed (bool): Whether the body could not be transpiled.
+
+    Methods:
+    - hot_body(function): Counts a call and returns the body to run it with.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.body = None
+        self.failed = False
+
+    def hot_body(self, function):
+        """
+        Counts a call of the method, transpiling its body once it reaches
+        HOT_CALL_THRESHOLD calls.
+
+        Parameters:
+        - function (Function): The method called.
+
+        Returns:
+        - function: The transpiled body, or None to run the call in the Interpreter.
+        """
+        if self.body is not None or self.failed:
+            return self.body
+        self.calls += 1
+        if not HOT_CALL_THRESHOLD or self.calls < HOT_CALL_THRESHOLD:
+            return None
+        self.body = transpile(function.name, function.body_node, function.auto_return)
+        self.failed = self.body is None
+        return self.body
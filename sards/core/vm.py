@@ -0,0 +1,513 @@
+"""
+Module: vm
+
+This module implements the stack virtual machine running the bytecode compiled by
+BytecodeCompiler (see bytecode.py), an alternative to the tree-walking Interpreter.
+
+The VM runs one CodeObject per call of `run`, in a single dispatch loop over its
+instructions, with a value stack and a block stack. Values are the Number, String,
+List and function types the Interpreter uses; methods defined in bytecode are
+BytecodeFunctions, whose bodies run in a nested call of `run`, and any function can
+be called from either engine.
+
+A runtime error, `escape` or `proceed` unwinds the block stack, as the Interpreter
+hands its RunTimeResult up the tree: loops catch `escape` and `proceed`, menus catch
+`escape`, and the blocks of hoisted loops drop their cached values. What no block
+catches ends the code object and is handed to its caller, so jumps out of a method
+reach the loops around the call, like in the Interpreter. A `yield` ends the code
+object directly.
+
+A call of a BytecodeFunction runs in a MethodScope. Like a Frame (see
+sards.core.resolver), it only holds names some method binds, so a name no method
+binds is looked up in the global scope directly, however deep the calls.
+
+Classes:
+- MethodScope: The variables of a call of a BytecodeFunction.
+- BytecodeProgram: A syntax tree compiled to bytecode, run like Interpreter.visit.
+
+Functions:
+- run(code_object, context): Runs a CodeObject.
+- call(function, args, pos_start, pos_end, context): Calls a function from compiled code.
+"""
+
+from sards.ast_nodes import ReturnNode, ContinueNode, BreakNode, SymbolTable
+from sards.data_types import Number, String, List
+from .bytecode import (
+    BytecodeCompiler, BINARY, BINARY_NUMBER, BINARY_NAME_NAME, LOAD_NAME, LOAD_NUMBER,
+    STORE_POP, POP_JUMP_IF_FALSE, JUMP, FOR_ITER, CALL, RETURN_VALUE, LIST_APPEND, POP_TOP,
+    STORE_NAME, LOAD_STRING, LOAD_ZERO, BUILD_LIST, HOISTED_LOAD, HOISTED_STORE, SET_POS,
+    UNARY_NEGATE, UNARY_NOT, MENU_ARM, MENU_MATCH, MENU_DEFAULT, SETUP_LOOP, POP_BLOCK,
+    FOR_SETUP, BUILD_RESULT, NEW_ACCUMULATOR, SETUP_SLOTS, POP_SLOTS, BREAK_LOOP,
+    CONTINUE_LOOP, MAKE_FUNCTION, EVAL_NODE, END
+)
+from .error import RunTimeError
+from .interpreter import (
+    Interpreter, RunTimeResult, Unwind, registered, failure, binary_operation
+)
+from .resolver import BOUND_NAMES, Frame
+
+# Kinds of blocks on the block stack.
+LOOP_BLOCK, MENU_BLOCK, SLOTS_BLOCK = range(3)
+
+new_object = object.__new__
+
+
+def undefined(name, pos_start, pos_end, context):
+    """Returns an Unwind for a read of an undefined variable."""
+    return failure(RunTimeError(pos_start, pos_end, f"'{name}' is not defined", context))
+
+
+class MethodScope(SymbolTable): # pylint: disable=R0903
+    """
+    The variables of a call of a BytecodeFunction.
+
+    The BytecodeCompiler resolves every method body it compiles, which records the
+    names the method binds in BOUND_NAMES, so a MethodScope never holds any other name.
+
+    Attributes:
+    - globals (SymbolTable): The first scope up the calls that is not a method's.
+    """
+
+    def __init__(self, parent, symbols):
+        """
+        Initializes a MethodScope.
+
+        Parameters:
+        - parent (SymbolTable): The scope of the caller.
+        - symbols (dict): The arguments of the call, by parameter name.
+        """
+        super().__init__(parent)
+        self.symbols = symbols
+        self.globals = parent.globals if isinstance(parent, (MethodScope, Frame)) else parent
+
+
+def lookup(symbol_table, name):
+    """Reads a variable as SymbolTable.get does, walking up the scopes in a loop."""
+    if name not in BOUND_NAMES and isinstance(symbol_table, MethodScope):
+        # No method's scope up the calls can hold it.
+        symbol_table = symbol_table.globals
+    while True:
+        value = symbol_table.symbols.get(name)
+        if value is not None or not symbol_table.parent:
+            return value
+        symbol_table = symbol_table.parent
+
+
+def call(function, args, pos_start, pos_end, context): # pylint: disable=R0913
+    """
+    Calls a function as Interpreter.visit_FunctionCallNode does.
+
+    Parameters:
+    - function (BaseFunction): The callee, which the call leaves as it is.
+    - args (list): The arguments.
+    - pos_start, pos_end (Position): The position of the call.
+    - context (Context): The context of the call.
+
+    Returns:
+    - any: The value the function returned, copied at the call.
+
+    Raises:
+    - Unwind: For the runtime error or jump that ended the call.
+    """
+    result = function.execute(args, pos_start, pos_end, context)
+    if result.should_return():
+        raise Unwind(registered(result))
+    value = result.value
+    if type(value) is Number: # pylint: disable=C0123
+        number = new_object(Number)
+        number.value = value.value
+        number.pos_start = pos_start
+        number.pos_end = pos_end
+        number.context = context
+        return number
+    return value.copy().set_pos(pos_start, pos_end).set_context(context)
+
+
+def unwind_blocks(result, stack, blocks, symbols, pc):
+    """
+    Unwinds the block stack for the result of a runtime error or jump.
+
+    Blocks are popped, and the value stack cut back to their depth, until one catches
+    the result: a loop catches `escape` and `proceed`, a menu catches `escape`. The
+    block of a hoisted loop drops the values it cached on the way out. A `whenever`
+    loop does not catch what its condition raises, which runs outside of the loop
+    in the Interpreter.
+
+    Parameters:
+    - result (RunTimeResult): The result of the error or jump.
+    - stack (list): The value stack.
+    - blocks (list): The block stack.
+    - symbols (dict): The variables of the running scope.
+    - pc (int): The offset following the instruction that raised the result.
+
+    Returns:
+    - int: The offset to continue at, or -1 if no block caught the result.
+    """
+    while blocks:
+        block = blocks[-1]
+        kind, depth = block[0], block[1]
+        del stack[depth:]
+        if kind == LOOP_BLOCK:
+            if block[3] < pc <= block[4]:
+                blocks.pop()
+                continue
+            if result.loop_continue:
+                return block[3]
+            blocks.pop()
+            if result.loop_or_switch_break:
+                return block[2]
+        elif kind == MENU_BLOCK:
+            blocks.pop()
+            if result.loop_or_switch_break:
+                if block[3]:
+                    # The Interpreter records the arm as 0, or as the value (None) of
+                    # the jump.
+                    stack[-1].append(Number(0) if block[4] else None)
+                return block[2]
+        else:
+            blocks.pop()
+            for slot in block[3]:
+                symbols.pop(slot, None)
+    return -1
+
+
+def run(code_object, context): # pylint: disable=R0912,R0914,R0915
+    """
+    Runs a CodeObject.
+
+    Numbers are built attribute by attribute, as Number(value).set_pos(...)
+    .set_context(...) would build them, and an operation between two Numbers with an
+    entry in NUMBER_OPERATIONS is computed without materializing the copies of its
+    variable operands.
+
+    Parameters:
+    - code_object (CodeObject): The compiled program or method body.
+    - context (Context): The execution context.
+
+    Returns:
+    - tuple: The value the code returns (None for a method body that does not return
+        its value) and None, or None and the RunTimeResult of the error or jump that
+        ended it.
+    """
+    code, constants = code_object.code, code_object.constants
+    symbol_table = context.symbol_table
+    symbols = symbol_table.symbols
+    stack, blocks = [], []
+    push, pop = stack.append, stack.pop
+    pc = 0
+
+    while True:
+        try:
+            while True:
+                opcode = code[pc]
+                argument = code[pc + 1]
+                pc += 2
+
+                if opcode == BINARY:
+                    (method_name, operations, function, zero_checked, pos_start,
+                     pos_end) = constants[argument]
+                    right = pop()
+                    left = pop()
+                    if (function is not None and type(left) is Number and # pylint: disable=C0123
+                            type(right) is Number and # pylint: disable=C0123
+                            not (zero_checked and right.value == 0)):
+                        result = new_object(Number)
+                        result.value = function(left.value, right.value)
+                        result.pos_start = pos_start
+                        result.pos_end = pos_end
+                        result.context = left.context
+                        push(result)
+                    else:
+                        push(binary_operation(left, right, method_name, operations, pos_start,
+                                              pos_end))
+
+                elif opcode <= BINARY_NAME_NAME:
+                    (name, name_start, name_end, other, other_start, other_end, method_name,
+                     operations, function, zero_checked, pos_start,
+                     pos_end) = constants[argument]
+                    # Variable operands are read uncopied until they need to be copied.
+                    variable_left = opcode != BINARY_NUMBER
+                    literal_right = opcode != BINARY_NAME_NAME
+                    if variable_left:
+                        left = symbols.get(name)
+                        if left is None:
+                            left = lookup(symbol_table, name)
+                            if left is None:
+                                raise undefined(name, name_start, name_end, context)
+                    else:
+                        left = pop()
+                    if literal_right:
+                        right = None
+                    else:
+                        right = symbols.get(other)
+                        if right is None:
+                            right = lookup(symbol_table, other)
+                            if right is None:
+                                raise undefined(other, other_start, other_end, context)
+
+                    if (function is not None and type(left) is Number and # pylint: disable=C0123
+                            (literal_right or type(right) is Number)): # pylint: disable=C0123
+                        right_value = other if literal_right else right.value
+                        if not (zero_checked and right_value == 0):
+                            result = new_object(Number)
+                            result.value = function(left.value, right_value)
+                            result.pos_start = pos_start
+                            result.pos_end = pos_end
+                            result.context = context if variable_left else left.context
+                            push(result)
+                            continue
+
+                    if variable_left:
+                        left = left.copy().set_pos(name_start, name_end).set_context(context)
+                    if literal_right:
+                        right = (Number(other).set_context(context)
+                                 .set_pos(other_start, other_end))
+                    elif opcode == BINARY_NAME_NAME:
+                        right = right.copy().set_pos(other_start, other_end).set_context(context)
+                    push(binary_operation(left, right, method_name, operations, pos_start,
+                                          pos_end))
+
+                elif opcode == LOAD_NAME:
+                    name, pos_start, pos_end = constants[argument]
+                    value = symbols.get(name)
+                    if value is None:
+                        value = lookup(symbol_table, name)
+                        if value is None:
+                            raise undefined(name, pos_start, pos_end, context)
+                    if type(value) is Number: # pylint: disable=C0123
+                        number = new_object(Number)
+                        number.value = value.value
+                        number.pos_start = pos_start
+                        number.pos_end = pos_end
+                        number.context = context
+                        push(number)
+                    else:
+                        push(value.copy().set_pos(pos_start, pos_end).set_context(context))
+
+                elif opcode == LOAD_NUMBER:
+                    number = new_object(Number)
+                    number.value, number.pos_start, number.pos_end = constants[argument]
+                    number.context = context
+                    push(number)
+
+                elif opcode == STORE_POP:
+                    symbols[constants[argument][0]] = pop()
+
+                elif opcode == HOISTED_LOAD:
+                    slot, skip = constants[argument]
+                    cached = symbols.get(slot)
+                    if cached is not None:
+                        if type(cached) is Number: # pylint: disable=C0123
+                            number = new_object(Number)
+                            number.value = cached.value
+                            number.pos_start = cached.pos_start
+                            number.pos_end = cached.pos_end
+                            number.context = cached.context
+                            push(number)
+                        else:
+                            push(cached.copy())
+                        pc = skip
+
+                elif opcode == POP_JUMP_IF_FALSE:
+                    if not pop().is_true():
+                        pc = argument
+
+                elif opcode == JUMP:
+                    pc = argument
+
+                elif opcode == FOR_ITER:
+                    state = stack[-1]
+                    i = state[0]
+                    if i <= state[1].value if state[3] else i >= state[1].value:
+                        number = new_object(Number)
+                        number.value = i
+                        number.pos_start = number.pos_end = number.context = None
+                        symbols[constants[argument][0]] = number
+                        state[0] = i + state[2].value
+                    else:
+                        pc = constants[argument][1]
+
+                elif opcode == CALL:
+                    count, pos_start, pos_end = constants[argument]
+                    if count:
+                        args = stack[-count:]
+                        del stack[-count:]
+                    else:
+                        args = []
+                    push(call(pop(), args, pos_start, pos_end, context))
+
+                elif opcode == RETURN_VALUE:
+                    for block in blocks:
+                        if block[0] == SLOTS_BLOCK:
+                            for slot in block[3]:
+                                symbols.pop(slot, None)
+                    return None, RunTimeResult().success_return(pop())
+
+                elif opcode == LIST_APPEND:
+                    value = pop()
+                    stack[-argument].append(value)
+
+                elif opcode == POP_TOP:
+                    pop()
+
+                elif opcode == STORE_NAME:
+                    symbols[constants[argument][0]] = stack[-1]
+
+                elif opcode == LOAD_STRING:
+                    value, pos_start, pos_end = constants[argument]
+                    push(String(value).set_context(context).set_pos(pos_start, pos_end))
+
+                elif opcode == LOAD_ZERO:
+                    push(Number(0))
+
+                elif opcode == BUILD_LIST:
+                    count, pos_start, pos_end = constants[argument]
+                    if count:
+                        elements = stack[-count:]
+                        del stack[-count:]
+                    else:
+                        elements = []
+                    push(List(elements).set_context(context).set_pos(pos_start, pos_end))
+
+                elif opcode == HOISTED_STORE:
+                    node = constants[argument][0]
+                    value = stack[-1]
+                    if Interpreter.is_invariant(node, value, context):
+                        symbols[node.slot] = value.copy()
+
+                elif opcode == SET_POS:
+                    stack[-1].set_pos(*constants[argument])
+
+                elif opcode == UNARY_NEGATE:
+                    result, error = pop().multiply(Number(-1))
+                    if error:
+                        raise failure(error)
+                    push(result.set_pos(*constants[argument]))
+
+                elif opcode == UNARY_NOT:
+                    result, error = pop().not_by()
+                    if error:
+                        raise failure(error)
+                    push(result.set_pos(*constants[argument]))
+
+                elif opcode == MENU_ARM:
+                    blocks[-1][4] = argument
+
+                elif opcode == MENU_MATCH:
+                    choice = pop()
+                    if stack[-1].value == choice.value:
+                        pop()
+                        pc, break_offset, accumulate = constants[argument]
+                        blocks.append([MENU_BLOCK, len(stack), break_offset, accumulate, 0])
+
+                elif opcode == MENU_DEFAULT:
+                    pop()
+                    pc, break_offset, accumulate = constants[argument]
+                    blocks.append([MENU_BLOCK, len(stack), break_offset, accumulate, 0])
+
+                elif opcode == SETUP_LOOP:
+                    break_offset, continue_offset, condition_end = constants[argument]
+                    blocks.append([LOOP_BLOCK, len(stack), break_offset, continue_offset,
+                                   condition_end])
+
+                elif opcode == POP_BLOCK:
+                    blocks.pop()
+
+                elif opcode == FOR_SETUP:
+                    step_value = pop() if constants[argument][0] else Number(1)
+                    end_value = pop()
+                    i = pop().value
+                    push([i, end_value, step_value, step_value.value >= 0])
+
+                elif opcode == BUILD_RESULT:
+                    push(List(pop()).set_context(context).set_pos(*constants[argument]))
+
+                elif opcode == NEW_ACCUMULATOR:
+                    push([])
+
+                elif opcode == SETUP_SLOTS:
+                    slots = constants[argument][0]
+                    for slot in slots:
+                        symbols.pop(slot, None)
+                    blocks.append([SLOTS_BLOCK, len(stack), 0, slots])
+
+                elif opcode == POP_SLOTS:
+                    blocks.pop()
+                    for slot in constants[argument][0]:
+                        symbols.pop(slot, None)
+
+                elif opcode == BREAK_LOOP or opcode == CONTINUE_LOOP: # pylint: disable=R1714
+                    result = (RunTimeResult().success_break() if opcode == BREAK_LOOP else
+                              RunTimeResult().success_continue())
+                    pc = unwind_blocks(result, stack, blocks, symbols, pc)
+                    if pc < 0:
+                        return None, result
+
+                elif opcode == MAKE_FUNCTION:
+                    from sards.user_functions import BytecodeFunction
+
+                    (name, body_node, arg_names, auto_return, body_code, pos_start,
+                     pos_end) = constants[argument]
+                    function = (BytecodeFunction(name, body_node, arg_names, auto_return,
+                                                 body_code)
+                                .set_context(context)
+                                .set_pos(pos_start, pos_end))
+                    if name:
+                        symbols[name] = function
+                    push(function)
+
+                elif opcode == EVAL_NODE:
+                    push(Interpreter().evaluate(constants[argument][0], context))
+
+                elif opcode == END:
+                    return (pop() if argument else None), None
+
+                else:
+                    raise ValueError(f'unknown opcode {opcode} at offset {pc - 2}')
+
+        except Unwind as unwind:
+            pc = unwind_blocks(unwind.result, stack, blocks, symbols, pc)
+            if pc < 0:
+                return None, unwind.result
+
+
+class BytecodeProgram: # pylint: disable=R0903
+    """
+    A syntax tree compiled to bytecode by the BytecodeCompiler.
+
+    Attributes:
+    - node (AST Node): The root of the syntax tree.
+    - code_object (CodeObject): Its bytecode.
+
+    Methods:
+    - run(context): Runs the program and returns its RunTimeResult.
+    """
+
+    def __init__(self, node):
+        """
+        Compiles a syntax tree.
+
+        Parameters:
+        - node (AST Node): The root of the tree, as returned by Parser.parse() or
+            optimize().
+        """
+        self.node = node
+        self.code_object = BytecodeCompiler().compile_program(node)
+
+    def run(self, context):
+        """
+        Runs the program, as Interpreter().visit(node, context) would.
+
+        Parameters:
+        - context (Context): The execution context.
+
+        Returns:
+        - RunTimeResult: The result of the program.
+        """
+        value, result = run(self.code_object, context)
+        if result is None:
+            return RunTimeResult().success(value)
+        # The Interpreter hands a jump's own result back unregistered.
+        if isinstance(self.node, (ReturnNode, ContinueNode, BreakNode)):
+            return result
+        return registered(result)
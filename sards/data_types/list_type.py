@@ -1,3 +1,4 @@
+from sards.core.error import RunTimeError
 from .number_type import Number
 from .string_type import String
 
@@ -46,7 +47,7 @@ class List:
                 new_list.elements.pop(operand.value)
                 return new_list, None
             except:
-                return None, RuntimeError(operand.pos_start, operand.pos_end,
+                return None, RunTimeError(operand.pos_start, operand.pos_end,
                                           'Index out of bounds', self.context)
 
     def multiply(self, operand):
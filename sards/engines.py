@@ -0,0 +1,79 @@
+"""
+Module: engines
+
+Runs syntax trees through each of the execution engines, from a fresh global scope:
+the tree-walking Interpreter, the closure compiler (sards.core.compiler), the bytecode
+VM (sards.core.vm) and the Interpreter running methods transpiled to Python
+(sards.core.transpiler). The Interpreter alone never transpiles; the transpiler engine
+transpiles every method on its first call.
+
+The benchmarks and the tests use these to run the same program with every engine.
+
+Functions:
+- parse(text, filename): Lexes and parses a program, raising on any error.
+- fresh_context(): Returns a program context over a fresh global scope.
+- hot_call_threshold(threshold): Sets the transpiler's threshold for a block.
+- run_tree, run_transpiled, run_closure, run_bytecode: Run a tree with one engine.
+"""
+
+import contextlib
+
+from sards.core import (Lexer, Parser, Interpreter, Context, CompiledProgram, BytecodeProgram,
+                        transpiler)
+from sards.ast_nodes import SymbolTable
+from sards.shell import global_symbol_table
+
+
+def parse(text, filename='<program>'):
+    """Lexes and parses the text, raising on any error."""
+    tokens, error = Lexer(filename, text).enumerate_tokens()
+    if error:
+        raise RuntimeError(error.to_string())
+    result = Parser(tokens).parse()
+    if result.error:
+        raise RuntimeError(result.error.to_string())
+    return result.node
+
+
+def fresh_context():
+    """Returns a program context over a fresh global scope holding only the built-ins."""
+    context = Context('<program>')
+    context.symbol_table = SymbolTable(global_symbol_table)
+    return context
+
+
+@contextlib.contextmanager
+def hot_call_threshold(threshold):
+    """Sets the number of calls after which methods are transpiled, for a block."""
+    saved = transpiler.HOT_CALL_THRESHOLD
+    transpiler.HOT_CALL_THRESHOLD = threshold
+    try:
+        yield
+    finally:
+        transpiler.HOT_CALL_THRESHOLD = saved
+
+
+def run_tree(node, context):
+    """Runs a syntax tree with the Interpreter, without transpiling methods."""
+    with hot_call_threshold(0):
+        return Interpreter().visit(node, context)
+
+
+def run_transpiled(node, context):
+    """Runs a syntax tree with the Interpreter, transpiling every method on its first call."""
+    with hot_call_threshold(1):
+        return Interpreter().visit(node, context)
+
+
+def run_closure(node, context):
+    """Compiles a syntax tree with the ClosureCompiler and runs it."""
+    return CompiledProgram(node).run(context)
+
+
+def run_bytecode(node, context):
+    """Compiles a syntax tree with the BytecodeCompiler and runs it on the VM."""
+    return BytecodeProgram(node).run(context)
+
+
+# The engines compared with the Interpreter.
+ENGINES = {'closure': run_closure, 'bytecode': run_bytecode, 'transpiler': run_transpiled}
@@ -37,17 +37,19 @@ global_symbol_table.set("String", BuiltInFunction.String)
 global_symbol_table.set("type", BuiltInFunction.type)
 
 
-def run(filename, input_text):
+def run(filename, input_text, cache=None):
     """
     Executes the lexer and parser on the given input expression.
 
-    This function first tokenizes the input text using the Lexer. If successful,
-    the token list is passed to the Parser, which constructs an Abstract Syntax Tree (AST).
-    Any errors encountered during tokenization or parsing are returned.
+    The Parser constructs an Abstract Syntax Tree (AST) from the tokens of the input
+    text, pulling them from the Lexer as it goes. Any errors encountered during
+    tokenization or parsing are returned.
 
     Parameters:
     - filename (str): The name of the source file (used for error reporting).
     - text (str): The mathematical expression to be analyzed.
+    - cache (ProgramCache, optional): A cache of compiled programs. A cached AST is
+        executed without lexing or parsing, and a freshly parsed one is stored.
 
     Returns:
     - tuple:
@@ -62,43 +64,52 @@ def run(filename, input_text):
     else:
         print(ast)
     """
-    lexer = Lexer(filename, input_text)  # Initialize the Lexer with the input text
-    tokens, error = lexer.enumerate_tokens()  # Generate tokens
+    node = cache.load(filename, input_text) if cache else None
 
-    # If lexical analysis encounters an error, return it
-    if error:
-        return None, error
+    if node is None:
+        lexer = Lexer(filename, input_text)  # Initialize the Lexer with the input text
 
-    # For debugging lexer's output
-    # print(tokens)
+        # The parser pulls the tokens from the lexer as it needs them
+        parser = Parser.from_lexer(lexer)
+        syntax_tree = parser.parse()  # Generate AST
 
-    # Pass the tokens to the parser
-    parser = Parser(tokens)
-    syntax_tree = parser.parse()  # Generate AST
+        # Return any error encountered while lexing or parsing
+        error = lexer.error or syntax_tree.error
+        if error:
+            return None, error
 
-    # Return the parsed AST and any errors encountered
-    if syntax_tree.error:
-        return None, syntax_tree.error
+        # For debugging parser's output
+        # print(syntax_tree.node)
 
-    # For debugging parser's output
-    # print(syntax_tree.node)
+        try:
+            node = optimize(syntax_tree.node)  # Run the optimization passes
+        except RecursionError:
+            # Too deep to optimize; the passes may have rewritten part of the tree.
+            node = Parser.from_lexer(Lexer(filename, input_text)).parse().node
+        if cache:
+            cache.store(input_text, node)
 
     interpreter = Interpreter()
     context = Context('<program>')
     context.symbol_table = global_symbol_table
-    res = interpreter.visit(syntax_tree.node, context)
+    res = interpreter.visit(node, context)
 
     return res.value, res.error
 
 
-# REPL (Read-Eval-Print Loop) for continuous user interaction
-while True:
-    text = input('code > ')  # Prompt user for an expression
-    result, errors = run('<stdin>', text)  # Process input
+def repl():
+    """REPL (Read-Eval-Print Loop) for continuous user interaction."""
+    while True:
+        text = input('code > ')  # Prompt user for an expression
+        result, errors = run('<stdin>', text)  # Process input
+
+        # Print errors if encountered, otherwise display the AST
+        if errors:
+            print(errors)
+            print(errors.to_string())
+        elif result:
+            print(result)
+
 
-    # Print errors if encountered, otherwise display the AST
-    if errors:
-        print(errors)
-        print(errors.to_string())
-    elif result:
-        print(result)
+if __name__ == '__main__':
+    repl()
@@ -1,6 +1,7 @@
 """
 This module initializes the User Functions package.
 """
-from .function_type import Function, BuiltInFunction
+from .function_type import Function, CompiledFunction, BytecodeFunction, BuiltInFunction
 
-__all__ = ["Function", "BuiltInFunction"]
+__all__ = ["Function", "CompiledFunction", "BytecodeFunction",
+           "BuiltInFunction"]
@@ -5,11 +5,15 @@ which represent different types of functions in the abstract syntax tree (AST).
 Classes:
     BaseFunction: A base class for functions in the AST.
     Function: A class to represent user-defined functions in the AST.
+    CompiledFunction: A class to represent user-defined functions compiled to closures.
+    BytecodeFunction: A class to represent user-defined functions compiled to bytecode.
     BuiltInFunction: A class to represent built-in functions in the AST.
 """
 
 from sards.ast_nodes import SymbolTable
-from sards.core import RunTimeResult, RunTimeError, Interpreter
+from sards.core import RunTimeResult, RunTimeError, Interpreter, Unwind, Context, Frame, resolve
+from sards.core.transpiler import MethodProfile
+from sards.core.vm import MethodScope, run
 from sards.data_types import Number, String, List
 
 
@@ -62,20 +66,31 @@ class BaseFunction:
         self.context = context
         return self
 
-    def generate_new_context(self):
-        from sards.core import Context
+    def generate_new_context(self, pos_start, context):
+        """
+        Creates the context of a call, with a scope of its own.
+
+        Args:
+            pos_start: The starting position of the call.
+            context: The context the function is called from.
 
-        new_context = Context(self.name, self.context, self.pos_start)
-        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+        Returns:
+            new_context: The context of the call.
+        """
+        new_context = Context(self.name, context, pos_start)
+        new_context.symbol_table = SymbolTable(context.symbol_table)
         return new_context
 
-    def check_args(self, arg_names, args):
+    def check_args(self, arg_names, args, pos_start, pos_end, context): # pylint: disable=R0913
         """
         Checks the arguments passed to the function.
 
         Args:
             arg_names: A list of argument names.
             args: A list of arguments.
+            pos_start: The starting position of the call.
+            pos_end: The ending position of the call.
+            context: The context the function is called from.
 
         Returns:
             res: The result of the argument check.
@@ -84,45 +99,48 @@ class BaseFunction:
 
         if len(args) > len(arg_names):
             return res.failure(
-                RunTimeError(self.pos_start, self.pos_end,
+                RunTimeError(pos_start, pos_end,
                     f"{len(args) - len(arg_names)} too many args passed into '{self.name}'",
-                    self.context))
+                    context))
 
         if len(args) < len(arg_names):
             return res.failure(
-                RunTimeError(self.pos_start, self.pos_end,
+                RunTimeError(pos_start, pos_end,
                     f"{len(arg_names) - len(args)} too few args passed into '{self.name}'",
-                    self.context))
+                    context))
         return res.success(None)
 
     def populate_args(self, arg_names, args, context):
         """
         Populates the arguments in the function's context.
 
+        The arguments are stored as they are passed: they may be values the caller
+        shares, and a value read from a variable takes the context it is read in.
+
         Args:
             arg_names: A list of argument names.
             args: A list of arguments.
             context: The context to populate.
         """
         for i, arg_value in enumerate(args):
-            arg_name = arg_names[i]
-            arg_value.set_context(context)
-            context.symbol_table.set(arg_name, arg_value)
+            context.symbol_table.set(arg_names[i], arg_value)
 
-    def check_and_populate_args(self, arg_names, args, context):
+    def check_and_populate_args(self, arg_names, args, pos_end, context):
         """
         Checks and populates the arguments in the function's context.
 
         Args:
             arg_names: A list of argument names.
             args: A list of arguments.
-            context: The context to populate.
+            pos_end: The ending position of the call.
+            context: The context to populate, created by generate_new_context.
 
         Returns:
             res: The result of the argument check and population.
         """
         res = RunTimeResult()
-        res.register(self.check_args(arg_names, args))
+        res.register(self.check_args(arg_names, args, context.parent_entry_pos, pos_end,
+                                     context.parent))
         if res.should_return():
             return res
         self.populate_args(arg_names, args, context)
@@ -138,8 +156,11 @@ class Function(BaseFunction):
         arg_names: A list of argument names.
         auto_return: A flag indicating whether the function automatically returns the last
         evaluated expression.
+        profile: The MethodProfile counting the calls of the function and its copies.
+        layout: The FrameLayout of the variables of the function (see sards.core.resolver).
     """
-    def __init__(self, name, body_node, arg_names, auto_return):
+    def __init__(self, name, body_node, arg_names, auto_return, # pylint: disable=R0913
+                 profile=None, layout=None):
         """
         Initializes a Function instance.
 
@@ -149,38 +170,90 @@ class Function(BaseFunction):
             arg_names: A list of argument names.
             auto_return: A flag indicating whether the function automatically returns the last
             evaluated expression.
+            profile: The MethodProfile to share; a new one is created if omitted.
+            layout: The FrameLayout to share; the body is resolved on the first call
+            if omitted.
         """
         super().__init__(name)
         self.body_node = body_node
         self.arg_names = arg_names
         self.auto_return = auto_return
+        self.profile = profile if profile is not None else MethodProfile()
+        self.layout = layout
 
-    def execute(self, args):
+    def execute(self, args, pos_start, pos_end, context):
         """
         Executes the function with the given arguments.
 
+        The call runs in the scope returned by call_scope, and its body is evaluated by
+        run_body; the subclasses compiling the body override these two. The function
+        itself is left as it is: it may be a value the caller shares.
+
         Args:
             args: A list of arguments.
+            pos_start: The starting position of the call.
+            pos_end: The ending position of the call.
+            context: The context the function is called from.
 
         Returns:
             res: The result of the function execution.
         """
         res = RunTimeResult()
-        interpreter = Interpreter()
-        exec_context = self.generate_new_context()
-
-        res.register(self.check_and_populate_args(self.arg_names, args, exec_context))
-        if res.should_return():
+        if len(args) != len(self.arg_names):
+            res.register(self.check_args(self.arg_names, args, pos_start, pos_end, context))
             return res
 
-        value = res.register(interpreter.visit(self.body_node, exec_context))
-        if res.should_return() and res.func_return_value is None:
-            return res
+        exec_context = Context(self.name, context, pos_start)
+        exec_context.symbol_table = self.call_scope(args, context)
+
+        value, result = self.run_body(exec_context)
+        if result is not None:
+            res.register(result)
+            if res.func_return_value is None:
+                return res
 
         return_value = ((value if self.auto_return else None) or
                         res.func_return_value or Number(0))
         return res.success(return_value)
 
+    def call_scope(self, args, context):
+        """
+        Creates the scope of a call: a Frame holding the variables of the function in
+        slots, the arguments first.
+
+        Args:
+            args: A list of arguments.
+            context: The context the function is called from.
+
+        Returns:
+            Frame: The scope of the call.
+        """
+        if self.layout is None:
+            self.layout = resolve(self.arg_names, self.body_node)
+        return Frame(self.layout, context.symbol_table, args)
+
+    def run_body(self, exec_context):
+        """
+        Evaluates the body of the function for a call.
+
+        Once the function is hot (see sards.core.transpiler), its body runs as the
+        Python function it was transpiled into instead of in the Interpreter.
+
+        Args:
+            exec_context: The context of the call.
+
+        Returns:
+            tuple: The value of the body and None, or None and the RunTimeResult of the
+            error or jump that ended it.
+        """
+        body = self.profile.hot_body(self)
+        if body is not None:
+            return body(exec_context)
+        try:
+            return Interpreter().evaluate(self.body_node, exec_context), None
+        except Unwind as unwind:
+            return None, unwind.result
+
     def copy(self):
         """
         Creates a copy of the function.
@@ -188,7 +261,8 @@ class Function(BaseFunction):
         Returns:
             copy: The copy of the function.
         """
-        copy = Function(self.name, self.body_node, self.arg_names, self.auto_return)
+        copy = Function(self.name, self.body_node, self.arg_names, self.auto_return,
+                        self.profile, self.layout)
         copy.set_context(self.context)
         copy.set_pos(self.pos_start, self.pos_end)
         return copy
@@ -203,6 +277,124 @@ class Function(BaseFunction):
         return f"<function {self.name}>"
 
 
+class CompiledFunction(Function):
+    """
+    Represents a user-defined function whose body was compiled by the ClosureCompiler.
+
+    Attributes:
+        body: The closure evaluating the body of the function.
+    """
+    def __init__(self, name, body_node, arg_names, auto_return, body, # pylint: disable=R0913
+                 layout=None):
+        """
+        Initializes a CompiledFunction instance.
+
+        Args:
+            name: The name of the function.
+            body_node: The node representing the body of the function.
+            arg_names: A list of argument names.
+            auto_return: A flag indicating whether the function automatically returns the last
+            evaluated expression.
+            body: The closure compiled from body_node.
+            layout: The FrameLayout to share; the body is resolved on the first call
+            if omitted.
+        """
+        super().__init__(name, body_node, arg_names, auto_return, layout=layout)
+        self.body = body
+
+    def run_body(self, exec_context):
+        """
+        Evaluates the body of the function for a call with its closure.
+
+        Args:
+            exec_context: The context of the call.
+
+        Returns:
+            tuple: The value of the body and None, or None and the RunTimeResult of the
+            error or jump that ended it.
+        """
+        try:
+            return self.body(exec_context), None
+        except Unwind as unwind:
+            return None, unwind.result
+
+    def copy(self):
+        """
+        Creates a copy of the function.
+
+        Returns:
+            copy: The copy of the function.
+        """
+        copy = CompiledFunction(self.name, self.body_node, self.arg_names, self.auto_return,
+                                self.body, self.layout)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
+class BytecodeFunction(Function):
+    """
+    Represents a user-defined function whose body was compiled by the BytecodeCompiler.
+
+    Attributes:
+        code: The CodeObject of the body of the function.
+    """
+    def __init__(self, name, body_node, arg_names, auto_return, code): # pylint: disable=R0913
+        """
+        Initializes a BytecodeFunction instance.
+
+        Args:
+            name: The name of the function.
+            body_node: The node representing the body of the function.
+            arg_names: A list of argument names.
+            auto_return: A flag indicating whether the function automatically returns the last
+            evaluated expression.
+            code: The CodeObject compiled from body_node.
+        """
+        super().__init__(name, body_node, arg_names, auto_return)
+        self.code = code
+
+    def call_scope(self, args, context):
+        """
+        Creates the scope of a call: a MethodScope (see sards.core.vm).
+
+        Args:
+            args: A list of arguments.
+            context: The context the function is called from.
+
+        Returns:
+            MethodScope: The scope of the call.
+        """
+        # A repeated parameter takes the last argument, as populate_args does.
+        return MethodScope(context.symbol_table, dict(zip(self.arg_names, args)))
+
+    def run_body(self, exec_context):
+        """
+        Runs the bytecode of the body of the function for a call on the VM.
+
+        Args:
+            exec_context: The context of the call.
+
+        Returns:
+            tuple: The value of the body and None, or None and the RunTimeResult of the
+            error or jump that ended it.
+        """
+        return run(self.code, exec_context)
+
+    def copy(self):
+        """
+        Creates a copy of the function.
+
+        Returns:
+            copy: The copy of the function.
+        """
+        copy = BytecodeFunction(self.name, self.body_node, self.arg_names, self.auto_return,
+                                self.code)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
 class BuiltInFunction(BaseFunction):
     """
     Represents a built-in function in the abstract syntax tree (AST).
@@ -216,23 +408,27 @@ class BuiltInFunction(BaseFunction):
         """
         super().__init__(name)
 
-    def execute(self, args):
+    def execute(self, args, pos_start, pos_end, context):
         """
         Executes the built-in function with the given arguments.
 
         Args:
             args: A list of arguments.
+            pos_start: The starting position of the call.
+            pos_end: The ending position of the call.
+            context: The context the function is called from.
 
         Returns:
             res: The result of the function execution.
         """
         res = RunTimeResult()
-        exec_context = self.generate_new_context()
+        exec_context = self.generate_new_context(pos_start, context)
 
         method_name = f'execute_{self.name}'
         method = getattr(self, method_name, self.no_visit_method)
 
-        res.register(self.check_and_populate_args(method.arg_names, args, exec_context))
+        res.register(self.check_and_populate_args(method.arg_names, args, pos_end,
+                                                  exec_context))
         if res.should_return():
             return res
 
@@ -0,0 +1,3 @@
+"""
+Tests for the SARDS interpreter. Run them with `python -m unittest discover tests`.
+"""
@@ -0,0 +1,109 @@
+"""
+Helpers shared by the tests.
+"""
+
+import contextlib
+import io
+
+from sards.core import Token
+from sards.engines import fresh_context
+
+
+def dump(node):
+    """Describes a syntax tree as nested tuples, so two trees can be compared."""
+    if isinstance(node, (list, tuple)):
+        return tuple(dump(item) for item in node)
+    if isinstance(node, Token):
+        return node.kind, node.value, node.start, node.end
+    if hasattr(node, '__dict__'):
+        return type(node).__name__, tuple((name, dump(value))
+                                          for name, value in sorted(vars(node).items())
+                                          if not name.startswith('pos_'))
+    return node
+
+
+# Programs run by every engine, and with and without the optimization passes. They
+# cover jumps across loops, menus and methods, runtime errors and the quirks of result
+# propagation.
+PROGRAMS = (
+    '1 + 2 * 3 - 4 / 5',
+    '7 // 2; 7 % 3; 2 ** 10; -3; +4; not 0; not 5; 1 and 0; 0 or 3',
+    '1 < 2; 2 <= 2; 3 > 4; 3 >= 3; 1 == 1.0; 1 != 2',
+    '"ab" + "cd"; "ab" * 3; [1, 2] + 3; [1, 2, 3] - 0; [1] * 2; [1, [2]] + [3]',
+    'x = 3; y = x * 2; x > 2 ? y : 0 - y',
+    '1 / 0',
+    'a = 5; b = a % 0',
+    'zz + 1',
+    '"a" - 1',
+    '[1] / 2',
+    'method f(a, b) { a - b }; f(5, 2); f(1)',
+    'method f(a) { a }; f(1, 2, 3)',
+    'method f(n) {; when n < 2 { yield n }; yield f(n - 1) + f(n - 2);}; f(12)',
+    'method f() {; x = 1; yield; x = 2;}; f()',
+    'method f() { 4 }; g = f; h = method (a) { a * 3 }; g() + h(2)',
+    'method f() {; escape;}; Cycle i = 0 : 4 {; show(i); f();}',
+    'method f() {; proceed;}; Cycle i = 0 : 2 {; f(); show(i);}',
+    'method f() { escape }; f()',
+    'yield 5',
+    'escape',
+    'proceed',
+    'x = 1; yield x + 1; x = 2',
+    'Cycle i = 0 : 2 { yield i }',
+    'Cycle i = 0 : 5 {; when i == 1 { proceed }; when i == 4 { escape }; show(i);}',
+    'r = Cycle i = 0 : 5 { i * i }; r',
+    'r = Cycle i = 10 : 0 : -3 { i }; r',
+    'r = Cycle i = 0 : 3 {; i; escape;}; r',
+    'n = 0; r = whenever n < 4 { n = n + 1 }; [n, r]',
+    'n = 0; whenever n < 10 {; n = n + 1; when n % 2 { proceed }; when n > 6 { escape }; '
+    'show(n);}; n',
+    'n = 0; whenever 1 {; n = n + 1; when n == 3 { yield n };}',
+    'method f(n) {; when n > 1 { escape }; 1;}; Cycle j = 0 : 2 {; show(j); n = 0; '
+    'whenever f(n) { n = n + 1 }; show(n);}; 9',
+    'menu 2 {; choice 1 { show(1) }; choice 2 { show(2) }; choice 3 { show(3) };}',
+    'menu 2 {; choice 1 { show(1) }; choice 2 {; show(2); escape;}; choice 3 { show(3) };}',
+    'r = menu 9 {; choice 1 { 10 }; choice 2 { 20 };}; r',
+    'x = 5; r = menu x {; choice 4 { 4 }; choice x {; show("x"); escape;}; choice 6 { 6 };}; r',
+    'Cycle i = 0 : 3 {; menu i {; choice 1 { proceed }; choice 2 { escape };}; show(i);}',
+    'menu 1 {; choice zz { 1 };}',
+    'r = menu 5 {; choice 1 { 1 }; fallback { show(0) }; choice 3 { 3 };}; r',
+    'r = menu 3 {; choice 1 { 1 }; fallback {; escape;}; choice 3 { 3 };}; r',
+    'when 0 { 1 } orwhen 0 { 2 } otherwise { 3 }',
+    'when 1 {; show(1); show(2);}',
+    'x = when 0 { 1 }; x',
+    'a = 2; b = 3; t = 0; Cycle i = 1 : 20 { t = t + a * b + i }; t',
+    'a = 2; t = 0; Cycle i = 1 : 5 {; t = t + a * 2; a = a + 1;}; [a, t]',
+    'Cycle i = 0 : -1 { 1 / u }; 5',
+    'Integer("12") + 1; String(5) + "x"; type(3)',
+    'l = [1]; Cycle i = 0 : 3 { l + 1 }; l',
+    'Integer("x")',
+    'show(listen)',
+    'method f(a) {; method g(b) { a + b }; yield g(10);}; f(1)',
+    'method f(d) { d > 0 ? f(d - 1) + 1 : zz }; f(3)',
+)
+
+
+def outcome(run, node):
+    """
+    Runs a syntax tree and describes everything observable about the run.
+
+    Returns:
+    - tuple: The value, error message and error positions, or the Python exception,
+        followed by the printed output.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            result = run(node, fresh_context())
+            error = result.error
+            if error is not None and not hasattr(error, 'to_string'):
+                described = ('unregistered', repr(error))
+            elif error is not None:
+                described = ('error', error.to_string(), error.pos_start.index,
+                             error.pos_end.index)
+            else:
+                value = result.value
+                described = ('value', repr(value), getattr(value, 'pos_start', None) and (
+                    value.pos_start.index, value.pos_end.index))
+        except Exception as exception: # pylint: disable=W0718
+            described = ('exception', type(exception).__name__)
+    return described, output.getvalue()
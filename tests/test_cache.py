@@ -0,0 +1,64 @@
+"""
+Tests for the on-disk cache of compiled programs.
+"""
+
+import io
+import os
+import pickle
+import tempfile
+import unittest
+import zlib
+
+from sards.core import Lexer, Parser, ProgramCache, SourceFile, optimize
+from sards.core.cache import HEADER, ProgramUnpickler
+
+
+def compile_program(text):
+    """Lexes, parses and optimizes a program."""
+    tokens, _ = Lexer('<test>', text).enumerate_tokens()
+    return optimize(Parser(tokens).parse().node)
+
+
+class ProgramCacheTest(unittest.TestCase):
+    """Stores and loads programs in a temporary cache directory."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache = ProgramCache(self.directory)
+
+    def test_round_trip(self):
+        text = 'method f(n) {; when n < 2 { yield n }; yield f(n - 1) + f(n - 2);}; f(12)'
+        self.assertTrue(self.cache.store(text, compile_program(text)))
+        node = self.cache.load('<test>', text)
+        self.assertIsNotNone(node)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+        self.assertEqual(node.pos_start.source.text, text)
+
+    def test_hostile_entry_is_not_executed(self):
+        marker = os.path.join(self.directory, 'marker')
+        with open(marker, 'w', encoding='utf-8'):
+            pass
+        # Resolves os.remove through the dotted name 'os.remove' of a sards module.
+        payload = (b'csards.core.cache\nos.remove\n(V' + marker.encode() + b'\ntR.')
+        text = 'show(1)'
+        with open(self.cache.path(ProgramCache.key(text)), 'wb') as file:
+            file.write(HEADER + zlib.compress(payload))
+
+        self.assertIsNone(self.cache.load('<test>', text))
+        self.assertTrue(os.path.exists(marker))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_only_program_classes_are_resolved(self):
+        unpickler = ProgramUnpickler(io.BytesIO(), SourceFile('<test>', ''))
+        for module, name in (('sards.core.cache', 'os.system'), ('os', 'system'),
+                             ('sards.core.cache', 'ProgramCache'),
+                             ('sards.core.parser', 'Parser')):
+            with self.subTest(name=f'{module}.{name}'):
+                with self.assertRaises(pickle.UnpicklingError):
+                    unpickler.find_class(module, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""
+Differential tests of the execution engines against the tree-walking Interpreter.
+"""
+
+import unittest
+
+from sards.core import optimize
+from sards.engines import ENGINES, parse, run_tree
+from tests.support import PROGRAMS, outcome
+
+
+class EnginesTest(unittest.TestCase):
+    """Runs PROGRAMS, unoptimized and optimized, through every engine."""
+
+    def check_engines(self, optimized):
+        """Compares every engine with the Interpreter on every program."""
+        for text in PROGRAMS:
+            node = optimize(parse(text)) if optimized else parse(text)
+            expected = outcome(run_tree, node)
+            for engine, run in ENGINES.items():
+                with self.subTest(engine=engine, program=text):
+                    self.assertEqual(outcome(run, node), expected)
+
+    def test_unoptimized_programs(self):
+        self.check_engines(optimized=False)
+
+    def test_optimized_programs(self):
+        self.check_engines(optimized=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
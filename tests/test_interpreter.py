@@ -0,0 +1,139 @@
+"""
+Tests for the Interpreter's table of node handlers.
+"""
+
+import unittest
+
+from sards.core import Interpreter
+from sards.data_types import Number
+from sards.engines import ENGINES, fresh_context, parse, run_tree
+
+
+class DoubleNode: # pylint: disable=R0903
+    """A node class unknown to the Interpreter: the double of a number."""
+
+    def __init__(self, operand_node):
+        self.operand_node = operand_node
+        self.pos_start = operand_node.pos_start
+        self.pos_end = operand_node.pos_end
+
+
+class SubInterpreter(Interpreter):
+    """A subclass of the Interpreter that defines no handlers of its own."""
+
+
+def double(interpreter, node, context):
+    """Evaluates a DoubleNode."""
+    return Number(interpreter.evaluate(node.operand_node, context).value * 2)
+
+
+def triple(interpreter, node, context):
+    """Evaluates a DoubleNode, wrongly."""
+    return Number(interpreter.evaluate(node.operand_node, context).value * 3)
+
+
+def value_of(interpreter_class, node):
+    """Visits a node with a new interpreter of a class and returns its value."""
+    result = interpreter_class().visit(node, fresh_context())
+    if result.error is not None:
+        raise AssertionError(result.error.to_string())
+    return result.value.value
+
+
+class RegisterTest(unittest.TestCase):
+    """Checks Interpreter.register."""
+
+    def setUp(self):
+        self.node = DoubleNode(parse('21').element_nodes[0])
+        self.addCleanup(self.unregister, Interpreter, DoubleNode)
+
+    @staticmethod
+    def unregister(interpreter_class, node_class):
+        """Removes the handler of a node class installed on an interpreter class."""
+        name = f'visit_{node_class.__name__}'
+        if name in vars(interpreter_class):
+            delattr(interpreter_class, name)
+        for cls in (interpreter_class, *interpreter_class.__subclasses__()):
+            cls.handlers.pop(node_class, None)
+
+    def test_unknown_node_class(self):
+        with self.assertRaises(NotImplementedError):
+            Interpreter().visit(self.node, fresh_context())
+        self.assertNotIn(DoubleNode, Interpreter.handlers)
+
+    def test_register_directly(self):
+        self.assertIs(Interpreter.register(DoubleNode, double), double)
+        self.assertEqual(value_of(Interpreter, self.node), 42)
+
+    def test_register_as_decorator(self):
+        @Interpreter.register(DoubleNode)
+        def handler(interpreter, node, context):
+            return double(interpreter, node, context)
+
+        self.assertIs(Interpreter.visit_DoubleNode, handler) # pylint: disable=E1101
+        self.assertEqual(value_of(Interpreter, self.node), 42)
+
+    def test_cached_handler_is_replaced(self):
+        Interpreter.register(DoubleNode, triple)
+        self.assertEqual(value_of(Interpreter, self.node), 63)
+        self.assertIs(Interpreter.handlers[DoubleNode], triple)
+        Interpreter.register(DoubleNode, double)
+        self.assertEqual(value_of(Interpreter, self.node), 42)
+
+    def test_subclass_picks_up_the_handler(self):
+        Interpreter.register(DoubleNode, triple)
+        self.assertEqual(value_of(SubInterpreter, self.node), 63)
+        self.assertIs(SubInterpreter.handlers[DoubleNode], triple)
+        Interpreter.register(DoubleNode, double)
+        self.assertEqual(value_of(SubInterpreter, self.node), 42)
+        self.assertEqual(value_of(Interpreter, self.node), 42)
+
+    def test_subclass_handler_leaves_the_interpreter_alone(self):
+        number_node = parse('21').element_nodes[0]
+        self.assertEqual(value_of(SubInterpreter, number_node), 21)
+        SubInterpreter.register(type(number_node), lambda *_: Number(0))
+        self.addCleanup(self.unregister, SubInterpreter, type(number_node))
+        self.assertEqual(value_of(SubInterpreter, number_node), 0)
+        self.assertEqual(value_of(Interpreter, number_node), 21)
+
+
+class CallTest(unittest.TestCase):
+    """Checks that calls leave the function they call as it is."""
+
+    def test_callee_is_not_changed(self):
+        for engine, run in (('tree', run_tree), *ENGINES.items()):
+            with self.subTest(engine=engine):
+                context = fresh_context()
+                run(parse('method f(x) { yield x }'), context)
+                function = context.symbol_table.get('f')
+                before = function.pos_start, function.pos_end, function.context
+
+                result = run(parse('g = f; method h() { yield f(2) }; show(g(1) + h())'),
+                             context)
+                self.assertIsNone(result.error)
+                self.assertIs(context.symbol_table.get('f'), function)
+                self.assertEqual((function.pos_start, function.pos_end, function.context),
+                                 before)
+
+    def test_argument_errors_are_at_the_call(self):
+        text = 'method f(x) { yield x }\nshow(f(1), 2)\n'
+        for engine, run in (('tree', run_tree), *ENGINES.items()):
+            with self.subTest(engine=engine):
+                context = fresh_context()
+                node = parse(text)
+                call = node.element_nodes[1]
+                error = run(node, context).error
+                self.assertIn("1 too many args passed into 'show'", error.to_string())
+                self.assertEqual((error.pos_start, error.pos_end),
+                                 (call.pos_start, call.pos_end))
+                self.assertIs(error.context, context)
+
+                node = parse('f()')
+                error = run(node, context).error
+                self.assertIn("1 too few args passed into 'f'", error.to_string())
+                self.assertEqual((error.pos_start, error.pos_end),
+                                 (node.element_nodes[0].pos_start, node.element_nodes[0].pos_end))
+
+
+if __name__ == '__main__':
+    unittest.main()
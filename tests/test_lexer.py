@@ -0,0 +1,135 @@
+"""
+Tests for the lexer engines.
+"""
+
+import unittest
+
+from sards.core import Lexer
+
+# Inputs lexed by both engines. They cover every token class, illegal characters,
+# unterminated strings, '!' without '=', escapes and multi-character operators.
+TEXTS = (
+    '',
+    '   \t ',
+    'a = 1 + 2.5 * 3 // 4 ** 5 % 6 - 7 / 8',
+    'x == y != z <= w >= v < u > t',
+    'not a and b or c; define d = 1.; 1.2.3',
+    '[1, 2]; {; method f(a, b) { a <= b ? a : b };}',
+    'define x = 1\nshow(x)\r\n',
+    '"tab\\t new\\n backslash\\\\ other\\q"',
+    '"quote\\"d"',
+    '"unterminated',
+    '"',
+    'show(1) $ 2',
+    'x_1 _y',
+    '1 !2',
+    'a != b ! c',
+    '!',
+)
+
+
+def scan(text, engine):
+    """Lexes text with an engine and describes its tokens and error."""
+    lexer = Lexer('<test>', text, engine=engine)
+    tokens = [(token.kind, token.value, token.start, token.end)
+              for token in lexer.iter_tokens()]
+    error = lexer.error
+    if error is not None:
+        error = error.to_string(), error.pos_start.index, error.pos_end.index
+    return tokens, error
+
+
+def describe(tokens, error):
+    """Describes a token list and an error, as returned by enumerate_tokens or relex."""
+    return ([(token.kind, token.value, token.start, token.end) for token in tokens],
+            error and error.to_string())
+
+
+# The text edited by RelexTest: statements separated by ';' and line feeds, a string
+# holding a ';', and a line feed at the end.
+RELEX_TEXT = 'x = 1; s = "ab; cd"; show(s)\ny = x * 2;\nz = [1, 2]\n'
+
+# Edits of RELEX_TEXT: the text they replace, or (None, n) for its last n characters,
+# and the text they insert. They fall inside the string, at ';' and line feed
+# boundaries and at the end of the text, and some introduce a lex error.
+EDITS = (
+    ('ab', 'abc'),
+    ('ab', 'a"b'),
+    ('"ab; cd"', '"ab; cd'),
+    ('; cd', '\n cd'),
+    (';', ''),
+    (';', ';;'),
+    ('\n', ''),
+    ('\n', '\n\n'),
+    ('\n', ';'),
+    ((None, 0), 'w = 3'),
+    ((None, 1), ''),
+    ((None, 0), '"open'),
+    ('2;', '$;'),
+    ('* 2', '! 2'),
+    ('* 2', '!= 2'),
+    (RELEX_TEXT, '1'),
+)
+
+
+class LexerEnginesTest(unittest.TestCase):
+    """Checks the table engine against the legacy engine."""
+
+    def test_same_tokens_and_errors(self):
+        for text in TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(scan(text, 'table'), scan(text, 'legacy'))
+
+    def test_errors_are_reported(self):
+        for text, message in (('show(1) $ 2', 'Illegal Character: "$"'),
+                              ('a != b ! c', "Expected Character: '=' (after !)")):
+            with self.subTest(text=text):
+                _, error = scan(text, 'table')
+                self.assertIn(message, error[0])
+
+
+class RelexTest(unittest.TestCase):
+    """Checks Lexer.relex against lexing the edited text from scratch."""
+
+    def check_edit(self, text, offset, deleted_length, inserted_text):
+        """Relexes an edit of text and compares the result with a full lex."""
+        lexer = Lexer('<test>', text)
+        tokens, _ = lexer.enumerate_tokens()
+        actual = lexer.relex(tokens, offset, deleted_length, inserted_text)
+        edited = text[:offset] + inserted_text + text[offset + deleted_length:]
+        self.assertEqual(lexer.text, edited)
+        self.assertEqual(describe(*actual),
+                         describe(*Lexer('<test>', edited).enumerate_tokens()))
+
+    def test_edits(self):
+        for old, new in EDITS:
+            if isinstance(old, tuple):
+                offset, deleted_length = len(RELEX_TEXT) - old[1], old[1]
+            else:
+                offset, deleted_length = RELEX_TEXT.index(old), len(old)
+            with self.subTest(old=old, new=new):
+                self.check_edit(RELEX_TEXT, offset, deleted_length, new)
+
+    def test_edit_after_an_error(self):
+        lexer = Lexer('<test>', 'x = $; y = 2')
+        tokens, error = lexer.enumerate_tokens()
+        self.assertIsNotNone(error)
+        actual = lexer.relex(tokens, 4, 1, '1')
+        self.assertEqual(describe(*actual),
+                         describe(*Lexer('<test>', 'x = 1; y = 2').enumerate_tokens()))
+
+    def test_successive_edits(self):
+        text = RELEX_TEXT
+        lexer = Lexer('<test>', text)
+        tokens, _ = lexer.enumerate_tokens()
+        for offset, deleted_length, inserted_text in ((0, 1, 'xx'), (12, 0, ';'),
+                                                      (len(text) + 1, 0, 'show(z)')):
+            with self.subTest(offset=offset, inserted_text=inserted_text):
+                text = text[:offset] + inserted_text + text[offset + deleted_length:]
+                tokens, error = lexer.relex(tokens, offset, deleted_length, inserted_text)
+                self.assertEqual(describe(tokens, error),
+                                 describe(*Lexer('<test>', text).enumerate_tokens()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for the command-line script runner.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from sards.__main__ import run_file
+
+
+class RunFileTest(unittest.TestCase):
+    """Runs scripts from files through run_file."""
+
+    def run_script(self, text, **options):
+        """Writes text to a script file, runs it and returns the exit status and output."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'script.sards')
+            with open(path, 'wb') as file:
+                file.write(text.encode())
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                status = run_file(path, **options)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_newline_terminated_script(self):
+        status, stdout, stderr = self.run_script('show(1);show(2)\n')
+        self.assertEqual((status, stdout, stderr), (0, '1\n2\n', ''))
+
+    def test_line_feeds_separate_statements(self):
+        status, stdout, _ = self.run_script('show(1)\r\nshow(2)\r\n\r\n'
+                                            'method f(a) {\n  show(a)\n}\nf(3)\n')
+        self.assertEqual((status, stdout), (0, '1\n2\n3\n'))
+
+    def test_illegal_character_is_reported(self):
+        status, _, stderr = self.run_script('show(1)\n$\n')
+        self.assertEqual(status, 1)
+        self.assertIn('Illegal Character: "$"', stderr)
+
+    def test_syntax_error_is_only_reported_on_stderr(self):
+        status, stdout, stderr = self.run_script('if 1 == 1 { show(1) }\n')
+        self.assertEqual((status, stdout), (1, ''))
+        self.assertIn('Invalid Syntax', stderr)
+
+    def test_tree_too_deep_to_optimize_runs_unoptimized(self):
+        text = 'when 1 {' * 300 + 'show(1)' + '}' * 300 + '\n'
+        status, stdout, stderr = self.run_script(text, parser='stack')
+        self.assertEqual((status, stdout, stderr), (0, '1\n', ''))
+
+    def test_recursion_too_deep_to_run_is_reported(self):
+        status, stdout, stderr = self.run_script('x = ' + '1 ** ' * 3000 + '1\n',
+                                                 parser='stack')
+        self.assertEqual((status, stdout), (1, ''))
+        self.assertIn('Maximum recursion depth exceeded', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+Tests for the optimization passes: optimized programs must behave exactly as they do
+unoptimized.
+"""
+
+import unittest
+
+from sards.ast_nodes import (ForNode, FunctionCallNode, HoistedNode, IfNode, LoopInvariantsNode,
+                             SwitchNode)
+from sards.core import BinaryOperationNode, NumberNode, optimize
+from sards.core.optimizer import MAX_FOLDED_SIZE
+from sards.data_types import StringNode
+from sards.engines import parse, run_tree
+from tests.support import PROGRAMS, outcome
+
+# Programs exercising the edge cases of constant folding and the algebraic identities.
+FOLDING_PROGRAMS = (
+    '-0.0 + 0; 0 + -0.0; -0.0 * 1; -0.0 - 0',
+    'x = -0.0; [x + 0, 0 + x, x * 1, x - 0, x ** 1]',
+    'x = 2.5; (x + 0) * 1 - 0 ** 1',
+    'l = [1, 2]; l * 1',
+    '[1, 2] * 1; [1] + 0',
+    's = "ab"; s * 1',
+    '"ab" * 1 + "c"',
+    'x = 3; not not x; not not 0.5; y = 0.5; not not y ? 1 : 2',
+    'x = 3; when not not x { 1 }',
+    'x = "a"; when not not x { 1 }',
+    '1 + 2 / (3 - 3)',
+    'x = 4; x * 1 / (2 - 2)',
+    '(2 * 3) % (1 - 1)',
+    '2 ** 5000 - 2 ** 4999',
+    'a = "ab" * 3000; 1',
+    '2 ** 0.5; 10 // 4.0; 7 % -3; -2 ** 2',
+)
+
+# Programs with arms and statements the DeadCodeEliminator removes.
+DEAD_CODE_PROGRAMS = (
+    'when 0 { show(1) } orwhen 0 { show(2) } otherwise { show(3) }',
+    'x = 1; when x { 1 } orwhen 1 { 2 } orwhen x { 3 } otherwise { 4 }',
+    'when 0 {; show(1); show(2);}',
+    'method f() {\n  show(1)\n  yield 2\n  show(3)\n  show(4)\n}\nf()\n',
+    'x = 1\nCycle i = 0 : 3 {\n  show(i)\n  when x { escape } otherwise { proceed }\n'
+    '  show(i)\n}\n',
+    'menu 2 {\n choice 1 { show(1) }\n choice 2 { show(2) }\n choice 3 { show(3) }\n'
+    ' choice 4 {\n  show(4)\n  escape\n }\n choice 5 { show(5) }\n}\n',
+    'menu 9 {; choice 1 { show(1) }; fallback { show(0) }; choice 3 {; show(3); escape;}; '
+    'choice 4 { show(4) };}',
+)
+
+# Loops with expressions the LoopInvariantHoister hoists, or must leave alone.
+HOISTING_PROGRAMS = (
+    'Cycle i = 0 : 3 {\n  show(Integer("5") + i)\n  when i == 1 { Integer = String }\n}\n',
+    'Integer = String\nCycle i = 0 : 3 { show(Integer(5)) }\n',
+    'l = [1]\nCycle i = 0 : 3 {\n  m = l + 1\n  show(m)\n}\nshow(l)\n',
+    'l = [1, 2, 3]\nCycle i = 0 : 5 {\n  m = l - 0\n  show(m)\n}\n',
+    'x = 6\nCycle i = 0 : 3 {\n  when i == 2 { show(x / 0) }\n  show(i)\n}\n',
+    'x = 2\nCycle i = 0 : 2 {\n  Cycle j = 0 : 2 { show(x * 3 + j) }\n}\n',
+    'x = 2\nCycle i = 0 : 0 { show(x / 0) }\nshow(x)\n',
+    'x = 2\nwhenever 0 { show(x / 0) }\nshow(x)\n',
+)
+
+
+def optimized_statement(text):
+    """Optimizes a one-statement program and returns the statement."""
+    return optimize(parse(text)).element_nodes[0]
+
+
+class OptimizedBehaviourTest(unittest.TestCase):
+    """Runs programs with and without the optimization passes."""
+
+    def check_programs(self, programs):
+        """Checks that every program has the same outcome optimized and unoptimized."""
+        for text in programs:
+            with self.subTest(program=text):
+                self.assertEqual(outcome(run_tree, optimize(parse(text))),
+                                 outcome(run_tree, parse(text)))
+
+    def test_programs(self):
+        self.check_programs(PROGRAMS)
+
+    def test_folding_edge_cases(self):
+        self.check_programs(FOLDING_PROGRAMS)
+
+    def test_dead_code(self):
+        self.check_programs(DEAD_CODE_PROGRAMS)
+
+    def test_hoisting(self):
+        self.check_programs(HOISTING_PROGRAMS)
+
+
+class ConstantFolderTest(unittest.TestCase):
+    """Checks what the ConstantFolder folds."""
+
+    def test_literal_takes_over_the_span(self):
+        statement = optimized_statement('1 + 2 * 3')
+        self.assertIsInstance(statement, NumberNode)
+        self.assertEqual(statement.token.value, 7)
+        self.assertEqual((statement.pos_start.index, statement.pos_end.index), (0, 9))
+
+    def test_division_by_zero_is_left_to_run_time(self):
+        statement = optimized_statement('1 + 2 / (3 - 3)')
+        self.assertIsInstance(statement, BinaryOperationNode)
+        self.assertIsInstance(statement.right_node, BinaryOperationNode)
+        self.assertEqual(statement.right_node.right_node.token.value, 0)
+
+    def test_max_folded_size(self):
+        self.assertGreater(5000, MAX_FOLDED_SIZE)
+        self.assertIsInstance(optimized_statement('2 ** 4000'), NumberNode)
+        self.assertIsInstance(optimized_statement('2 ** 5000'), BinaryOperationNode)
+        self.assertIsInstance(optimized_statement('"ab" * 2000'), StringNode)
+        self.assertIsInstance(optimized_statement('"ab" * 3000'), BinaryOperationNode)
+
+    def test_identities_need_a_number(self):
+        for text in ('l = [1]; l * 1', 'x = -0.0; x + 0'):
+            with self.subTest(program=text):
+                statement = optimize(parse(text)).element_nodes[1]
+                self.assertIsInstance(statement, BinaryOperationNode)
+
+
+class DeadCodeEliminatorTest(unittest.TestCase):
+    """Checks the trees the DeadCodeEliminator leaves and the removals it reports."""
+
+    def optimize(self, text):
+        """Optimizes a program and returns its statements and the reported removals."""
+        report = []
+        node = optimize(parse(text), report)
+        return node.element_nodes, [removal.to_string() for removal in report]
+
+    def test_when_chain_collapses_to_its_otherwise_arm(self):
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[0])
+        self.assertEqual(len(statements), 1)
+        self.assertIsInstance(statements[0], FunctionCallNode)
+        self.assertEqual(statements[0].arg_nodes[0].token.value, 3)
+        self.assertEqual(removals, [
+            "File <program>, line 1: removed 'when' arm: its condition is always false",
+            "File <program>, line 1: removed 'orwhen' arm: its condition is always false",
+        ])
+
+    def test_true_arm_becomes_the_otherwise_arm(self):
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[1])
+        when = statements[1]
+        self.assertIsInstance(when, IfNode)
+        self.assertEqual(len(when.cases), 1)
+        self.assertEqual(when.else_case[0].token.value, 2)
+        self.assertEqual(removals, [
+            "File <program>, line 1: removed 'orwhen' arm: an earlier condition is "
+            "always true",
+            "File <program>, line 1: removed 'otherwise' arm: an earlier condition is "
+            "always true",
+        ])
+
+    def test_statements_after_a_jump_are_removed(self):
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[3])
+        self.assertEqual(len(statements[0].body_node.element_nodes), 2)
+        self.assertEqual(removals, [
+            "File <program>, line 4: removed unreachable statement: it follows 'yield'",
+            "File <program>, line 5: removed unreachable statement: it follows 'yield'",
+        ])
+
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[4])
+        self.assertEqual(len(statements[1].body_node.element_nodes), 2)
+        self.assertEqual(removals, [
+            "File <program>, line 5: removed unreachable statement: it follows a "
+            "statement that always jumps",
+        ])
+
+    def test_menu_falls_through_arms_that_do_not_escape(self):
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[5])
+        menu = statements[0]
+        self.assertIsInstance(menu, SwitchNode)
+        self.assertEqual([choice.token.value for choice, _, _ in menu.cases], [2, 3, 4])
+        self.assertEqual(removals, [
+            "File <program>, line 2: removed 'choice' arm: it can never be selected or "
+            "reached",
+            "File <program>, line 9: removed 'choice' arm: it can never be selected or "
+            "reached",
+        ])
+
+    def test_menu_starts_at_its_fallback_arm(self):
+        statements, removals = self.optimize(DEAD_CODE_PROGRAMS[6])
+        self.assertEqual([None if choice is None else choice.token.value
+                          for choice, _, _ in statements[0].cases], [None, 3])
+        self.assertEqual(len(removals), 2)
+
+    def test_nothing_is_reported_for_live_code(self):
+        _, removals = self.optimize('x = 1; when x { 1 } otherwise { 2 }; menu x {; '
+                                    'choice 1 { 1 }; choice 2 { 2 };}')
+        self.assertEqual(removals, [])
+
+
+class LoopInvariantHoisterTest(unittest.TestCase):
+    """Checks which expressions the LoopInvariantHoister hoists, and to which loop."""
+
+    def test_assigned_built_in_is_not_hoisted(self):
+        loop = optimize(parse(HOISTING_PROGRAMS[0])).element_nodes[0]
+        self.assertIsInstance(loop, ForNode)
+
+    def test_invariants_are_hoisted(self):
+        for text in HOISTING_PROGRAMS[1:5]:
+            with self.subTest(program=text):
+                loop = optimize(parse(text)).element_nodes[1]
+                self.assertIsInstance(loop, LoopInvariantsNode)
+                self.assertEqual(len(loop.slots), 1)
+
+    def test_inner_loop_invariant_moves_to_the_outer_loop(self):
+        outer = optimize(parse(HOISTING_PROGRAMS[5])).element_nodes[1]
+        inner = outer.loop_node.body_node.element_nodes[0]
+        self.assertIsInstance(inner, LoopInvariantsNode)
+        self.assertEqual(inner.slots, [])
+        hoisted = inner.loop_node.body_node.arg_nodes[0].left_node
+        self.assertIsInstance(hoisted, HoistedNode)
+        self.assertEqual(outer.slots, [hoisted.slot])
+        self.assertEqual(hoisted.variable_names, ['x'])
+
+    def test_hoisted_error_keeps_its_position(self):
+        text = HOISTING_PROGRAMS[3]
+        optimized = outcome(run_tree, optimize(parse(text)))
+        self.assertEqual(optimized[0][:2], ('error', 'Traceback (most recent call last):\n'
+                                            'Run Time Error: Index out of bounds\n'
+                                            'File <program>, line 3, in <program>\n'))
+        self.assertEqual(optimized[0][2:], (text.index('l - 0') + 4, text.index('l - 0') + 5))
+        self.assertEqual(optimized[1], '[2, 3]\n[3]\n[]\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the Parser reading tokens streamed from the lexer.
+"""
+
+import unittest
+
+from sards.core import Lexer, Parser, StackParser
+from sards.core.parser import TokenBuffer
+from tests.support import dump
+
+PROGRAMS = (
+    '1 + 2 * 3 - 4 / 5',
+    'x = [1, -2 ** 3 ** 2]; x > 2 ? x : 0 - x',
+    'method f(n) {; when n < 2 { yield n }; yield f(n - 1) + f(n - 2);}; f(12)',
+    'Cycle i = 0 : 5 {; when i == 1 { proceed } orwhen i == 4 { escape }; show(i);}\n',
+    'r = menu 5 {; choice 1 { 1 }; fallback { show(0) }; choice 3 { 3 };}; r',
+)
+
+# Programs with a lex error, a syntax error, or both in either order.
+ERRORS = (
+    'show(1) $ 2',
+    'a != b ! c',
+    'show(1 +)',
+    'Cycle i = 0 {',
+    'show(1 +); x = 1 $ 2',
+    'x = $; show(1 +)',
+    'show(1',
+)
+
+
+def parse_list(parser_class, text):
+    """Lexes text into a token list, then parses it; returns the node and the error."""
+    tokens, error = Lexer('<test>', text).enumerate_tokens()
+    if error:
+        return None, error
+    result = parser_class(tokens).parse()
+    return result.node, result.error
+
+
+def parse_stream(parser_class, text):
+    """Parses text from tokens pulled from the lexer; returns the node and the error."""
+    lexer = Lexer('<test>', text)
+    result = parser_class.from_lexer(lexer).parse()
+    error = lexer.error or result.error
+    return (None if error else result.node), error
+
+
+class FromLexerTest(unittest.TestCase):
+    """Checks Parser.from_lexer against parsing a complete token list."""
+
+    def test_same_trees(self):
+        for parser_class in (Parser, StackParser):
+            for text in PROGRAMS:
+                with self.subTest(parser=parser_class.__name__, text=text):
+                    expected, actual = parse_list(parser_class, text), parse_stream(parser_class, text)
+                    self.assertIsNone(actual[1])
+                    self.assertEqual(dump(actual[0]), dump(expected[0]))
+
+    def test_same_errors(self):
+        for parser_class in (Parser, StackParser):
+            for text in ERRORS:
+                with self.subTest(parser=parser_class.__name__, text=text):
+                    (_, expected), (_, actual) = (parse_list(parser_class, text),
+                                                  parse_stream(parser_class, text))
+                    self.assertEqual(actual.to_string(), expected.to_string())
+
+    def test_rewind_past_the_window(self):
+        text = ';'.join(f'x{i} = {i}' for i in range(100))
+        tokens, _ = Lexer('<test>', text).enumerate_tokens()
+        buffer = TokenBuffer(Lexer('<test>', text).iter_tokens)
+        expected = [(token.kind, token.value, token.start) for token in tokens]
+        self.assertEqual([(buffer[i].kind, buffer[i].value, buffer[i].start)
+                          for i in range(len(tokens))], expected)
+        for index in (0, 5, len(tokens) - 65, len(tokens) - 1):
+            with self.subTest(index=index):
+                token = buffer[index]
+                self.assertEqual((token.kind, token.value, token.start), expected[index])
+        with self.assertRaises(IndexError):
+            buffer[len(tokens)] # pylint: disable=W0104
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the slots of method variables (sards.core.resolver).
+"""
+
+import unittest
+
+from sards.core import resolve
+from sards.core.resolver import BOUND_NAMES
+from sards.engines import ENGINES, fresh_context, parse, run_tree
+from tests.support import outcome
+
+
+def method(text):
+    """Returns the first method definition of a program."""
+    return parse(text).element_nodes[0]
+
+
+class ResolverTest(unittest.TestCase):
+    """Runs methods whose variables live in slots with every engine."""
+
+    def check_output(self, text, output, setup=None):
+        """Checks the output of a program with every engine, run after a `setup` one."""
+        for engine, run in (('tree', run_tree), *ENGINES.items()):
+            def run_after_setup(node, context, run=run):
+                if setup is not None:
+                    run(parse(setup), context)
+                return run(node, context)
+
+            with self.subTest(engine=engine):
+                result, printed = outcome(run_after_setup, parse(text))
+                self.assertEqual(result[0], 'value')
+                self.assertEqual(printed, output)
+
+    def test_callee_reads_a_slot_of_its_caller(self):
+        text = 'method g() { yield y }\nmethod f() {\n  y = 5\n  yield g()\n}\nshow(f())\n'
+        body_node = method(text).body_node
+        self.assertEqual(resolve([], body_node).slots, {})
+        self.assertIsNone(body_node.node_to_return.frame_slot)
+        self.check_output(text, '5\n')
+
+    def test_read_before_assignment_falls_through_to_the_caller(self):
+        text = 'y = 1\nmethod f() {\n  show(y)\n  y = 2\n  show(y)\n}\nf()\nshow(y)\n'
+        definition = parse(text).element_nodes[1]
+        layout = resolve([], definition.body_node)
+        self.assertEqual(layout.slots, {'y': 0})
+        first_read = definition.body_node.element_nodes[0].arg_nodes[0]
+        self.assertEqual(first_read.frame_slot, 0)
+        self.check_output(text, '1\n2\n1\n')
+
+    def test_repeated_parameter_takes_the_last_argument(self):
+        text = 'method f(a, a) { yield a }\nshow(f(1, 2))\n'
+        layout = resolve(['a', 'a'], method(text).body_node)
+        self.assertEqual(layout.slots, {'a': 1})
+        self.check_output(text, '2\n')
+
+    def test_loop_variable_is_visible_after_escape(self):
+        text = ('method f() {\n  Cycle i = 0 : 9 { when i == 3 { escape } }\n  yield i\n}\n'
+                'show(f())\n')
+        self.check_output(text, '3\n')
+
+    def test_name_bound_by_a_method_of_an_earlier_program(self):
+        name = 'bound_in_an_earlier_program'
+        setup = f'method f() {{ {name} = 1 }}\nf()\n'
+        self.assertNotIn(name, BOUND_NAMES)
+        run_tree(parse(setup), fresh_context())
+        self.assertIn(name, BOUND_NAMES)
+
+        text = (f'{name} = 5\nmethod g() {{ yield {name} }}\n'
+                f'method h() {{\n  {name} = 6\n  yield g()\n}}\n'
+                'show(g())\nshow(h())\nshow(f())\nshow(g())\n')
+        self.check_output(text, '5\n6\n0\n5\n', setup)
+
+
+if __name__ == '__main__':
+    unittest.main()
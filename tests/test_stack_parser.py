@@ -0,0 +1,91 @@
+"""
+Tests for the recursion-free StackParser.
+"""
+
+import ast
+import textwrap
+import unittest
+from unittest import mock
+
+from sards.core import Lexer, Parser, StackParser
+from sards.core import stack_parser
+from tests.support import dump
+
+PROGRAMS = (
+    '1 + 2 * 3 - 4 / 5',
+    'x = [1, -2 ** 3 ** 2]; x > 2 ? x : 0 - x',
+    'method f(n) {; when n < 2 { yield n }; yield f(n - 1) + f(n - 2);}; f(12)',
+    'Cycle i = 0 : 5 {; when i == 1 { proceed } orwhen i == 4 { escape }; show(i);}',
+    'n = 0; whenever n < 4 { n = n + 1 }',
+    'r = menu 5 {; choice 1 { 1 }; fallback { show(0) }; choice 3 { 3 };}; r',
+)
+
+
+def parse(parser_class, text):
+    """Lexes and parses text with the given parser class."""
+    tokens, error = Lexer('<test>', text).enumerate_tokens()
+    assert error is None
+    return parser_class(tokens).parse()
+
+
+class StackParserTest(unittest.TestCase):
+    """Checks StackParser against the recursive Parser."""
+
+    def test_same_trees_as_parser(self):
+        for text in PROGRAMS:
+            with self.subTest(text=text):
+                expected, actual = parse(Parser, text), parse(StackParser, text)
+                self.assertIsNone(actual.error)
+                self.assertEqual(dump(actual.node), dump(expected.node))
+
+    def test_same_errors_as_parser(self):
+        for text in ('show(1 +)', 'Cycle i = 0 {', 'method (a b) { a }'):
+            with self.subTest(text=text):
+                expected, actual = parse(Parser, text), parse(StackParser, text)
+                self.assertEqual(actual.error.to_string(), expected.error.to_string())
+
+    def test_deep_nesting(self):
+        text = 'x = ' + '2 ** ' * 5000 + '1; y = ' + '(' * 5000 + '1' + ')' * 5000
+        tokens, _ = Lexer('<test>', text).enumerate_tokens()
+        parser = StackParser(tokens)
+        self.assertIsNone(parser.parse().error)
+        self.assertGreater(parser.max_depth, 5000)
+
+    def test_missing_parser_source(self):
+        with mock.patch.object(stack_parser.inspect, 'getsourcelines', side_effect=OSError):
+            with self.assertRaises(RuntimeError):
+                stack_parser.install_rules()
+
+
+    def test_rule_calls_in_nested_scopes_are_rejected(self):
+        for call in ('[self.factor() for _ in range(2)]', '(lambda: self.factor())()',
+                     '{self.factor(): 1 for _ in range(2)}'):
+            source = textwrap.dedent(f'''
+                class Grammar:
+                    def expression(self):
+                        return {call}
+
+                    def factor(self):
+                        return self.expression()
+                ''')
+            with self.subTest(call=call):
+                with self.assertRaisesRegex(RuntimeError, "Grammar.expression .*'factor'"):
+                    stack_parser.grammar_rules(ast.parse(source).body[0])
+
+    def test_nested_function_calling_a_rule_is_rejected(self):
+        source = textwrap.dedent('''
+            class Grammar:
+                def expression(self):
+                    def operand():
+                        return self.factor()
+                    return operand()
+
+                def factor(self):
+                    return self.expression()
+            ''')
+        with self.assertRaisesRegex(RuntimeError, 'FunctionDef'):
+            stack_parser.grammar_rules(ast.parse(source).body[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
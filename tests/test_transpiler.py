@@ -0,0 +1,79 @@
+"""
+Tests for the transpilation of hot methods (sards.core.transpiler).
+"""
+
+import unittest
+
+from sards.core import Interpreter, transpile
+from sards.engines import fresh_context, hot_call_threshold, parse, run_tree
+from tests.support import outcome
+
+# A method whose body nests more blocks than CPython can compile once transpiled.
+DEEP_TEXT = ('method f(x) {\n' + 'Cycle i = 0 : x {\n' * 10 + 'show(i)\n' + '}\n' * 10 +
+             '}\nf(1); f(0); f(-1)\n')
+
+
+def run(text, context):
+    """Runs a program in a context with the Interpreter and returns its RunTimeResult."""
+    return Interpreter().visit(parse(text), context)
+
+
+def last_value(result):
+    """Returns the Python value of the last statement of a program run."""
+    return result.value.elements[-1].value
+
+
+def described(error):
+    """Describes a runtime error by its message, position and context."""
+    return (error.to_string(), error.pos_start.index, error.pos_end.index,
+            error.context.display_name)
+
+
+class HotMethodTest(unittest.TestCase):
+    """Checks when methods are transpiled and that they behave as they did before."""
+
+    def test_body_that_does_not_compile_stays_interpreted(self):
+        body_node = parse(DEEP_TEXT).element_nodes[0].body_node
+        self.assertIsNone(transpile('f', body_node, True))
+
+        context = fresh_context()
+        with hot_call_threshold(1):
+            expected = outcome(run_tree, parse(DEEP_TEXT))
+            self.assertEqual(outcome(Interpreter().visit, parse(DEEP_TEXT)), expected)
+            self.assertIsNone(run(DEEP_TEXT, context).error)
+        profile = context.symbol_table.get('f').profile
+        self.assertTrue(profile.failed)
+        self.assertIsNone(profile.body)
+        self.assertEqual(profile.calls, 1)
+
+    def test_copies_share_the_call_count(self):
+        context = fresh_context()
+        with hot_call_threshold(3):
+            run('method f(x) { yield x + 1 }; g = f; f(1); g(2)', context)
+            profile = context.symbol_table.get('f').profile
+            self.assertIs(context.symbol_table.get('g').profile, profile)
+            self.assertEqual(profile.calls, 2)
+            self.assertIsNone(profile.body)
+
+            self.assertEqual(last_value(run('g(3)', context)), 4)
+            self.assertEqual(profile.calls, 3)
+            self.assertIsNotNone(profile.body)
+            self.assertEqual(last_value(run('f(4)', context)), 5)
+
+    def test_error_before_and_after_the_method_gets_hot(self):
+        context = fresh_context()
+        run('method f(x) {\n  y = x + 1\n  yield 10 / (y - 1)\n}\n', context)
+        profile = context.symbol_table.get('f').profile
+        with hot_call_threshold(2):
+            before = run('show(f(0))', context)
+            self.assertIsNone(profile.body)
+            after = run('show(f(0))', context)
+            self.assertIsNotNone(profile.body)
+        self.assertIn('Division by zero', before.error.to_string())
+        self.assertEqual(before.error.context.display_name, 'f')
+        self.assertIs(after.error.context.parent, before.error.context.parent)
+        self.assertEqual(described(after.error), described(before.error))
+
+
+if __name__ == '__main__':
+    unittest.main()